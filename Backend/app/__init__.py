@@ -39,13 +39,21 @@ def create_app(testing=False):
     # Ini yang menyembuhkan error 422 karena token Anda mengandung claim 'csrf'
     app.config["JWT_COOKIE_CSRF_PROTECT"] = False 
 
-    # --- BAGIAN 3: KONFIGURASI CORS ---
+    # --- BAGIAN 3: KONFIGURASI PIPELINE CV ---
+    # "sync" = diproses di dalam request, "queue" = worker process lokal
+    app.config["RESUME_INGEST_MODE"] = os.getenv("RESUME_INGEST_MODE", "sync")
+    app.config["RESUME_INGEST_WORKERS"] = int(os.getenv("RESUME_INGEST_WORKERS", 2))
+    # Warm-up model saat startup: "" (lazy), "embed", atau "all" (embed + OCR)
+    app.config["WARM_UP_MODELS"] = os.getenv("WARM_UP_MODELS", "")
+
+    # --- BAGIAN 4: KONFIGURASI CORS ---
     # Hapus CORS(app) yang duplikat. Gunakan satu konfigurasi yang spesifik ini saja.
     # supports_credentials=True bisa dihapus jika murni header, tapi dibiarkan True juga aman.
     CORS(app, resources={
         r"/*": {
             "origins": "*", 
             "allow_headers": ["Content-Type", "Authorization"],
+            "expose_headers": ["X-Total-Count", "X-Next-Cursor"],  # metadata pagination
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
         }
     })
@@ -76,4 +84,11 @@ def create_app(testing=False):
     app.register_blueprint(tracing_bp, url_prefix="/tracing")
     app.register_blueprint(ata_bp, url_prefix="/ata")
 
+    from .cli import register_commands
+    register_commands(app)
+
+    if app.config["WARM_UP_MODELS"] and not testing:
+        from extractor import warm_up
+        warm_up(ocr=app.config["WARM_UP_MODELS"] == "all")
+
     return app
\ No newline at end of file
@@ -0,0 +1,224 @@
+import os
+import json
+
+import click
+import faiss
+import numpy as np
+from flask.cli import AppGroup
+
+from app import db
+from app.models import Resume
+from app.utils.vector_store import (
+    GLOBAL_INDEX_PATH, INDEX_FOLDER, INDEX_TYPES, get_vector_store, benchmark_index_types
+)
+from app.utils.resume_ingest import (
+    PENDING_TIMEOUT_MINUTES, upload_path, file_sha256, normalized_text_hash, requeue_stale_resumes
+)
+from app.utils.chunk_store import CHUNK_STORE_PATH, CHUNKS_FOLDER, get_chunk_store
+from app.utils.leaderboard import CV_WEIGHT, TEST_WEIGHT, refresh_leaderboard
+from app.utils.rescoring import RESCORABLE_TYPES, RESCORE_BATCH_SIZE, RESCORE_WORKERS, rescore_submissions
+
+# flask resume-index <command>
+resume_index_cli = AppGroup("resume-index", help="Manajemen index FAISS global untuk resume.")
+
+
+@resume_index_cli.command("import-legacy")
+def import_legacy():
+    """Pindahkan index per-resume lama (indexes/<resume_id>.faiss) ke index global."""
+    store = get_vector_store()
+    items, migrated = [], []
+
+    resumes = Resume.query.filter(Resume.status == "done").all()
+    for r in resumes:
+        if r.index_path == GLOBAL_INDEX_PATH or store.has(r.id):
+            continue
+
+        # Path absolut lama bisa berasal dari mesin lain, fallback ke folder indexes lokal
+        path = r.index_path if r.index_path and os.path.exists(r.index_path) \
+            else os.path.join(INDEX_FOLDER, f"{r.id}.faiss")
+        if not os.path.exists(path):
+            click.echo(f"[SKIP] {r.id}: index tidak ditemukan")
+            continue
+
+        legacy = faiss.read_index(path)
+        items.append((r.id, legacy.reconstruct_n(0, legacy.ntotal)))
+        migrated.append(r)
+
+    store.add_many(items)
+    for r in migrated:
+        r.index_path = GLOBAL_INDEX_PATH
+    db.session.commit()
+
+    click.echo(f"Berhasil import {len(migrated)} resume ke index global ({len(store)} chunk).")
+
+
+@resume_index_cli.command("backfill-hashes")
+def backfill_hashes():
+    """Isi file_hash / text_hash untuk resume lama (dipakai deduplikasi & laporan duplikat)."""
+    updated = 0
+
+    for r in Resume.query.filter(db.or_(Resume.file_hash.is_(None), Resume.text_hash.is_(None))).all():
+        if r.file_hash is None:
+            path = upload_path(r.id, r.filename)
+            if os.path.exists(path):
+                r.file_hash = file_sha256(path)
+        if r.text_hash is None and r.raw_text:
+            r.text_hash = normalized_text_hash(r.raw_text)
+        updated += 1
+
+    db.session.commit()
+    click.echo(f"Fingerprint diperbarui untuk {updated} resume.")
+
+
+@resume_index_cli.command("requeue-pending")
+@click.option("--older-than", default=PENDING_TIMEOUT_MINUTES, show_default=True,
+              help="Menit sejak upload sebelum Resume pending dianggap tertahan.")
+def requeue_pending(older_than):
+    """Proses ulang Resume yang tertahan di status pending (mis. setelah restart server)."""
+    requeued, expired = requeue_stale_resumes(older_than)
+    for resume_id in expired:
+        click.echo(f"[FAILED] {resume_id}: file upload tidak ditemukan")
+    click.echo(f"Diproses ulang: {len(requeued)} resume, ditandai gagal: {len(expired)}.")
+
+
+@resume_index_cli.command("import-chunks")
+def import_chunks():
+    """Pindahkan file chunks/<resume_id>.json lama ke chunk store (chunks.bin)."""
+    store = get_chunk_store()
+    items, migrated = [], []
+
+    for r in Resume.query.filter(Resume.status == "done").all():
+        if r.chunks_path == CHUNK_STORE_PATH or store.has(r.id):
+            continue
+
+        path = os.path.join(CHUNKS_FOLDER, f"{r.id}.json")
+        if not os.path.exists(path):
+            click.echo(f"[SKIP] {r.id}: file chunks tidak ditemukan")
+            continue
+
+        with open(path, encoding="utf-8") as fh:
+            items.append((r.id, json.load(fh)))
+        migrated.append(r)
+
+    store.add_many(items)
+    for r in migrated:
+        r.chunks_path = CHUNK_STORE_PATH
+    db.session.commit()
+
+    click.echo(f"Berhasil import chunk {len(migrated)} resume ke chunk store.")
+
+
+@resume_index_cli.command("compact-chunks")
+def compact_chunks():
+    """Buang chunk milik resume yang sudah diganti / dihapus dari chunks.bin."""
+    store = get_chunk_store()
+    before = store.stats()
+    store.compact()
+    click.echo(f"Compact selesai: {before['garbage_chunks']} chunk sampah dibuang, {store.stats()['chunks']} chunk tersisa.")
+
+
+@resume_index_cli.command("rebuild")
+@click.option("--type", "index_type", type=click.Choice(INDEX_TYPES), default=None,
+              help="Jenis index baru (default: RESUME_INDEX_TYPE).")
+@click.option("--reembed", is_flag=True,
+              help="Embed ulang dari chunk store (dianjurkan jika index sekarang sudah terkuantisasi).")
+def rebuild_index(index_type, reembed):
+    """Bangun ulang index global (ganti jenis index / latih ulang kuantisasi)."""
+    store = get_vector_store()
+    vectors = None
+
+    if reembed:
+        from extractor import embed_chunks
+        chunk_store = get_chunk_store()
+        vectors = {}
+        for r in Resume.query.filter(Resume.status == "done").all():
+            if not chunk_store.has(r.id):
+                click.echo(f"[SKIP] {r.id}: chunk tidak ada di chunk store")
+                continue
+            chunks = chunk_store.get_chunks(r.id)
+            vectors[r.id] = embed_chunks([c["text"] if isinstance(c, dict) else c for c in chunks])
+
+    built = store.rebuild(index_type or store.index_type, vectors=vectors)
+    stats = store.stats()
+    click.echo(f"Index dibangun ulang: {built}, {stats['vectors']} vektor, {stats['resumes']} resume.")
+
+
+@resume_index_cli.command("benchmark")
+@click.option("--k", default=10, show_default=True, help="Recall@k.")
+@click.option("--queries", "n_queries", default=100, show_default=True,
+              help="Jumlah query sampel chunk (dipakai jika belum ada embedding job).")
+@click.option("--nprobe", default=None, type=int, help="Override nprobe IVF.")
+@click.option("--pq-m", default=None, type=int, help="Override jumlah sub-vektor PQ.")
+def benchmark_index(k, n_queries, nprobe, pq_m):
+    """Bandingkan recall@k, latency & ukuran index flat vs sq8 vs ivfpq pada korpus sekarang."""
+    store = get_vector_store()
+    vectors = store.all_vectors()
+    if not len(vectors):
+        click.echo("Index masih kosong.")
+        return
+
+    # Query: embedding job description (cache) jika ada, selain itu sampel chunk
+    from app.utils.embedding_cache import JOB_CACHE_PATH
+    queries = None
+    if os.path.exists(JOB_CACHE_PATH):
+        with np.load(JOB_CACHE_PATH) as data:
+            queries = data["vectors"] if len(data["vectors"]) else None
+    if queries is None:
+        rng = np.random.default_rng(0)
+        queries = vectors[rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)]
+
+    params = {}
+    if nprobe:
+        params["nprobe"] = nprobe
+    if pq_m:
+        params["pq_m"] = pq_m
+
+    click.echo(f"Korpus: {len(vectors)} vektor, {len(queries)} query, k={k}")
+    click.echo(f"{'index':<12}{'recall@k':>10}{'ms/query':>10}{'MB':>10}")
+    for row in benchmark_index_types(vectors, queries, k=k, **params):
+        label = row["index_type"] if row["index_type"] == row["requested"] else f"{row['requested']}->{row['index_type']}"
+        click.echo(f"{label:<12}{row['recall_at_k']:>10.3f}{row['ms_per_query']:>10.3f}{row['index_bytes'] / 1e6:>10.2f}")
+
+
+# flask leaderboard <command>
+leaderboard_cli = AppGroup("leaderboard", help="Tabel skor leaderboard (CV x CFIT x Kraepelin).")
+
+
+@leaderboard_cli.command("rebuild")
+def rebuild_leaderboard():
+    """Hitung ulang seluruh skor leaderboard (mis. setelah bobot LEADERBOARD_*_WEIGHT diubah)."""
+    count = refresh_leaderboard()
+    click.echo(f"Leaderboard diperbarui: {count} aplikasi (bobot CV {CV_WEIGHT}, psikotes {TEST_WEIGHT}).")
+
+
+# flask psychotest <command>
+psychotest_cli = AppGroup("psychotest", help="Maintenance hasil psikotes (PAPI, CFIT, Kraepelin).")
+
+
+@psychotest_cli.command("rescore")
+@click.argument("test_type", type=click.Choice(RESCORABLE_TYPES))
+@click.option("--batch-size", default=RESCORE_BATCH_SIZE, show_default=True, help="Baris per batch cursor.")
+@click.option("--workers", default=RESCORE_WORKERS, show_default=True, help="Jumlah worker process (1 = tanpa pool).")
+@click.option("--dry-run", is_flag=True, help="Hitung & laporkan diff tanpa menulis ke DB.")
+@click.option("--samples", default=5, show_default=True, help="Jumlah contoh diff yang ditampilkan.")
+def rescore(test_type, batch_size, workers, dry_run, samples):
+    """Hitung ulang skor submission lama dengan kunci / norma terbaru (mis. setelah seed ulang)."""
+    report = rescore_submissions(test_type, batch_size=batch_size, workers=workers,
+                                 dry_run=dry_run, max_samples=samples)
+
+    click.echo(f"{report['scanned']} submission {test_type} dipindai dalam {report['elapsed_s']}s "
+               f"({report['rows_per_s']} baris/detik)")
+    click.echo(f"Berubah: {report['changed']}, dilewati (data tidak lengkap): {report['skipped']}"
+               + (" [dry-run, tidak ada yang ditulis]" if dry_run else ""))
+    for field, count in report["field_changes"].items():
+        click.echo(f"  {field:<20}{count:>8}")
+    for sample in report["samples"]:
+        click.echo(f"  #{sample['id']} ({sample['candidate_id']}): {json.dumps(sample['changes'], default=str)}")
+    if report["leaderboard_refreshed"]:
+        click.echo(f"Leaderboard diperbarui: {report['leaderboard_refreshed']} aplikasi.")
+
+
+def register_commands(app):
+    app.cli.add_command(resume_index_cli)
+    app.cli.add_command(leaderboard_cli)
+    app.cli.add_command(psychotest_cli)
@@ -79,6 +79,9 @@ class JourneyLog(db.Model):
 
     journey = db.relationship("RecruitmentJourney", back_populates="logs")
 
+    # Log per journey, terbaru dulu (order_by relasi RecruitmentJourney.logs)
+    __table_args__ = (db.Index("ix_journey_logs_journey_id_created_at", journey_id, created_at.desc()),)
+
     def to_dict(self):
         return {
             "action": self.action,
@@ -136,11 +139,14 @@ class JobPosition(db.Model):
     available = db.Column(db.Boolean, default=True)
     
     # UPDATE
-    created_at = db.Column(db.DateTime, default=now_utc)
+    created_at = db.Column(db.DateTime, nullable=False, default=now_utc, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, default=now_utc, onupdate=now_utc)
 
     applications = db.relationship("JobApplication", back_populates="job", cascade="all, delete-orphan")
 
+    # Filter status di list job, urut terbaru
+    __table_args__ = (db.Index("ix_job_positions_status_created_at", status, created_at.desc()),)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -168,7 +174,39 @@ class Resume(db.Model):
     chunks_path = db.Column(db.Text)
     raw_text = db.Column(db.Text)
 
+    # Status pipeline ingest: pending (menunggu worker), done, failed
+    status = db.Column(db.String(20), default="done", nullable=False)
+    error = db.Column(db.Text, nullable=True)
+
+    # Fingerprint untuk deduplikasi: SHA-256 isi file & teks ternormalisasi
+    file_hash = db.Column(db.String(64), index=True, nullable=True)
+    text_hash = db.Column(db.String(64), index=True, nullable=True)
+
     candidate = db.relationship("Candidate", back_populates="resume", uselist=False, cascade="all, delete-orphan")
+    duplicates = db.relationship("ResumeDuplicate", back_populates="resume", cascade="all, delete-orphan")
+
+
+class ResumeDuplicate(db.Model):
+    """Upload yang dialihkan ke Resume yang sudah ada (tidak di-OCR / embed ulang)."""
+    __tablename__ = "resume_duplicates"
+
+    id = db.Column(db.String, primary_key=True, default=uuid_str)
+    resume_id = db.Column(db.String, db.ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = db.Column(db.String, nullable=False)
+    file_hash = db.Column(db.String(64), index=True, nullable=False)
+    match = db.Column(db.String(10), nullable=False)  # "file" | "text"
+    uploaded_at = db.Column(db.DateTime, default=now_utc)
+
+    resume = db.relationship("Resume", back_populates="duplicates")
+
+
+class SearchIndexVersion(db.Model):
+    """Nomor versi data yang di-index LexicalIndex; naik setiap commit yang mengubah Resume/Candidate."""
+    __tablename__ = "search_index_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
 
 class Candidate(db.Model):
     __tablename__ = "candidates"
@@ -191,14 +229,24 @@ class Candidate(db.Model):
     certifications = db.Column(JSONB, default=list)
     languages = db.Column(JSONB, default=list)
     social_links = db.Column(JSONB, default=dict)
+    # Waktu ekstraksi profil CV oleh LLM (None = belum / gagal, akan diulang)
+    profile_extracted_at = db.Column(db.DateTime, nullable=True)
 
     # UPDATE
-    created_at = db.Column(db.DateTime, default=now_utc)
+    created_at = db.Column(db.DateTime, nullable=False, default=now_utc, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, default=now_utc, onupdate=now_utc)
 
     resume = db.relationship("Resume", back_populates="candidate")
     test_link = db.relationship("TestLink", back_populates="candidate", uselist=False, cascade="all, delete-orphan")
     applications = db.relationship("JobApplication", back_populates="candidate", cascade="all, delete-orphan")
 
+    # Pencarian nama/email/city (ILIKE '%x%') memakai index trigram pg_trgm yang dibuat
+    # di migration saja (extension belum tentu tersedia), lihat TRGM_INDEXES di migrations/env.py
+    __table_args__ = (
+        db.Index("ix_candidates_skills", skills, postgresql_using="gin", postgresql_ops={"skills": "jsonb_path_ops"}),
+        db.Index("ix_candidates_created_at", created_at.desc()),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -236,7 +284,12 @@ class JobApplication(db.Model):
     candidate = db.relationship("Candidate", back_populates="applications")
     job = db.relationship("JobPosition", back_populates="applications")
 
-    __table_args__ = (db.UniqueConstraint('candidate_id', 'job_id', name='_candidate_job_uc'),)
+    # candidate_id sudah ter-index lewat unique constraint (kolom pertama)
+    __table_args__ = (
+        db.UniqueConstraint('candidate_id', 'job_id', name='_candidate_job_uc'),
+        db.Index("ix_job_applications_job_id_match_score", job_id, match_score.desc()),  # ranking per job
+        db.Index("ix_job_applications_match_score", match_score.desc()),                  # ranking global
+    )
 
     def to_dict(self):
         journey_data = self.journey.to_dict() if self.journey else None
@@ -251,6 +304,32 @@ class JobApplication(db.Model):
             "applied_at": format_date(self.applied_at)
         }
 
+class LeaderboardEntry(db.Model):
+    """
+    Skor leaderboard per JobApplication (CV x CFIT x Kraepelin) yang disimpan,
+    diperbarui inkremental saat match_resume / submit_cfit / submit_kraepelin
+    (lihat app/utils/leaderboard.py). Nama, posisi & status tetap dibaca dari tabel asal.
+    """
+    __tablename__ = "leaderboard_entries"
+
+    application_id = db.Column(db.String, db.ForeignKey("job_applications.id", ondelete="CASCADE"), primary_key=True)
+    candidate_id = db.Column(db.String, db.ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
+    job_id = db.Column(db.String, db.ForeignKey("job_positions.id", ondelete="CASCADE"), nullable=False)
+    cv_score = db.Column(db.Float, nullable=False, default=0)
+    cfit_score = db.Column(db.Float, nullable=False, default=0)
+    kraepelin_score = db.Column(db.Float, nullable=False, default=0)
+    test_score = db.Column(db.Float, nullable=False, default=0)
+    has_test = db.Column(db.Boolean, nullable=False, default=False)
+    final_score = db.Column(db.Float, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=now_utc)
+
+    # Urutan leaderboard (final_score, application_id) DESC untuk cursor pagination
+    __table_args__ = (
+        db.Index("ix_leaderboard_entries_final_score", final_score.desc(), application_id.desc()),
+        db.Index("ix_leaderboard_entries_job_id_final_score", job_id, final_score.desc(), application_id.desc()),
+    )
+
+
 class TestLink(db.Model):
     __tablename__ = 'test_links'
     
@@ -259,9 +338,12 @@ class TestLink(db.Model):
     candidate_id = db.Column(db.String, db.ForeignKey('candidates.id'), unique=True, nullable=False)
     status = db.Column(db.String(20), default="active")
     expires_at = db.Column(db.DateTime)
+    # Seed lembar Kraepelin: grid dibuat di server dari seed ini, bukan dikirim kandidat
+    kraepelin_seed = db.Column(db.BigInteger, nullable=False,
+                               server_default=db.text("floor(random() * 2147483648)::bigint"))
     
     # UPDATE
-    created_at = db.Column(db.DateTime, default=now_utc)
+    created_at = db.Column(db.DateTime, nullable=False, default=now_utc, server_default=db.func.now())
     
     candidate = db.relationship("Candidate", back_populates="test_link")
     submissions = db.relationship('TestSubmission', backref='link', lazy=True)
@@ -276,7 +358,9 @@ class TestSubmission(db.Model):
     scores = db.Column(JSONB)            
     
     # UPDATE
-    submitted_at = db.Column(db.DateTime, default=now_utc)
+    submitted_at = db.Column(db.DateTime, nullable=False, default=now_utc, server_default=db.func.now())
+
+    __table_args__ = (db.Index("ix_test_submissions_link_id_test_type", link_id, test_type),)
 
 # Model Soal lainnya tetap sama, tidak ada field DateTime
 class CfitQuestion(db.Model):
@@ -357,7 +441,7 @@ class ATARequest(db.Model):
     ho_date = db.Column(db.DateTime)
     job_id = db.Column(db.String, db.ForeignKey("job_positions.id"), nullable=True)
 
-    created_at = db.Column(db.DateTime, default=now_utc)
+    created_at = db.Column(db.DateTime, nullable=False, default=now_utc, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, default=now_utc, onupdate=now_utc)
 
     def to_dict(self):
@@ -372,4 +456,27 @@ class ATARequest(db.Model):
                 "HO": self.ho_status
             },
             "created_at": format_date(self.created_at)
-        }
\ No newline at end of file
+        }
+
+
+# Aplikasi terbaik per kandidat (match_score tertinggi) dipilih di SQL: subquery
+# berkorelasi ORDER BY ... LIMIT 1 per kandidat (pakai index candidate_id),
+# dimuat lewat selectinload oleh candidate_to_dict.
+_other_application = db.aliased(JobApplication)
+_best_application_id = db.select(_other_application.id).where(
+    _other_application.candidate_id == Candidate.id
+).order_by(
+    db.func.coalesce(_other_application.match_score, 0).desc(),
+    _other_application.applied_at,
+    _other_application.id
+).limit(1).correlate(Candidate).scalar_subquery()
+
+Candidate.best_application = db.relationship(
+    JobApplication,
+    primaryjoin=db.and_(
+        JobApplication.candidate_id == Candidate.id,
+        JobApplication.id == _best_application_id
+    ),
+    uselist=False,
+    viewonly=True
+)
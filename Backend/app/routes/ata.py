@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models import ATARequest, JobPosition
+from app.utils.pagination import paginate
 from datetime import datetime, timezone
 import os
 from werkzeug.utils import secure_filename
@@ -28,8 +29,8 @@ def handle_ata_requests():
     # GET: List all ATA requests
     if request.method == "GET":
         try:
-            requests = ATARequest.query.order_by(ATARequest.created_at.desc()).all()
-            return jsonify([req.to_dict() for req in requests])
+            return paginate(ATARequest.query, [ATARequest.created_at, ATARequest.id],
+                            lambda req: req.to_dict())
         except Exception as e:
             return jsonify({"error": str(e)}), 500
     
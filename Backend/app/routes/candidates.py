@@ -2,9 +2,16 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
 from flask_jwt_extended import get_jwt
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, joinedload
 from app import db
-from app.models import Candidate, JobApplication
+from app.models import Candidate, JobApplication, Resume
+from app.utils.lexical_index import get_lexical_index, reciprocal_rank_fusion
+from app.utils.vector_store import get_vector_store
+from app.utils.chunk_store import get_chunk_store
+from app.utils.pagination import paginate
+from app.utils.serialization import eager_load, with_load_options
 from datetime import datetime
+import time
 
 candidates_bp = Blueprint("candidates", __name__, url_prefix="/candidates")
 
@@ -30,19 +37,22 @@ def restrict_access_by_role():
             "message": "Access denied"
         }), 403
     
+@eager_load(
+    selectinload(Candidate.applications).joinedload(JobApplication.job),
+    selectinload(Candidate.best_application).joinedload(JobApplication.job),
+    joinedload(Candidate.test_link)
+)
 def candidate_to_dict(candidate: Candidate):
     """
     Mengubah object Candidate menjadi dictionary.
     PERBAIKAN: Mengambil match_score dan posisi dari tabel relasi job_applications.
+    Relasi yang dibaca dideklarasikan di @eager_load (query pakai with_load_options / paginate).
     """
     
-    # 1. Cari aplikasi terbaik (Highest Score) untuk ditampilkan sebagai summary
-    # Karena relasinya Many-to-Many, satu kandidat bisa melamar banyak job.
-    # Kita ambil yang score-nya paling tinggi untuk display utama.
-    best_app = None
-    if candidate.applications:
-        # Sort aplikasi berdasarkan match_score tertinggi
-        best_app = sorted(candidate.applications, key=lambda x: x.match_score or 0, reverse=True)[0]
+    # 1. Aplikasi terbaik (Highest Score) untuk ditampilkan sebagai summary.
+    # Satu kandidat bisa melamar banyak job; yang score-nya paling tinggi
+    # sudah dipilih di SQL (relasi Candidate.best_application).
+    best_app = candidate.best_application
 
     # 2. Extract Data dari Best App
     match_score = best_app.match_score if best_app else 0
@@ -174,6 +184,7 @@ def list_candidates():
     name = request.args.get("name")
     email = request.args.get("email")
     city = request.args.get("city")
+    skill = request.args.get("skill")
     
     query = Candidate.query
 
@@ -183,17 +194,108 @@ def list_candidates():
         query = query.filter(Candidate.email.ilike(f"%{email}%"))
     if city:
         query = query.filter(Candidate.city.ilike(f"%{city}%"))
+    if skill:
+        # JSONB containment (skills @> '["Python"]'), memakai GIN index ix_candidates_skills
+        query = query.filter(Candidate.skills.contains([skill]))
 
-    # Order by terbaru
-    candidates = query.order_by(Candidate.created_at.desc()).all()
-
+    # Order by terbaru, keyset pagination (?limit=&after=&count=&fields=)
     # Konversi ke dict (Logic match_score ditangani di dalam candidate_to_dict)
-    return jsonify([candidate_to_dict(c) for c in candidates])
+    return paginate(query, [Candidate.created_at, Candidate.id], candidate_to_dict)
+
+
+SEARCH_MODES = ("hybrid", "lexical", "semantic")
+SEARCH_POOL = 100  # kandidat per ranking sebelum difusi
+
+
+def best_chunk_text(resume_id, q_emb, max_chars=300):
+    """Potongan CV paling mirip dengan query (untuk ditampilkan di hasil pencarian)."""
+    store, chunks = get_vector_store(), get_chunk_store()
+    if not store.has(resume_id) or not chunks.has(resume_id):
+        return None
+    _, positions = store.search_resume(resume_id, q_emb, 1)
+    if not len(positions):
+        return None
+    return chunks.get(resume_id, int(positions[0]))["text"][:max_chars]
+
+
+@candidates_bp.route("/search", methods=["GET"])
+def search_candidates():
+    """
+    Cari kandidat berdasarkan skill / isi CV.
+    Gabungan BM25 (Resume.raw_text + Candidate.skills) dan embedding MiniLM (index FAISS),
+    difusi dengan Reciprocal Rank Fusion.
+
+    Query params: q (wajib), top_k (default 20, maks 100), mode = hybrid | lexical | semantic
+    """
+    started = time.perf_counter()
+    q = (request.args.get("q") or "").strip()
+    mode = request.args.get("mode", "hybrid")
+    top_k = max(1, min(request.args.get("top_k", 20, type=int), SEARCH_POOL))
+
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+    if mode not in SEARCH_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(SEARCH_MODES)}"}), 400
+
+    lexical, semantic, q_emb = [], [], None
+    if mode in ("hybrid", "lexical"):
+        index = get_lexical_index()
+        index.sync()
+        lexical = index.search(q, top_k=SEARCH_POOL)
+    if mode in ("hybrid", "semantic"):
+        from extractor import embed_query
+        q_emb = embed_query(q)
+        semantic = get_vector_store().rank(q_emb, top_k=SEARCH_POOL)
+
+    fused = reciprocal_rank_fusion([
+        [rid for rid, _, _ in lexical],
+        [rid for rid, _ in semantic]
+    ])[:top_k]
+
+    lexical_info = {rid: (rank, score, terms) for rank, (rid, score, terms) in enumerate(lexical, start=1)}
+    semantic_info = {rid: (rank, score) for rank, (rid, score) in enumerate(semantic, start=1)}
+
+    resume_ids = [rid for rid, _ in fused]
+    candidates = {
+        c.resume_id: c for c in Candidate.query.filter(Candidate.resume_id.in_(resume_ids)).all()
+    } if resume_ids else {}
+    filenames = dict(
+        db.session.query(Resume.id, Resume.filename).filter(Resume.id.in_(resume_ids)).all()
+    ) if resume_ids else {}
+
+    results = []
+    for rid, score in fused:
+        candidate = candidates.get(rid)
+        lex = lexical_info.get(rid)
+        sem = semantic_info.get(rid)
+        results.append({
+            "resume_id": rid,
+            "filename": filenames.get(rid),
+            "candidate_id": candidate.id if candidate else None,
+            "name": candidate.name if candidate else None,
+            "email": candidate.email if candidate else None,
+            "current_role": candidate.current_role if candidate else None,
+            "skills": (candidate.skills or []) if candidate else [],
+            "score": round(score, 6),
+            "lexical_rank": lex[0] if lex else None,
+            "lexical_score": round(lex[1], 4) if lex else None,
+            "matched_terms": lex[2] if lex else [],
+            "semantic_rank": sem[0] if sem else None,
+            "semantic_score": round(sem[1], 4) if sem else None,
+            "snippet": best_chunk_text(rid, q_emb) if q_emb is not None else None
+        })
+
+    return jsonify({
+        "query": q,
+        "mode": mode,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 1)
+    })
 
 
 @candidates_bp.route("/<candidate_id>", methods=["GET"])
 def get_candidate(candidate_id):
-    candidate = Candidate.query.get(candidate_id)
+    candidate = with_load_options(Candidate.query, candidate_to_dict).filter_by(id=candidate_id).first()
     if not candidate:
         return jsonify({"error": "Candidate not found"}), 404
 
@@ -239,6 +341,9 @@ def update_candidate(candidate_id):
             candidate.social_links = data["social_links"]
 
         db.session.commit()
+        if "skills" in data:
+            # Setelah commit: sync yang berjalan bersamaan tidak boleh menyimpan state sebelum edit
+            get_lexical_index().invalidate()
 
         return jsonify({
             "message": "Candidate updated successfully",
@@ -1,119 +1,48 @@
 from flask import Blueprint, jsonify, request
 from app import db
-from app.models import Candidate, JobApplication, JobPosition, TestLink, TestSubmission
-from sqlalchemy import func
+from app.models import Candidate, JobApplication, JobPosition, TestLink, TestSubmission, LeaderboardEntry
+from app.utils.leaderboard import ensure_leaderboard
+from app.utils.pagination import paginate
+from sqlalchemy import func, case
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
 
-# Mapping Nilai Kualitatif Kraepelin ke Angka (0-100)
-GRADE_MAP = {
-    "Baik Sekali": 100,
-    "Baik": 80,
-    "Sedang": 60,
-    "Kurang": 40,
-    "Kurang Sekali": 20
-}
-
-def calculate_kraepelin_score(scores):
-    """Menghitung rata-rata skor Kraepelin dari Speed, Accuracy, Stability"""
-    if not scores:
-        return 0
-    
-    speed = GRADE_MAP.get(scores.get("gradeSpeed"), 0)
-    accuracy = GRADE_MAP.get(scores.get("gradeAccuracy"), 0)
-    stability = GRADE_MAP.get(scores.get("gradeStability"), 0)
-    
-    return (speed + accuracy + stability) / 3
-
-def calculate_cfit_score(scores):
-    """Konversi IQ ke Skala 0-100 untuk Leaderboard"""
-    if not scores:
-        return 0
-    
-    iq = scores.get("iq", 0)
-    # Asumsi: IQ 140 = 100 poin, IQ 70 = 0 poin
-    # Rumus sederhana: (IQ / 1.4) atau mapping range
-    if iq >= 130: return 100
-    if iq >= 120: return 90
-    if iq >= 110: return 80 # Average High
-    if iq >= 100: return 75 # Average
-    if iq >= 90: return 60
-    return 40
-
 @dashboard_bp.route("/leaderboard", methods=["GET"])
 def get_leaderboard():
+    """
+    Leaderboard dari tabel leaderboard_entries (skor tersimpan, refresh inkremental).
+
+    Query params: job_id (opsional, "all" = semua) + pagination standar
+    (limit, after, count, fields -> lihat app/utils/pagination.py).
+    """
     job_id = request.args.get("job_id")
-    
-    # 1. Query Dasar: Join Candidate -> JobApplication -> JobPosition
-    query = db.session.query(Candidate, JobApplication, JobPosition)\
-        .join(JobApplication, Candidate.id == JobApplication.candidate_id)\
-        .join(JobPosition, JobApplication.job_id == JobPosition.id)
 
-    # Filter by Job jika ada
+    ensure_leaderboard()
+
+    query = db.session.query(LeaderboardEntry, Candidate.name, JobPosition.title, JobApplication.status)\
+        .join(JobApplication, JobApplication.id == LeaderboardEntry.application_id)\
+        .join(Candidate, Candidate.id == LeaderboardEntry.candidate_id)\
+        .join(JobPosition, JobPosition.id == LeaderboardEntry.job_id)
+
     if job_id and job_id != "all":
-        query = query.filter(JobPosition.id == job_id)
-        
-    results = query.all()
-    
-    leaderboard_data = []
-    
-    for cand, app, job in results:
-        # 2. Ambil Data Psikotes (TestLink -> TestSubmission)
-        # Kita asumsikan relasi One-to-One antara Candidate dan TestLink (Active)
-        test_link = TestLink.query.filter_by(candidate_id=cand.id).first()
-        
-        cfit_val = 0
-        kraepelin_val = 0
-        has_test = False
-        
-        if test_link:
-            submissions = TestSubmission.query.filter_by(link_id=test_link.id).all()
-            for sub in submissions:
-                if sub.test_type == 'cfit':
-                    cfit_val = calculate_cfit_score(sub.scores)
-                    has_test = True
-                elif sub.test_type == 'kraepelin':
-                    kraepelin_val = calculate_kraepelin_score(sub.scores)
-                    has_test = True
-        
-        # 3. Hitung Final Score
-        # Bobot: CV (40%) + CFIT (30%) + Kraepelin (30%)
-        # Jika tidak ada tes, Final Score = CV Score
-        
-        cv_score = app.match_score or 0
-        
-        if has_test:
-            # Rata-rata psikotes (jika salah satu 0, tetap dibagi rata elemen yg ada)
-            # Simplifikasi: (CV * 0.4) + (Psiko_Avg * 0.6)
-            psiko_score = 0
-            if cfit_val > 0 and kraepelin_val > 0:
-                psiko_score = (cfit_val + kraepelin_val) / 2
-            elif cfit_val > 0:
-                psiko_score = cfit_val
-            elif kraepelin_val > 0:
-                psiko_score = kraepelin_val
-                
-            final_score = (cv_score * 0.4) + (psiko_score * 0.6)
-        else:
-            final_score = cv_score # Belum tes, ranking based on CV only
-            psiko_score = 0
+        query = query.filter(LeaderboardEntry.job_id == job_id)
 
-        leaderboard_data.append({
-            "id": cand.id,
-            "name": cand.name,
-            "position": job.title,
-            "positionId": job.id,
-            "cvScore": round(cv_score, 1),
-            "testScore": round(psiko_score, 1),
-            "finalScore": round(final_score, 1),
-            "status": app.status, # Applied, Screening, etc
-            "avatar": "".join([n[0] for n in cand.name.split()[:2]]).upper() # Inisial
-        })
-        
-    # 4. Sort by Final Score Descending
-    leaderboard_data.sort(key=lambda x: x["finalScore"], reverse=True)
-    
-    return jsonify(leaderboard_data)
+    def serialize(row):
+        entry, name, title, status = row
+        return {
+            "id": entry.candidate_id,
+            "name": name,
+            "position": title,
+            "positionId": entry.job_id,
+            "cvScore": round(entry.cv_score, 1),
+            "testScore": round(entry.test_score, 1),
+            "finalScore": round(entry.final_score, 1),
+            "status": status, # Applied, Screening, etc
+            "avatar": "".join([n[0] for n in name.split()[:2]]).upper() # Inisial
+        }
+
+    # Urutan (final_score, application_id) DESC = index ix_leaderboard_entries_*_final_score
+    return paginate(query, [LeaderboardEntry.final_score, LeaderboardEntry.application_id], serialize)
 
 
 @dashboard_bp.route("/stats", methods=["GET"])
@@ -136,5 +65,19 @@ def get_dashboard_stats():
         "total_candidates": total_candidates,
         "active_jobs": active_jobs,
         "test_taken": completed_tests,
-        "completion_rate": f"{rate}%"
-    })
\ No newline at end of file
+        "completion_rate": f"{rate}%",
+        "score_distribution": leaderboard_score_distribution()
+    })
+
+
+SCORE_RANGES = (("0-40", 40), ("41-60", 60), ("61-80", 80), ("81-100", None))
+
+def leaderboard_score_distribution():
+    """Jumlah entry leaderboard per rentang final_score (dihitung di DB, bukan dari list penuh di FE)."""
+    ensure_leaderboard()
+    bucket = case(
+        *[(LeaderboardEntry.final_score <= upper, label) for label, upper in SCORE_RANGES if upper is not None],
+        else_=SCORE_RANGES[-1][0]
+    )
+    counts = dict(db.session.query(bucket, func.count()).group_by(bucket).all())
+    return [{"label": label, "count": counts.get(label, 0)} for label, _ in SCORE_RANGES]
\ No newline at end of file
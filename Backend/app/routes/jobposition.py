@@ -4,6 +4,8 @@ from flask_jwt_extended import verify_jwt_in_request
 from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models import JobPosition
+from app.utils.embedding_cache import discard_job_embeddings
+from app.utils.pagination import paginate
 from datetime import datetime
 
 jobposition_bp = Blueprint("jobposition", __name__, url_prefix="/job-positions")
@@ -108,9 +110,8 @@ def list_job_positions():
     if available is not None:
         query = query.filter_by(available=available.lower() == "true")
 
-    jobs = query.order_by(JobPosition.created_at.desc()).all()
-
-    return jsonify([job_to_dict(job) for job in jobs])
+    # Terbaru dulu, keyset pagination (?limit=&after=&count=&fields=)
+    return paginate(query, [JobPosition.created_at, JobPosition.id], job_to_dict)
 
 
 @jobposition_bp.route("/<job_id>", methods=["GET"])
@@ -165,5 +166,6 @@ def delete_job_position(job_id):
 
     db.session.delete(job)
     db.session.commit()
+    discard_job_embeddings([job_id])
 
     return jsonify({"message": "Job position deleted"})
@@ -1,38 +1,54 @@
 import os
+import copy
 import uuid
 import json
 import re
+import zipfile
+import itertools
 from datetime import datetime
 from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
 import numpy as np
 import faiss
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, url_for
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-from openai import OpenAI
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 import re 
 
 from app import db
-from app.models import Resume, Candidate, JobPosition, JobApplication
+from app.models import Resume, ResumeDuplicate, Candidate, JobPosition, JobApplication
+from app.utils.resume_ingest import (
+    STATUS_DONE, upload_path, ingest_resume_sync, enqueue_resume, ingest_resume_batch,
+    save_upload, find_duplicate_resume, record_duplicate
+)
+from app.utils.vector_store import get_vector_store
+from app.utils.chunk_store import get_chunk_store
+from app.utils.lexical_index import get_lexical_index
+from app.utils.embedding_cache import get_job_embedding, job_cache_stats
+from app.utils.llm_cache import LLMResponseCache
+from app.utils.llm_gateway import get_llm_gateway
+from app.utils.leaderboard import refresh_leaderboard_safe
+from app.utils.pagination import paginate
 
 load_dotenv()
 
-BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+ALLOWED_EXT = {"pdf"}
 
-UPLOAD_FOLDER = os.path.join(BASE, "uploads")
-INDEX_FOLDER = os.path.join(BASE, "indexes")
-CHUNKS_FOLDER = os.path.join(BASE, "chunks")
+# Batas upload ZIP (dicek dari header sebelum ekstraksi, cegah zip bomb)
+ZIP_MAX_FILES = int(os.getenv("UPLOAD_ZIP_MAX_FILES", 500))
+ZIP_MAX_FILE_BYTES = int(os.getenv("UPLOAD_ZIP_MAX_FILE_MB", 20)) * 1024 * 1024
+ZIP_MAX_TOTAL_BYTES = int(os.getenv("UPLOAD_ZIP_MAX_TOTAL_MB", 1024)) * 1024 * 1024
 
-ALLOWED_EXT = {"pdf"}
+# Semua panggilan LLM lewat gateway (pool koneksi, rate limit, retry, timeout)
+llm_gateway = get_llm_gateway()
 
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(INDEX_FOLDER, exist_ok=True)
-os.makedirs(CHUNKS_FOLDER, exist_ok=True)
+LLM_MODEL = "meta-llama/llama-3.3-70b-instruct:free"
 
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENAI_API_KEY")
+# Cache respons LLM (TTL detik & jumlah entry maksimum)
+llm_cache = LLMResponseCache(
+    maxsize=int(os.getenv("LLM_CACHE_SIZE", 512)),
+    ttl=int(os.getenv("LLM_CACHE_TTL", 24 * 60 * 60))
 )
 
 screening_bp = Blueprint("screening", __name__)
@@ -107,21 +123,90 @@ def extract_phone(text):
     return m.group(0) if m else None
 
 
-def generate_verdict(context, job_description):
+def parse_llm_json(content):
+    content = content.strip()
+
+    json_match = re.search(r'\{.*\}', content, re.DOTALL)
+    
+    if json_match:
+        json_str = json_match.group(0)
+        return json.loads(json_str)
+    else:
+        # Jika regex gagal, coba parse langsung (mungkin raw json)
+        return json.loads(content)
+
+
+def call_llm_json(messages, max_tokens=1000):
+    """Panggil LLM (via cache + coalescing) dan parse output JSON."""
+    model = LLM_MODEL
+
+    def call_llm():
+        content = llm_gateway.chat(messages, model=model, temperature=0.1, max_tokens=max_tokens)
+        return parse_llm_json(content)
+
+    # Prompt sama (mis. klik "re-analyze") -> pakai hasil cache / request yang sedang jalan
+    key = llm_cache.make_key(model, messages, temperature=0.1, max_tokens=max_tokens)
+    return copy.deepcopy(llm_cache.get_or_call(key, call_llm))
+
+
+JSON_SYSTEM_PROMPT = "You are a strict JSON extractor. Output ONLY valid JSON. Do not use Markdown blocks."
+
+# Batas /rank_job per request: jumlah resume di hasil & jumlah analisis LLM
+RANK_TOP_K_MAX = 500
+RANK_LLM_TOP_MAX = 20
+
+# Batas teks CV yang dikirim ke tahap ekstraksi profil
+PROFILE_CONTEXT_CHARS = 6000
+
+
+def resume_profile_context(meta, max_chars=PROFILE_CONTEXT_CHARS):
     """
-    Prompt LLM yang diperbarui untuk menghasilkan struktur JSONB 
-    yang sesuai dengan tabel Candidate.
+    Teks CV untuk ekstraksi profil, disusun dari chunk terstruktur (chunk_document)
+    di chunk store, bukan potongan awal raw_text. Setiap section mendapat jatah
+    bergiliran (chunk ke-1 tiap section, lalu ke-2, dst.) sampai budget habis,
+    sehingga pengalaman / skill di bagian akhir CV panjang tetap terkirim.
+    Chunk terpilih ditulis sesuai urutan dokumen.
+    """
+    store = get_chunk_store()
+    if store.has(meta["id"]):
+        chunks = store.get_chunks(meta["id"])
+    else:
+        # Resume lama yang belum di-import ke chunk store
+        from extractor import chunk_document
+        chunks = chunk_document(meta["raw_text"] or "")
+
+    by_section = {}
+    for pos, chunk in enumerate(chunks):
+        by_section.setdefault(chunk.get("section"), []).append(pos)
+
+    selected, used = [], 0
+    for turn in itertools.zip_longest(*by_section.values()):
+        for pos in turn:
+            if pos is None:
+                continue
+            size = len(chunks[pos]["text"]) + 1
+            if used + size <= max_chars:
+                selected.append(pos)
+                used += size
+
+    return "\n".join(chunks[pos]["text"] for pos in sorted(selected))
+
+
+def extract_resume_profile(cv_text):
+    """
+    Tahap 1 (sekali per resume): ekstraksi profil terstruktur dari CV,
+    tanpa job description. Hasilnya disimpan di tabel Candidate.
+    cv_text: hasil resume_profile_context (per section, sudah dibatasi).
     """
     prompt = f"""
     Anda adalah parser data CV otomatis. 
-    Tugas: Ekstrak data dari teks CV di bawah dan cocokkan dengan Job Description.
+    Tugas: Ekstrak data terstruktur dari teks CV di bawah.
     
     Output WAJIB berupa JSON valid dengan format persis seperti ini:
     {{
         "education": [{{"institution": "Nama Univ", "degree": "Gelar", "major": "Jurusan", "year": "Tahun"}}],
         "experience": [{{"company": "Nama Perusahaan", "role": "Posisi", "duration": "Lama kerja", "details": "Deskripsi singkat"}}],
         "skills": ["Skill 1", "Skill 2"],
-        "verdict": "Alasan singkat (Bahasa Indonesia) mengapa kandidat ini cocok/tidak (maks 2 kalimat).",
         "summary": "Ringkasan profil profesional 1 kalimat."
     }}
 
@@ -131,93 +216,155 @@ def generate_verdict(context, job_description):
     3. Pastikan JSON valid.
 
     === CV TEXT ===
-    {context}
+    {cv_text}
+    """
+
+    try:
+        return call_llm_json([
+            {"role": "system", "content": JSON_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ], max_tokens=1000)
+
+    except Exception as e:
+        print(f"LLM Profile Error: {e}")
+        return None
+
+
+def generate_verdict(profile, job_description):
+    """
+    Tahap 2 (per job): verdict singkat berdasarkan profil yang sudah diekstrak.
+    Prompt jauh lebih kecil karena tidak mengirim ulang teks CV.
+    """
+    prompt = f"""
+    Nilai kecocokan kandidat dengan Job Description berdasarkan profil berikut.
+
+    Output WAJIB berupa JSON valid:
+    {{"verdict": "Alasan singkat (Bahasa Indonesia) mengapa kandidat ini cocok/tidak (maks 2 kalimat)."}}
+
+    === PROFIL KANDIDAT ===
+    {json.dumps(profile, ensure_ascii=False)}
 
     === JOB DESCRIPTION ===
     {job_description}
     """
 
     try:
-        res = client.chat.completions.create(
-            model="meta-llama/llama-3.3-70b-instruct:free",
-            messages=[
-                {"role": "system", "content": "You are a strict JSON extractor. Output ONLY valid JSON. Do not use Markdown blocks."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=1000
-        )
-
-        content = res.choices[0].message.content.strip()
-
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        
-        if json_match:
-            json_str = json_match.group(0)
-            return json.loads(json_str)
-        else:
-            # Jika regex gagal, coba parse langsung (mungkin raw json)
-            return json.loads(content)
+        result = call_llm_json([
+            {"role": "system", "content": JSON_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ], max_tokens=200)
+        return result.get("verdict") or ""
 
     except Exception as e:
-        return {
-            "education": [{"institution": "Unknown", "degree": "-", "major": "-", "year": "-"}],
-            "experience": [{"company": "-", "role": "-", "duration": "-", "details": "-"}],
-            "skills": [],
-            "summary": "Gagal menganalisis profil secara otomatis.",
-            "verdict": "Terjadi kesalahan saat parsing respons AI."
-        }
+        return "Terjadi kesalahan saat parsing respons AI."
+
+
+def candidate_profile(candidate):
+    """Profil ringkas Candidate yang dikirim ke prompt verdict."""
+    return {
+        "summary": candidate.summary,
+        "skills": candidate.skills or [],
+        "experience": [
+            {"company": e.get("company"), "role": e.get("role"), "duration": e.get("duration")}
+            for e in (candidate.experience or []) if isinstance(e, dict)
+        ],
+        "education": [
+            {"degree": e.get("degree"), "major": e.get("major")}
+            for e in (candidate.education or []) if isinstance(e, dict)
+        ]
+    }
 
 
 def load_resume_meta(resume_id):
     r = db.session.get(Resume, resume_id)
     if not r:
         return None
+    return resume_meta(r)
+
+
+def load_resume_metas(resume_ids):
+    """load_resume_meta untuk banyak resume dalam satu query (urutan sesuai resume_ids)."""
+    rows = {r.id: r for r in Resume.query.filter(Resume.id.in_(resume_ids))} if resume_ids else {}
+    return [resume_meta(rows[rid]) for rid in resume_ids if rid in rows]
+
+
+def resume_meta(r):
     return {
         "id": r.id,
         "filename": r.filename,
         "index_path": r.index_path,
         "chunks_path": r.chunks_path,
-        "raw_text": r.raw_text
+        "raw_text": r.raw_text,
+        "status": r.status
     }
 
 
-def save_candidate_result_structured(resume_id, job_id, meta, extracted_data, match_score):
+def profile_is_extracted(candidate):
+    return candidate is not None and candidate.profile_extracted_at is not None
+
+
+def save_candidate_profile(meta, candidate, profile):
     """
-    Menyimpan data ke tabel Candidate (Master) dan JobApplication (Relasi Job).
+    Buat Candidate (jika belum ada) dan simpan profil hasil LLM.
+    profile None = ekstraksi gagal -> profile_extracted_at tetap kosong agar diulang.
     """
-    try:
-        # 1. Cek apakah Candidate sudah ada berdasarkan resume_id
-        candidate = Candidate.query.filter_by(resume_id=resume_id).first()
+    raw_text = meta["raw_text"] or ""
 
-        raw_text = meta["raw_text"]
-        
+    try:
         if not candidate:
             candidate = Candidate(
-                resume_id=resume_id,
+                resume_id=meta["id"],
                 name=extract_candidate_name(meta["filename"]),
                 email=extract_email(raw_text) or "Not found",
                 phone=extract_phone(raw_text) or "Not found",
-                # Isi data terstruktur dari LLM
-                education=extracted_data.get("education", []),
-                experience=extracted_data.get("experience", []),
-                skills=extracted_data.get("skills", []),
-                summary=extracted_data.get("summary", ""),
+                education=[],
+                experience=[],
+                skills=[],
+                summary="Gagal menganalisis profil secara otomatis.",
                 # Default empty
                 certifications=[],
                 languages=[],
                 social_links={}
             )
             db.session.add(candidate)
-            db.session.flush() # Agar kita dapat ID candidate
-        else:
-            # Update data candidate jika sudah ada (opsional, tergantung kebutuhan)
-            candidate.education = extracted_data.get("education", [])
-            candidate.experience = extracted_data.get("experience", [])
-            candidate.skills = extracted_data.get("skills", [])
-            candidate.summary = extracted_data.get("summary", "")
 
-        # 2. Simpan/Update JobApplication (Many-to-Many)
+        if profile is not None:
+            # Isi data terstruktur dari LLM
+            candidate.education = profile.get("education") or []
+            candidate.experience = profile.get("experience") or []
+            candidate.skills = profile.get("skills") or []
+            candidate.summary = profile.get("summary") or ""
+            candidate.profile_extracted_at = datetime.utcnow()
+
+        db.session.commit()
+        return candidate
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Database Error: {e}")
+        raise e
+
+
+def get_or_extract_candidate(meta):
+    """
+    Ambil Candidate milik resume; jalankan ekstraksi profil LLM hanya jika
+    profil belum pernah berhasil diekstrak (sekali per resume, bukan per job).
+    """
+    candidate = Candidate.query.filter_by(resume_id=meta["id"]).first()
+    if profile_is_extracted(candidate):
+        return candidate
+
+    profile = extract_resume_profile(resume_profile_context(meta))
+    return save_candidate_profile(meta, candidate, profile)
+
+
+def save_candidate_result_structured(candidate, job_id, verdict, match_score):
+    """
+    Menyimpan hasil screening satu job ke JobApplication (Relasi Job).
+    Data profil Candidate tidak disentuh di sini.
+    """
+    try:
+        # Simpan/Update JobApplication (Many-to-Many)
         # Cek apakah sudah pernah apply ke job ini
         application = JobApplication.query.filter_by(
             candidate_id=candidate.id, 
@@ -229,14 +376,14 @@ def save_candidate_result_structured(resume_id, job_id, meta, extracted_data, ma
                 candidate_id=candidate.id,
                 job_id=job_id,
                 match_score=match_score,
-                ai_verdict=extracted_data.get("verdict", ""),
+                ai_verdict=verdict,
                 status="Applied",  # Changed from 'Screening' to 'Applied' for consistency
                 applied_at=datetime.utcnow()
             )
             db.session.add(application)
             db.session.flush()  # Get application ID
             
-            # 3. Auto-progress journey to AI_SCREENING (since AI analysis is done)
+            # Auto-progress journey to AI_SCREENING (since AI analysis is done)
             from app.routes.tracking import get_or_create_journey
             from app.models import RecruitmentStage, JourneyLog
             
@@ -251,18 +398,19 @@ def save_candidate_result_structured(resume_id, job_id, meta, extracted_data, ma
                 previous_stage=RecruitmentStage.CV_SCREENING.value,
                 new_stage=RecruitmentStage.AI_SCREENING.value,
                 action="AI Screening completed",
-                notes=f"AI Match Score: {match_score}%. {extracted_data.get('verdict', '')}",
+                notes=f"AI Match Score: {match_score}%. {verdict}",
                 actor_name="AI System"
             )
             db.session.add(ai_log)
         else:
             # Jika sudah apply, update score dan verdict terbaru
             application.match_score = match_score
-            application.ai_verdict = extracted_data.get("verdict", "")
+            application.ai_verdict = verdict
             application.applied_at = datetime.utcnow()
 
         db.session.commit()
-        return candidate, application
+        refresh_leaderboard_safe([candidate.id])
+        return application
 
     except Exception as e:
         db.session.rollback()
@@ -270,6 +418,80 @@ def save_candidate_result_structured(resume_id, job_id, meta, extracted_data, ma
         raise e
 
 
+def resume_match_score(meta, q_emb):
+    """Skor kemiripan resume vs job: rata-rata top-5 chunk, dinormalisasi 0-100."""
+    resume_id = meta["id"]
+
+    store = get_vector_store()
+    if store.has(resume_id):
+        D, _ = store.search_resume(resume_id, q_emb, 5)
+    else:
+        # Resume lama dengan index per file (belum di-import ke index global)
+        index = faiss.read_index(meta["index_path"])
+        D, _ = index.search(q_emb, min(5, index.ntotal))
+        D = D[0]
+
+    avg_score = float(np.mean(D)) if len(D) else 0.0
+    return normalize_score(avg_score)
+
+
+def analyze_resume_for_job(meta, job, job_text, q_emb):
+    """
+    Skor kemiripan (rata-rata top-5 chunk) + verdict LLM untuk satu resume & satu job,
+    lalu simpan ke JobApplication. Return (candidate, application).
+    """
+    score = resume_match_score(meta, q_emb)
+
+    # Tahap 1: profil CV (sekali per resume) -> Tahap 2: verdict per job
+    candidate = get_or_extract_candidate(meta)
+    verdict = generate_verdict(candidate_profile(candidate), job_text)
+
+    application = save_candidate_result_structured(
+        candidate=candidate,
+        job_id=job.id,
+        verdict=verdict,
+        match_score=score
+    )
+    return candidate, application
+
+
+def analyze_resumes_for_job(metas, job, job_text, q_emb):
+    """
+    Versi batch analyze_resume_for_job: panggilan LLM (profil & verdict) dijalankan
+    paralel lewat thread pool gateway, penulisan DB tetap di thread request.
+    Return list (candidate, application) sesuai urutan metas.
+    """
+    scores = [resume_match_score(meta, q_emb) for meta in metas]
+
+    resume_ids = [meta["id"] for meta in metas]
+    candidates = {
+        c.resume_id: c for c in Candidate.query.filter(Candidate.resume_id.in_(resume_ids)).all()
+    } if resume_ids else {}
+
+    # Tahap 1: hanya resume yang profilnya belum ada
+    todo = [meta for meta in metas if not profile_is_extracted(candidates.get(meta["id"]))]
+    profiles = llm_gateway.map(lambda meta: extract_resume_profile(resume_profile_context(meta)), todo)
+    for meta, profile in zip(todo, profiles):
+        candidates[meta["id"]] = save_candidate_profile(meta, candidates.get(meta["id"]), profile)
+
+    # Tahap 2: verdict per job untuk semua resume
+    ordered = [candidates[rid] for rid in resume_ids]
+    verdicts = llm_gateway.map(
+        lambda profile: generate_verdict(profile, job_text),
+        [candidate_profile(c) for c in ordered]
+    )
+
+    return [
+        (candidate, save_candidate_result_structured(
+            candidate=candidate,
+            job_id=job.id,
+            verdict=verdict,
+            match_score=score
+        ))
+        for candidate, verdict, score in zip(ordered, verdicts, scores)
+    ]
+
+
 @screening_bp.route("/upload_resume", methods=["POST"])
 def upload_resume():
     if "file" not in request.files:
@@ -281,34 +503,30 @@ def upload_resume():
 
     resume_id = str(uuid.uuid4())
     filename = secure_filename(f.filename)
-    pdf_path = os.path.join(UPLOAD_FOLDER, f"{resume_id}_{filename}")
-    f.save(pdf_path)
-
-    from extractor import extract_text_from_pdf, chunk_text, embed_chunks
+    pdf_path = upload_path(resume_id, filename)
+    file_hash = save_upload(f.stream, pdf_path)
 
-    text = extract_text_from_pdf(pdf_path)
-    chunks = chunk_text(text, 800, 100)
-    embeddings = embed_chunks(chunks)
+    # File yang sama persis sudah pernah di-upload -> pakai Resume lama (tanpa OCR / embed ulang)
+    existing = find_duplicate_resume(file_hash=file_hash)
+    if existing:
+        record_duplicate(existing, filename, file_hash, "file", pdf_path)
+        db.session.commit()
+        return duplicate_response(existing)
 
-    index = faiss.IndexFlatIP(embeddings.shape[1])
-    index.add(embeddings)
+    # Mode: "sync" (diproses di request ini) atau "queue" (worker process)
+    mode = request.args.get("mode") or current_app.config["RESUME_INGEST_MODE"]
 
-    index_path = os.path.join(INDEX_FOLDER, f"{resume_id}.faiss")
-    chunks_path = os.path.join(CHUNKS_FOLDER, f"{resume_id}.json")
+    if mode == "queue":
+        enqueue_resume(resume_id, filename, pdf_path, file_hash)
+        return jsonify({
+            "id": resume_id,
+            "status": "pending",
+            "status_url": url_for("screening.resume_status", resume_id=resume_id)
+        }), 202
 
-    faiss.write_index(index, index_path)
-    json.dump(chunks, open(chunks_path, "w", encoding="utf-8"), ensure_ascii=False)
-    
-    # Simpan Resume saja dulu
-    r = Resume(
-        id=resume_id,
-        filename=filename,
-        index_path=index_path,
-        chunks_path=chunks_path,
-        raw_text=text
-    )
-    db.session.add(r)
-    db.session.commit()
+    r = ingest_resume_sync(resume_id, filename, pdf_path, file_hash)
+    if r.id != resume_id:
+        return duplicate_response(r)
 
     return jsonify({
         "id": resume_id,
@@ -316,6 +534,189 @@ def upload_resume():
     })
 
 
+def duplicate_response(resume):
+    """Response upload yang dialihkan ke Resume lama (id lama dipakai untuk match)."""
+    body = {
+        "id": resume.id,
+        "status": "uploaded" if resume.status == STATUS_DONE else resume.status,
+        "duplicate": True
+    }
+    if resume.status != STATUS_DONE:
+        body["status_url"] = url_for("screening.resume_status", resume_id=resume.id)
+    return jsonify(body)
+
+
+def zip_limit_error(zf):
+    """Pesan error jika isi ZIP melewati batas jumlah / ukuran (ukuran tak terkompresi), selain itu None."""
+    infos = zf.infolist()
+    if len(infos) > ZIP_MAX_FILES:
+        return f"zip contains more than {ZIP_MAX_FILES} files"
+    if any(info.file_size > ZIP_MAX_FILE_BYTES for info in infos):
+        return f"zip member larger than {ZIP_MAX_FILE_BYTES // (1024 * 1024)} MB"
+    if sum(info.file_size for info in infos) > ZIP_MAX_TOTAL_BYTES:
+        return f"zip uncompressed size exceeds {ZIP_MAX_TOTAL_BYTES // (1024 * 1024)} MB"
+    return None
+
+
+@screening_bp.route("/upload_resumes", methods=["POST"])
+def upload_resumes():
+    """
+    Bulk upload CV: terima satu file ZIP (field 'file') atau banyak PDF (field 'files').
+    Semua CV di-embed dalam satu batch dan disimpan dalam satu transaksi.
+    """
+    items = []
+
+    def save_pdf(name, stream):
+        resume_id = str(uuid.uuid4())
+        filename = secure_filename(os.path.basename(name))
+        pdf_path = upload_path(resume_id, filename)
+        file_hash = save_upload(stream, pdf_path)
+        items.append((resume_id, filename, pdf_path, file_hash))
+
+    archive = request.files.get("file")
+    if archive and archive.filename.lower().endswith(".zip"):
+        try:
+            with zipfile.ZipFile(archive.stream) as zf:
+                error = zip_limit_error(zf)
+                if error:
+                    return jsonify({"error": error}), 400
+                for info in zf.infolist():
+                    name = info.filename
+                    if info.is_dir() or name.startswith("__MACOSX/") or not allowed_file(name):
+                        continue
+                    with zf.open(info) as member:
+                        save_pdf(name, member)
+        except zipfile.BadZipFile:
+            return jsonify({"error": "invalid zip file"}), 400
+    else:
+        for f in request.files.getlist("files"):
+            if f and allowed_file(f.filename):
+                save_pdf(f.filename, f.stream)
+
+    if not items:
+        return jsonify({"error": "no pdf files found"}), 400
+
+    resumes, failed, duplicates = ingest_resume_batch(items)
+
+    return jsonify({
+        "count": len(resumes),
+        "resumes": [{"id": r.id, "filename": r.filename, "status": "uploaded"} for r in resumes],
+        "duplicates": duplicates,
+        "failed": failed
+    }), 201
+
+
+@screening_bp.route("/metrics", methods=["GET"])
+def screening_metrics():
+    """Metric pipeline screening (status & waktu load model)."""
+    from extractor import model_stats
+
+    return jsonify({
+        "models": model_stats(),
+        "job_embedding_cache": job_cache_stats(),
+        "llm_cache": llm_cache.stats(),
+        "llm_gateway": llm_gateway.stats(),
+        "chunk_store": get_chunk_store().stats(),
+        "vector_store": get_vector_store().stats(),
+        "lexical_index": get_lexical_index().stats()
+    })
+
+
+@screening_bp.route("/resumes/<resume_id>/status", methods=["GET"])
+def resume_status(resume_id):
+    """Polling status ingest CV (pending / done / failed)."""
+    r = db.session.get(Resume, resume_id)
+    if not r:
+        # Mode queue: upload yang ternyata duplikat teks dialihkan ke Resume lama
+        dup = db.session.get(ResumeDuplicate, resume_id)
+        if dup:
+            return duplicate_response(dup.resume)
+        return jsonify({"error": "resume not found"}), 404
+
+    return jsonify({
+        "id": r.id,
+        "filename": r.filename,
+        "status": r.status,
+        "error": r.error,
+        "uploaded_at": r.uploaded_at.isoformat() if r.uploaded_at else None
+    })
+
+
+@screening_bp.route("/resumes/duplicates", methods=["GET"])
+def duplicate_clusters():
+    """
+    Laporan cluster CV duplikat:
+    - Resume yang berbagi fingerprint (data lama / hasil mode queue),
+    - upload yang dialihkan ke Resume lama (ResumeDuplicate).
+    """
+    resumes = Resume.query.filter(
+        db.or_(Resume.file_hash.isnot(None), Resume.text_hash.isnot(None))
+    ).order_by(Resume.uploaded_at).all()
+
+    # Union-find sederhana: Resume dengan file_hash ATAU text_hash sama = satu cluster
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    first_by_hash = {}
+    for r in resumes:
+        find(r.id)
+        for key in (("file", r.file_hash), ("text", r.text_hash)):
+            if not key[1]:
+                continue
+            if key in first_by_hash:
+                parent[find(r.id)] = find(first_by_hash[key])
+            else:
+                first_by_hash[key] = r.id
+
+    members = {}
+    for r in resumes:
+        members.setdefault(find(r.id), []).append(r)
+
+    redirected = {}
+    for d in ResumeDuplicate.query.order_by(ResumeDuplicate.uploaded_at).all():
+        redirected.setdefault(find(d.resume_id), []).append(d)
+
+    clusters = []
+    for root in set(members) | set(redirected):
+        # Resume lama tanpa fingerprint tetap menjadi anggota cluster-nya sendiri
+        rows = members.get(root) or [db.session.get(Resume, root)]
+        uploads = redirected.get(root, [])
+        if len(rows) + len(uploads) < 2:
+            continue
+
+        canonical = rows[0]
+        clusters.append({
+            "resume_id": canonical.id,
+            "filename": canonical.filename,
+            "size": len(rows) + len(uploads),
+            "resumes": [{
+                "id": r.id,
+                "filename": r.filename,
+                "status": r.status,
+                "uploaded_at": r.uploaded_at.isoformat() if r.uploaded_at else None
+            } for r in rows],
+            "redirected_uploads": [{
+                "filename": d.filename,
+                "match": d.match,
+                "resume_id": d.resume_id,
+                "uploaded_at": d.uploaded_at.isoformat() if d.uploaded_at else None
+            } for d in uploads]
+        })
+
+    clusters.sort(key=lambda c: c["size"], reverse=True)
+
+    return jsonify({
+        "total_clusters": len(clusters),
+        "redirected_uploads": sum(len(c["redirected_uploads"]) for c in clusters),
+        "clusters": clusters
+    })
+
+
 @screening_bp.route("/match_resume", methods=["POST"])
 def match_resume():
     data = request.get_json(force=True)
@@ -329,6 +730,8 @@ def match_resume():
     meta = load_resume_meta(resume_id)
     if not meta:
         return jsonify({"error": "resume not found"}), 404
+    if meta["status"] != "done":
+        return jsonify({"error": f"resume belum siap (status: {meta['status']})"}), 409
 
     job = None
 
@@ -348,42 +751,18 @@ def match_resume():
     if not job:
         return jsonify({"error": "Job position not found"}), 404
 
-    from extractor import embed_query
-
-    index = faiss.read_index(meta["index_path"])
-    chunks = json.load(open(meta["chunks_path"], encoding="utf-8"))
-
     job_text = job_to_text(job)
-    q_emb = embed_query(job_text)
+    q_emb = get_job_embedding(job, job_text)
 
-    D, I = index.search(q_emb, min(5, len(chunks)))
-    avg_score = float(np.mean(D[0])) if len(D[0]) else 0.0
-    score = normalize_score(avg_score)
-
-    context = "\n\n".join(chunks[i] for i in I[0][:3])
-
-    # Extract Structured Data via LLM
-    extracted_data = generate_verdict(context, job_text)
-
-    # Simpan ke Database (Candidate & JobApplication)
-    candidate, application = save_candidate_result_structured(
-        resume_id=meta["id"],
-        job_id=job.id,
-        meta=meta,
-        extracted_data=extracted_data,
-        match_score=score
-    )
-    
-    # Format Skills untuk response (flat list)
-    skills_list = extracted_data.get("skills", [])
+    candidate, application = analyze_resume_for_job(meta, job, job_text, q_emb)
     
     # Format Education string untuk response cepat di tabel UI
-    edu_list = extracted_data.get("education", [])
-    edu_str = f"{edu_list[0]['degree']} {edu_list[0]['major']}" if edu_list else "Not found"
+    edu_list = candidate.education or []
+    edu_str = f"{edu_list[0].get('degree', '')} {edu_list[0].get('major', '')}" if edu_list else "Not found"
     
     # Format Experience string
-    exp_list = extracted_data.get("experience", [])
-    exp_str = f"{exp_list[0]['role']} at {exp_list[0]['company']}" if exp_list else "Not found"
+    exp_list = candidate.experience or []
+    exp_str = f"{exp_list[0].get('role', '')} at {exp_list[0].get('company', '')}" if exp_list else "Not found"
 
     # Response JSON
     return jsonify({
@@ -393,7 +772,7 @@ def match_resume():
         "phone": candidate.phone,
         "education": edu_str, # String ringkas untuk tabel UI
         "experience": exp_str, # String ringkas untuk tabel UI
-        "skills": skills_list,
+        "skills": candidate.skills or [],
         "verdict": application.ai_verdict,
         "match_score": application.match_score,
         "top_position": job.title, # Helper frontend
@@ -401,6 +780,84 @@ def match_resume():
     })
 
 
+@screening_bp.route("/rank_job/<job_id>", methods=["GET", "POST"])
+def rank_job(job_id):
+    """
+    Ranking semua resume untuk satu job: embed job sekali, lalu skor seluruh chunk
+    di index global dalam satu pass vektor. Parameter: top_k (default 50, maks RANK_TOP_K_MAX).
+    POST {"llm_top": n} juga menjalankan analisis LLM + simpan aplikasi untuk n teratas
+    (maks RANK_LLM_TOP_MAX per request).
+    """
+    job = db.session.get(JobPosition, job_id)
+    if not job:
+        return jsonify({"error": "Job position not found"}), 404
+
+    top_k = max(1, min(request.args.get("top_k", 50, type=int), RANK_TOP_K_MAX))
+    llm_top = 0
+    if request.method == "POST":
+        raw = (request.get_json(silent=True) or {}).get("llm_top", 0)
+        try:
+            # bool / float ditolak walaupun bisa di-int(); string seperti "²" -> ValueError
+            llm_top = -1 if isinstance(raw, (bool, float)) else int(raw)
+        except (TypeError, ValueError):
+            llm_top = -1
+        if llm_top < 0:
+            return jsonify({"error": "llm_top harus bilangan bulat >= 0"}), 400
+        llm_top = min(llm_top, RANK_LLM_TOP_MAX)
+
+    job_text = job_to_text(job)
+    q_emb = get_job_embedding(job, job_text)
+
+    store = get_vector_store()
+    ranked = store.rank(q_emb, top_k=top_k)
+
+    resume_ids = [rid for rid, _ in ranked]
+    candidates = {
+        c.resume_id: c for c in Candidate.query.filter(Candidate.resume_id.in_(resume_ids)).all()
+    } if resume_ids else {}
+    # Cukup nama file untuk daftar hasil; raw_text tidak dibaca (konteks LLM dari chunk store)
+    filenames = dict(
+        db.session.query(Resume.id, Resume.filename).filter(Resume.id.in_(resume_ids))
+    ) if resume_ids else {}
+
+    # Analisis LLM untuk n teratas dijalankan paralel, bukan satu per satu
+    llm_ids = [rid for rid, _ in ranked[:llm_top] if rid in filenames]
+    analyzed = dict(zip(llm_ids, analyze_resumes_for_job(
+        load_resume_metas(llm_ids), job, job_text, q_emb
+    ))) if llm_ids else {}
+
+    results = []
+    for rank, (rid, similarity) in enumerate(ranked, start=1):
+        cand = candidates.get(rid)
+        filename = filenames.get(rid)
+        item = {
+            "rank": rank,
+            "resume_id": rid,
+            "candidate_id": cand.id if cand else None,
+            "name": cand.name if cand else (extract_candidate_name(filename) if filename else None),
+            "match_score": normalize_score(similarity),
+            "similarity": round(similarity, 4)
+        }
+
+        if rid in analyzed:
+            candidate, application = analyzed[rid]
+            item.update({
+                "candidate_id": candidate.id,
+                "name": candidate.name,
+                "verdict": application.ai_verdict,
+                "application_status": application.status
+            })
+
+        results.append(item)
+
+    return jsonify({
+        "job_id": job.id,
+        "job_title": job.title,
+        "indexed_chunks": len(store),
+        "results": results
+    })
+
+
 @screening_bp.route("/candidates", methods=["GET"])
 def list_candidates():
     """
@@ -418,10 +875,8 @@ def list_candidates():
     if job_id:
         query = query.filter(JobApplication.job_id == job_id)
         
-    results = query.order_by(JobApplication.match_score.desc()).all()
-
-    output = []
-    for cand, app, job in results:
+    def serialize(row):
+        cand, app, job = row
         # Helper string formatting
         edu = cand.education[0] if cand.education else {}
         edu_str = f"{edu.get('degree', '')} {edu.get('major', '')}" if edu else "-"
@@ -429,7 +884,7 @@ def list_candidates():
         exp = cand.experience[0] if cand.experience else {}
         exp_str = f"{exp.get('role', '')}" if exp else "-"
 
-        output.append({
+        return {
             "id": cand.id,
             "resume_id": cand.resume_id,
             "name": cand.name,
@@ -443,6 +898,7 @@ def list_candidates():
             "verdict": app.ai_verdict,
             "application_status": app.status,
             "created_at": app.applied_at.isoformat()
-        })
-        
-    return jsonify(output)
\ No newline at end of file
+        }
+
+    # Urut match_score tertinggi (NULL dihitung 0), keyset pagination
+    return paginate(query, [func.coalesce(JobApplication.match_score, 0), JobApplication.id], serialize)
\ No newline at end of file
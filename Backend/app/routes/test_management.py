@@ -5,6 +5,16 @@ from app.models import (
     PapiQuestion, CfitQuestion, KraepelinConfig, 
     PapiScoringMap, CfitNorma, TestSubmission, TestLink, Candidate
 )
+from app.utils.leaderboard import refresh_leaderboard_safe
+from app.utils.pagination import paginate
+from app.utils.psychotest_scoring import (
+    PAPI_ASPECTS, papi_key, score_papi, cfit_key, score_cfit, score_kraepelin, kraepelin_grid
+)
+from app.utils.rescoring import RESCORABLE_TYPES, rescore_submissions
+from app.utils.bulk_seed import (
+    SeedValidationError, read_seed_rows, collect_columns, int_column, str_column,
+    unique_column, raise_if_invalid, bulk_insert
+)
 from sqlalchemy.exc import IntegrityError
 import numpy as np
 import os
@@ -82,23 +92,24 @@ def get_all_submissions():
         TestLink, TestSubmission.link_id == TestLink.id
     ).join(
         Candidate, TestLink.candidate_id == Candidate.id
-    ).order_by(TestSubmission.submitted_at.desc()).all()
-    
-    output = []
-    for sub, link, candidate in results:
+    )
+
+    def serialize(row):
+        sub, link, candidate = row
         # Safety check: Pastikan scores bukan None
         scores_data = sub.scores if sub.scores else {}
-        
-        output.append({
+
+        return {
             "id": sub.id,
             "candidate_id": link.candidate_id,
             "candidate_name": candidate.name,  # Nama kandidat dari tabel Candidate
             "test_type": sub.test_type,
             "scores": scores_data,
             "submitted_at": sub.submitted_at.isoformat()
-        })
-    
-    return jsonify(output)
+        }
+
+    # Terbaru dulu, keyset pagination (?limit=&after=&count=&fields=)
+    return paginate(results, [TestSubmission.submitted_at, TestSubmission.id], serialize)
 
 
 @mgmt_bp.route("/generate-link", methods=["POST"])
@@ -119,6 +130,8 @@ def generate_link():
     if existing_link:
         db.session.delete(existing_link)
         db.session.commit()
+        # Submission link lama tidak lagi terhubung ke kandidat -> skor psikotes di leaderboard ikut hilang
+        refresh_leaderboard_safe([candidate_id])
 
     try:
         new_link = TestLink(
@@ -172,15 +185,19 @@ def get_all_links():
     # Ambil semua link dengan join ke Candidate untuk nama
     results = db.session.query(TestLink, Candidate).join(
         Candidate, TestLink.candidate_id == Candidate.id
-    ).order_by(TestLink.created_at.desc()).all()
-    
-    return jsonify([{
-        "id": link.id,
-        "candidateName": candidate.name,  # Nama kandidat actual
-        "token": link.token,
-        "status": link.status,
-        "createdAt": link.created_at.isoformat() if link.created_at else None
-    } for link, candidate in results])
+    )
+
+    def serialize(row):
+        link, candidate = row
+        return {
+            "id": link.id,
+            "candidateName": candidate.name,  # Nama kandidat actual
+            "token": link.token,
+            "status": link.status,
+            "createdAt": link.created_at.isoformat() if link.created_at else None
+        }
+
+    return paginate(results, [TestLink.created_at, TestLink.id], serialize)
 
 
 # Tambahkan ini di backend Anda (di dalam mgmt_bp)
@@ -227,20 +244,8 @@ def submit_papi():
         return jsonify({"error": "Token tidak valid atau tidak ditemukan"}), 404
     # -------------------------------------------------
 
-    papi_scores = {
-        key: 0 for key in ['G','L','I','T','V','S','R','D','C','E','N','A','P','X','B','O','Z','K','F','W']
-    }
-
-    scoring_maps = PapiScoringMap.query.all()
-
-    for idx, ans_index in enumerate(answers):
-        if ans_index is not None:
-            choice_char = 'A' if ans_index == 0 else 'B'
-            
-            mapping = next((m for m in scoring_maps if m.question_id == idx + 1 and m.choice == choice_char), None)
-            
-            if mapping:
-                papi_scores[mapping.aspect] += 1
+    # Kunci scoring PAPI di-cache per process (lihat app/utils/psychotest_scoring.py)
+    papi_scores = score_papi(answers)
 
     submission = TestSubmission(
         link_id=link.id, 
@@ -322,6 +327,7 @@ def add_cfit_question():
         )
         db.session.add(new_q)
         db.session.commit()
+        cfit_key.invalidate()
         return jsonify({"message": "Soal CFIT berhasil disimpan", "id": new_q.id}), 201
     except Exception as e:
         db.session.rollback()
@@ -340,6 +346,7 @@ def delete_cfit_question(question_id):
         
         db.session.delete(q)
         db.session.commit()
+        cfit_key.invalidate()
         return jsonify({"message": "Soal berhasil dihapus"})
     except Exception as e:
         db.session.rollback()
@@ -357,53 +364,33 @@ def submit_cfit():
         return jsonify({"error": "Token tidak valid atau tidak ditemukan"}), 404
     # -------------------------------------------------
 
-    questions = CfitQuestion.query.order_by(CfitQuestion.id).all()
-    
-    raw_score = 0
-    details = []
-
-    for idx, q in enumerate(questions):
-        is_correct = False
-        if idx < len(answers) and answers[idx] is not None:
-            if answers[idx] == q.correct_answer:
-                raw_score += 1
-                is_correct = True
-        
-        details.append({
-            "q_id": q.id,
-            "user_ans": answers[idx],
-            "correct": is_correct
-        })
-
-    norma = CfitNorma.query.filter_by(raw_score=raw_score).first()
-    
-    iq_score = norma.iq_score if norma else 0
-    classification = norma.classification if norma else "Unclassified"
+    # Kunci jawaban & norma CFIT di-cache per process (lihat app/utils/psychotest_scoring.py)
+    scores = score_cfit(answers)
 
     submission = TestSubmission(
         link_id=link.id,  # <--- [PENTING] Masukkan ID link di sini
         test_type='cfit',
         raw_answers=answers,
-        scores={
-            "raw_score": raw_score,
-            "iq": iq_score,
-            "classification": classification,
-            "detail_breakdown": details
-        }
+        scores=scores
     )
     db.session.add(submission)
     db.session.commit()
+    refresh_leaderboard_safe([link.candidate_id])
 
-    return jsonify({"status": "success", "iq": iq_score})
+    return jsonify({"status": "success", "iq": scores["iq"]})
 
-@mgmt_bp.route("/config/kraepelin", methods=["GET", "PUT"])
-def kraepelin_config_mgmt():
+def get_kraepelin_config():
+    """KraepelinConfig aktif (dibuat dengan nilai default jika belum ada)."""
     config = KraepelinConfig.query.first()
-    
     if config is None:
         config = KraepelinConfig(columns=50, rows=27, duration_per_column=15)
         db.session.add(config)
         db.session.commit()
+    return config
+
+@mgmt_bp.route("/config/kraepelin", methods=["GET", "PUT"])
+def kraepelin_config_mgmt():
+    config = get_kraepelin_config()
 
     if request.method == "PUT":
         data = request.json
@@ -419,139 +406,197 @@ def kraepelin_config_mgmt():
         "durationPerColumn": config.duration_per_column
     })
 
+@submit_bp.route("/kraepelin/<string:token>", methods=["GET"])
+def get_kraepelin_sheet(token):
+    """Config + lembar soal Kraepelin milik link ini (grid dibuat di server dari seed link)."""
+    link = TestLink.query.filter_by(token=token).first()
+    if not link:
+        return jsonify({"error": "Link tidak ditemukan"}), 404
+    if link.status != 'active':
+        return jsonify({"error": "Link sudah tidak aktif"}), 403
+
+    config = get_kraepelin_config()
+    return jsonify({
+        "columns": config.columns,
+        "rows": config.rows,
+        "durationPerColumn": config.duration_per_column,
+        "grid": kraepelin_grid(link.kraepelin_seed, (config.columns, config.rows)).tolist()
+    })
+
 @submit_bp.route("/kraepelin", methods=["POST"])
 def submit_kraepelin():
     data = request.get_json()
     token = data.get('token')
     
-    # Data hasil hitungan FE
-    fe_results = data.get('results') 
-    raw_answers = data.get('answers') # Opsional disimpan
+    raw_answers = data.get('answers') # Jawaban per kolom (null = tidak diisi)
     
     link = TestLink.query.filter_by(token=token).first()
     if not link: return jsonify({"error": "Unauthorized"}), 401
 
-    # Backend tinggal simpan saja, tidak perlu numpy lagi
+    # Skor selalu dihitung di backend terhadap grid dari seed link; 'grid' / 'results' dari FE diabaikan
+    config = get_kraepelin_config()
+    grid = kraepelin_grid(link.kraepelin_seed, (config.columns, config.rows))
+    try:
+        scores = score_kraepelin(grid, raw_answers or [], shape=(config.columns, config.rows))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    raw_answers = {"grid": grid.tolist(), "answers": raw_answers} # Grid ikut disimpan agar bisa di-rescore
+
     submission = TestSubmission(
         link_id=link.id,
         test_type='kraepelin',
         raw_answers=raw_answers, # Simpan raw data untuk backup/audit
-        scores=fe_results        # Simpan hasil hitungan FE (panker, janker)
+        scores=scores            # panker, janker, tianker, hanker + grade
     )
     db.session.add(submission)
     db.session.commit()
+    refresh_leaderboard_safe([link.candidate_id])
     
-    return jsonify({"status": "success", "data": fe_results})
+    return jsonify({"status": "success", "data": scores})
+
+
+@mgmt_bp.route("/rescore/<string:test_type>", methods=["POST"])
+def rescore_test_submissions(test_type):
+    """
+    Hitung ulang skor submission lama dengan kunci / norma terbaru.
+    ?dry_run=true hanya melaporkan diff. Untuk data besar gunakan `flask psychotest rescore`
+    (worker process paralel); endpoint ini memproses di dalam request.
+    """
+    if test_type not in RESCORABLE_TYPES:
+        return jsonify({"error": f"test_type harus salah satu dari {', '.join(RESCORABLE_TYPES)}"}), 400
+
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true", "yes")
+    try:
+        report = rescore_submissions(test_type, workers=1, dry_run=dry_run)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+    return jsonify(report)
 
 
 # Tambahkan di routes/test_management.py (pastikan import model sudah ada)
 
+# Seeder menerima body JSON list, CSV atau JSONL (body langsung / upload file "file");
+# validasi per kolom dulu, lalu INSERT multi-row (lihat app/utils/bulk_seed.py).
+
+def seed_error_response(e):
+    db.session.rollback()
+    if isinstance(e, SeedValidationError):
+        return jsonify({"error": str(e), "details": e.errors}), 400
+    return jsonify({"error": str(e)}), 500
+
+
 @mgmt_bp.route("/seed/cfit-norma", methods=["POST"])
 def seed_cfit_norma():
-    """Endpoint untuk mengisi tabel Norma CFIT sekaligus"""
-    data = request.get_json() # Mengharapkan List of objects
-    
+    """Endpoint untuk mengisi tabel Norma CFIT sekaligus (field: rs, iq, class)"""
     try:
-        # Hapus data lama agar tidak duplikat (Opsional, hati-hati)
+        columns = collect_columns(read_seed_rows(), ["rs", "iq", "class"])
+        errors = []
+        raw_score, _ = int_column(columns["rs"], "rs", errors, min_value=0)
+        iq_score, _ = int_column(columns["iq"], "iq", errors)
+        classification, _ = str_column(columns["class"], "class", errors, max_length=50)
+        unique_column(raw_score, "rs", errors)
+        raise_if_invalid(errors)
+
+        # Data lama diganti seluruhnya (dalam satu transaksi)
         CfitNorma.query.delete()
-        
-        for item in data:
-            norma = CfitNorma(
-                raw_score=item['rs'],
-                iq_score=item['iq'],
-                classification=item['class']
-            )
-            db.session.add(norma)
+        count = bulk_insert(CfitNorma, [
+            {"raw_score": rs, "iq_score": iq, "classification": cls}
+            for rs, iq, cls in zip(raw_score.tolist(), iq_score.tolist(), classification.tolist())
+        ])
         
         db.session.commit()
-        return jsonify({"message": f"Berhasil memasukkan {len(data)} data norma CFIT"}), 201
+        cfit_key.invalidate()
+        return jsonify({"message": f"Berhasil memasukkan {count} data norma CFIT"}), 201
     except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+        return seed_error_response(e)
 
 @mgmt_bp.route("/seed/papi-map", methods=["POST"])
 def seed_papi_map():
     """Endpoint untuk mengisi Kunci Jawaban Scoring PAPI (G, L, I, dst)"""
-    data = request.get_json()
-    
     try:
+        # item format: {"q": 1, "a": "G", "b": "N"} -> artinya Choice A=G, Choice B=N
+        columns = collect_columns(read_seed_rows(), ["q", "a", "b"])
+        errors = []
+        question_id, _ = int_column(columns["q"], "q", errors, min_value=1)
+        aspect_a, _ = str_column(columns["a"], "a", errors, choices=PAPI_ASPECTS)
+        aspect_b, _ = str_column(columns["b"], "b", errors, choices=PAPI_ASPECTS)
+        unique_column(question_id, "q", errors)
+        raise_if_invalid(errors)
+
+        # Dua baris mapping per soal: A lalu B
         PapiScoringMap.query.delete()
-        
-        for item in data:
-            # item format: {"q": 1, "a": "G", "b": "N"} -> artinya Choice A=G, Choice B=N
-            
-            # Mapping A
-            map_a = PapiScoringMap(question_id=item['q'], choice='A', aspect=item['a'])
-            db.session.add(map_a)
-            
-            # Mapping B
-            map_b = PapiScoringMap(question_id=item['q'], choice='B', aspect=item['b'])
-            db.session.add(map_b)
+        count = bulk_insert(PapiScoringMap, [
+            {"question_id": q, "choice": choice, "aspect": aspect}
+            for q, a, b in zip(question_id.tolist(), aspect_a.tolist(), aspect_b.tolist())
+            for choice, aspect in (("A", a), ("B", b))
+        ])
             
         db.session.commit()
-        return jsonify({"message": "Mapping Scoring PAPI berhasil disimpan"}), 201
+        papi_key.invalidate()
+        return jsonify({"message": "Mapping Scoring PAPI berhasil disimpan", "rows": count}), 201
     except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+        return seed_error_response(e)
     
 
 
 @mgmt_bp.route("/seed/papi-questions", methods=["POST"])
 def seed_papi_questions():
-    """Mengisi 90 Soal PAPI Kostick sekaligus"""
-    data = request.get_json() # List of {id, a, b}
-    
+    """Mengisi 90 Soal PAPI Kostick sekaligus (field: id, a, b)"""
     try:
-        # Reset data lama (Opsional, agar tidak duplikat)
-        # db.session.query(PapiQuestion).delete() 
-        
-        for item in data:
-            # Cek apakah soal sudah ada berdasarkan ID
-            existing = PapiQuestion.query.get(item['id'])
-            if not existing:
-                q = PapiQuestion(
-                    id=item['id'],
-                    statement_a=item['a'],
-                    statement_b=item['b']
-                )
-                db.session.add(q)
+        columns = collect_columns(read_seed_rows(), ["id", "a", "b"])
+        errors = []
+        question_id, _ = int_column(columns["id"], "id", errors, min_value=1)
+        statement_a, _ = str_column(columns["a"], "a", errors)
+        statement_b, _ = str_column(columns["b"], "b", errors)
+        unique_column(question_id, "id", errors)
+        raise_if_invalid(errors)
+
+        # Soal yang sudah ada (berdasarkan ID) dilewati: ON CONFLICT (id) DO NOTHING
+        count = bulk_insert(PapiQuestion, [
+            {"id": q, "statement_a": a, "statement_b": b}
+            for q, a, b in zip(question_id.tolist(), statement_a.tolist(), statement_b.tolist())
+        ], conflict_columns=["id"])
         
         db.session.commit()
-        return jsonify({"message": f"Berhasil seed {len(data)} soal PAPI"}), 201
+        return jsonify({"message": f"Berhasil seed {count} soal PAPI"}), 201
     except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+        return seed_error_response(e)
 
 
 @mgmt_bp.route("/seed/cfit-questions", methods=["POST"])
 def seed_cfit_questions():
     """Mengisi Soal CFIT (Metadata & Kunci Jawaban)"""
-    data = request.get_json()
-    
     try:
-        # Hapus data lama (Opsional)
-        # db.session.query(CfitQuestion).delete()
-        
-        for item in data:
-            # item format: {subtest: 1, order: 1, answer: 2, options: "A,B,C,D,E,F"}
-            
-            # Kita asumsikan gambar sudah diupload manual ke folder static
-            # dengan nama: cfit_s{subtest}_{order}.jpg
-            img_path = f"/static/uploads/cfit/cfit_s{item['subtest']}_{item['order']}.jpg"
-            
-            q = CfitQuestion(
-                subtest=item['subtest'],
-                subtest_name=f"Subtest {item['subtest']}",
-                instruction="Pilihlah jawaban yang paling tepat.", # Default instruction
-                image_url=img_path, 
-                options=item.get('options', "A,B,C,D,E,F"),
-                correct_answer=item['answer'],
-                order=item['order']
-            )
-            db.session.add(q)
+        # item format: {subtest: 1, order: 1, answer: 2, options: "A,B,C,D,E,F"}
+        columns = collect_columns(read_seed_rows(), ["subtest", "order", "answer", "options"])
+        errors = []
+        subtest, _ = int_column(columns["subtest"], "subtest", errors, min_value=1)
+        order, _ = int_column(columns["order"], "order", errors, min_value=1)
+        answer, _ = int_column(columns["answer"], "answer", errors, min_value=0)
+        options, no_options = str_column(columns["options"], "options", errors, max_length=255, required=False)
+        unique_column(np.char.add(np.char.add(subtest.astype(str), "-"), order.astype(str)), "subtest + order", errors)
+        raise_if_invalid(errors)
+
+        options = np.where(no_options, "A,B,C,D,E,F", options)
+
+        # Kita asumsikan gambar sudah diupload manual ke folder static
+        # dengan nama: cfit_s{subtest}_{order}.jpg
+        count = bulk_insert(CfitQuestion, [
+            {
+                "subtest": s,
+                "subtest_name": f"Subtest {s}",
+                "instruction": "Pilihlah jawaban yang paling tepat.", # Default instruction
+                "image_url": f"/static/uploads/cfit/cfit_s{s}_{o}.jpg",
+                "options": opts,
+                "correct_answer": ans,
+                "order": o
+            }
+            for s, o, ans, opts in zip(subtest.tolist(), order.tolist(), answer.tolist(), options.tolist())
+        ])
             
         db.session.commit()
-        return jsonify({"message": f"Berhasil seed {len(data)} soal CFIT"}), 201
+        cfit_key.invalidate()
+        return jsonify({"message": f"Berhasil seed {count} soal CFIT"}), 201
     except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return seed_error_response(e)
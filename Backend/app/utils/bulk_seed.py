@@ -0,0 +1,161 @@
+import io
+import os
+import csv
+import json
+
+import numpy as np
+from flask import request
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+
+SEED_BATCH_SIZE = int(os.getenv("SEED_BATCH_SIZE", 1000))
+MAX_REPORTED_ERRORS = 20
+ASCII_DIGITS = "0123456789"
+
+CSV_TYPES = ("text/csv", "application/csv")
+JSONL_TYPES = ("application/x-ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+class SeedValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} kesalahan pada data seed")
+        self.errors = errors[:MAX_REPORTED_ERRORS]
+
+
+# ----------------------------------------------------------------------
+# Input: JSON list, CSV atau JSONL (body langsung / file multipart "file")
+# ----------------------------------------------------------------------
+def _input_format(filename, mimetype):
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".csv" or mimetype in CSV_TYPES:
+        return "csv"
+    if ext in (".jsonl", ".ndjson") or mimetype in JSONL_TYPES:
+        return "jsonl"
+    return "json"
+
+
+def read_seed_rows():
+    """
+    Iterator dict per baris seed: JSON list, CSV (header = nama field) atau JSONL.
+    Seluruh seed tetap dikumpulkan di memori (collect_columns) karena validasi
+    (mis. duplikat) dan penggantian data dilakukan untuk seluruh seed sekaligus.
+    """
+    upload = request.files.get("file")
+    if upload:
+        fmt, stream = _input_format(upload.filename, upload.mimetype), upload.stream
+    else:
+        fmt, stream = _input_format(None, request.mimetype), request.stream
+
+    if fmt == "json":
+        data = json.load(stream) if upload else request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise SeedValidationError(["body harus berupa list JSON, CSV atau JSONL"])
+        yield from data
+        return
+
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        yield from csv.DictReader(text)
+        return
+
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise SeedValidationError([f"baris {line_no}: JSON tidak valid ({e.msg})"])
+
+
+def collect_columns(rows, fields):
+    """Kumpulkan nilai per field dalam satu pass (validasi dilakukan per kolom)."""
+    columns = {field: [] for field in fields}
+    for row_no, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            raise SeedValidationError([f"baris {row_no}: harus berupa object"])
+        for field in fields:
+            columns[field].append(row.get(field))
+    return columns
+
+
+# ----------------------------------------------------------------------
+# Validasi vektor per kolom
+# ----------------------------------------------------------------------
+def _as_text(values):
+    return np.array(["" if v is None or isinstance(v, bool) else str(v).strip() for v in values], dtype=str)
+
+
+def _report(errors, mask, message):
+    errors.extend(f"baris {i + 1}: {message}" for i in np.flatnonzero(mask)[:MAX_REPORTED_ERRORS])
+
+
+def int_column(values, name, errors, min_value=None, max_value=None, required=True):
+    """Kolom bilangan bulat -> (array int64, mask nilai kosong)."""
+    text = _as_text(values)
+    missing = text == ""
+    body = np.char.lstrip(text, "-")
+    body_len = np.char.str_len(body)
+    # Hanya digit ASCII: isdigit() juga menerima "²" / "٣" yang gagal di astype("int64")
+    valid = (np.char.str_len(np.char.strip(body, ASCII_DIGITS)) == 0) & (body_len >= 1) \
+        & (np.char.str_len(text) - body_len <= 1) & (body_len <= 18)  # muat di int64
+
+    if required:
+        _report(errors, missing, f"'{name}' wajib diisi")
+    _report(errors, ~missing & ~valid, f"'{name}' harus bilangan bulat")
+
+    result = np.zeros(len(text), dtype="int64")
+    result[valid] = text[valid].astype("int64")
+    if min_value is not None:
+        _report(errors, valid & (result < min_value), f"'{name}' minimal {min_value}")
+    if max_value is not None:
+        _report(errors, valid & (result > max_value), f"'{name}' maksimal {max_value}")
+    return result, missing
+
+
+def str_column(values, name, errors, choices=None, max_length=None, required=True):
+    text = _as_text(values)
+    missing = text == ""
+    if required:
+        _report(errors, missing, f"'{name}' wajib diisi")
+    if choices is not None:
+        _report(errors, ~missing & ~np.isin(text, list(choices)), f"'{name}' harus salah satu dari {', '.join(choices)}")
+    if max_length is not None:
+        _report(errors, np.char.str_len(text) > max_length, f"'{name}' maksimal {max_length} karakter")
+    return text, missing
+
+
+def unique_column(values, name, errors):
+    """Nilai kunci yang muncul lebih dari sekali dalam satu seed."""
+    if not len(values):
+        return
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    _report(errors, counts[inverse] > 1, f"'{name}' duplikat")
+
+
+def raise_if_invalid(errors):
+    if errors:
+        raise SeedValidationError(errors)
+
+
+# ----------------------------------------------------------------------
+# Tulis: INSERT multi-row per batch
+# ----------------------------------------------------------------------
+def bulk_insert(model, records, conflict_columns=None, update_columns=None, batch_size=SEED_BATCH_SIZE):
+    """
+    INSERT banyak baris per batch (executemany / insertmanyvalues), tanpa object ORM.
+    conflict_columns -> ON CONFLICT DO NOTHING, atau DO UPDATE untuk update_columns.
+    Commit diserahkan ke pemanggil (satu transaksi untuk seluruh seed).
+    """
+    stmt = insert(model)
+    if conflict_columns and update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={name: stmt.excluded[name] for name in update_columns}
+        )
+    elif conflict_columns:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+    for start in range(0, len(records), batch_size):
+        db.session.execute(stmt, records[start:start + batch_size])
+    return len(records)
@@ -0,0 +1,262 @@
+import os
+import json
+import mmap
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl  # lock antar process (Linux / server)
+except ImportError:  # Windows (dev lokal): cukup lock antar thread
+    fcntl = None
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+CHUNKS_FOLDER = os.path.join(BASE, "chunks")
+
+CHUNK_STORE_PATH = os.path.join(CHUNKS_FOLDER, "chunks.bin")
+
+
+class ChunkStore:
+    """
+    Penyimpanan chunk seluruh resume dalam satu file append-only.
+
+    - chunks.bin  : blob UTF-8, satu record JSON per chunk, ditulis berurutan
+    - chunks.idx  : tabel offset int64 (n + 1 entry), chunk k = bin[idx[k]:idx[k + 1]]
+    - chunks_map.json : resume_id -> [chunk pertama, jumlah], juga jumlah chunk ter-commit
+
+    Blob & tabel offset hanya di-append; map ditulis atomik (tmp + os.replace) dan
+    menjadi titik commit, sehingga pembaca tidak pernah melihat tulisan setengah jadi.
+    Pembacaan memakai memory-map: akses chunk ke-i resume r = O(1), tanpa buka/parse file per resume.
+    """
+
+    def __init__(self, blob_path=CHUNK_STORE_PATH):
+        root, _ = os.path.splitext(blob_path)
+        self.blob_path = blob_path
+        self.idx_path = root + ".idx"
+        self.map_path = root + "_map.json"
+        self.lock_path = root + ".lock"
+
+        self._lock = threading.RLock()
+        self._ranges = {}  # resume_id -> [first, count]
+        self._count = 0    # jumlah chunk ter-commit
+        self._stamp = None   # (inode, mtime_ns, size) map saat terakhir dibaca
+        self._loaded = False
+        self._blob = None     # mmap blob
+        self._offsets = None  # np.memmap offset
+        self._mapped = (0, 0)  # (count, ukuran blob) saat mmap dibuat
+
+    # ------------------------------------------------------------------
+    # Load / persist
+    # ------------------------------------------------------------------
+    def _disk_stamp(self):
+        # os.replace selalu membuat inode baru; mtime saja bisa sama untuk dua commit berdekatan
+        try:
+            st = os.stat(self.map_path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _ensure_loaded(self):
+        """Baca map sekali, dan reload jika process lain sudah commit versi baru."""
+        stamp = self._disk_stamp()
+        if self._loaded and stamp == self._stamp:
+            return
+
+        if stamp is None:
+            self._ranges, self._count = {}, 0
+        else:
+            with open(self.map_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            self._ranges = meta["resumes"]
+            self._count = meta["count"]
+        self._stamp = stamp
+        self._loaded = True
+        self._close_views()  # file bisa sudah di-compact process lain
+
+    def _save_map(self):
+        os.makedirs(os.path.dirname(self.map_path), exist_ok=True)
+        tmp = self.map_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"count": self._count, "resumes": self._ranges}, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.map_path)
+        self._stamp = self._disk_stamp()
+
+    def _close_views(self):
+        if self._blob is not None:
+            self._blob.close()
+        self._blob, self._offsets, self._mapped = None, None, (0, 0)
+
+    def _views(self):
+        """mmap blob & tabel offset; dibuat ulang jika ada chunk ter-commit yang belum ter-map."""
+        if self._offsets is not None and self._mapped[0] >= self._count:
+            return self._blob, self._offsets
+
+        self._close_views()
+        self._offsets = np.memmap(self.idx_path, dtype="<i8", mode="r", shape=(self._count + 1,))
+        blob_size = int(self._offsets[-1])
+        if blob_size:
+            with open(self.blob_path, "rb") as fh:
+                self._blob = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = (self._count, blob_size)
+        return self._blob, self._offsets
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+            with open(self.lock_path, "a") as lock_fh:
+                if fcntl:
+                    fcntl.flock(lock_fh, fcntl.LOCK_EX)
+                try:
+                    self._ensure_loaded()
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+    def _committed_blob_size(self):
+        if not self._count:
+            return 0
+        with open(self.idx_path, "rb") as fh:
+            fh.seek(self._count * 8)
+            return int(np.frombuffer(fh.read(8), dtype="<i8")[0])
+
+    def add(self, resume_id, chunks):
+        """Tambah / ganti chunk satu resume."""
+        self.add_many([(resume_id, chunks)])
+
+    def add_many(self, items):
+        """Append chunk banyak resume, commit sekali di akhir. items = [(resume_id, chunks)]."""
+        with self._write_lock():
+            payloads, ranges = [], {}
+            first = self._count
+            for resume_id, chunks in items:
+                encoded = [json.dumps(c, ensure_ascii=False).encode("utf-8") for c in chunks]
+                ranges[resume_id] = [first + len(payloads), len(encoded)]
+                payloads.extend(encoded)
+
+            start = self._committed_blob_size()
+            ends = start + np.cumsum([len(p) for p in payloads], dtype="int64")
+
+            # Potong sisa tulisan yang tidak ter-commit (mis. process mati di tengah append)
+            with open(self.blob_path, "ab") as fh:
+                fh.truncate(start)
+                fh.write(b"".join(payloads))
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            with open(self.idx_path, "ab") as fh:
+                fh.truncate((self._count + 1) * 8 if self._count else 0)
+                if not self._count:
+                    fh.write(np.zeros(1, dtype="<i8").tobytes())
+                fh.write(ends.astype("<i8").tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            # Commit: chunk lama milik resume yang diganti menjadi sampah (lihat compact)
+            self._ranges.update(ranges)
+            self._count += len(payloads)
+            self._save_map()
+
+    def remove(self, resume_id):
+        with self._write_lock():
+            if self._ranges.pop(resume_id, None) is not None:
+                self._save_map()
+
+    def compact(self):
+        """
+        Tulis ulang hanya chunk yang masih dipakai (buang sisa resume yang diganti / dihapus).
+        Operasi maintenance: jalankan saat tidak ada upload / screening yang berjalan.
+        """
+        with self._write_lock():
+            live = {rid: self._read_range(rid) for rid in self._ranges}
+
+            tmp = ChunkStore(self.blob_path + ".compact")
+            for path in (tmp.blob_path, tmp.idx_path, tmp.map_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            tmp.add_many(live.items())
+            tmp._close_views()
+
+            self._close_views()
+            os.replace(tmp.blob_path, self.blob_path)
+            os.replace(tmp.idx_path, self.idx_path)
+            self._ranges, self._count = tmp._ranges, tmp._count
+            self._save_map()
+            if os.path.exists(tmp.map_path):
+                os.remove(tmp.map_path)
+            if os.path.exists(tmp.lock_path):
+                os.remove(tmp.lock_path)
+            return self._count
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+    def _read(self, k):
+        blob, offsets = self._views()
+        return json.loads(blob[int(offsets[k]):int(offsets[k + 1])].decode("utf-8"))
+
+    def _read_range(self, resume_id):
+        first, count = self._ranges[resume_id]
+        if not count:
+            return []
+        blob, offsets = self._views()
+        bounds = offsets[first:first + count + 1].tolist()
+        return [
+            json.loads(blob[bounds[i]:bounds[i + 1]].decode("utf-8"))
+            for i in range(count)
+        ]
+
+    def has(self, resume_id):
+        with self._lock:
+            self._ensure_loaded()
+            return resume_id in self._ranges
+
+    def count(self, resume_id):
+        with self._lock:
+            self._ensure_loaded()
+            return self._ranges[resume_id][1]
+
+    def get(self, resume_id, i):
+        """Chunk ke-i milik resume (urutan sama dengan posisi vektor di index)."""
+        with self._lock:
+            self._ensure_loaded()
+            first, count = self._ranges[resume_id]
+            if not 0 <= i < count:
+                raise IndexError(f"chunk {i} di luar range resume {resume_id} ({count} chunk)")
+            return self._read(first + i)
+
+    def get_chunks(self, resume_id):
+        with self._lock:
+            self._ensure_loaded()
+            return self._read_range(resume_id)
+
+    def stats(self):
+        with self._lock:
+            self._ensure_loaded()
+            live = sum(count for _, count in self._ranges.values())
+            return {
+                "resumes": len(self._ranges),
+                "chunks": live,
+                "garbage_chunks": self._count - live,
+                "blob_bytes": os.path.getsize(self.blob_path) if os.path.exists(self.blob_path) else 0
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_chunk_store():
+    """Singleton process-wide."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ChunkStore()
+        return _store
@@ -0,0 +1,162 @@
+import os
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl  # lock antar process (Linux / server)
+except ImportError:  # Windows (dev lokal): cukup lock antar thread
+    fcntl = None
+
+from app.utils.vector_store import INDEX_FOLDER
+
+JOB_CACHE_PATH = os.path.join(INDEX_FOLDER, "job_embeddings.npz")
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def job_stamp(updated_at):
+    return updated_at.isoformat() if updated_at else ""
+
+
+class JobEmbeddingCache:
+    """
+    Cache persisten untuk embedding job description.
+
+    Satu entry per JobPosition: (hash job_to_text, updated_at, vektor).
+    Entry otomatis dianggap basi jika teks job atau updated_at berubah.
+    File dipakai bersama semua worker: setiap tulis di-merge dengan isi disk
+    (di dalam lock file). Entry job yang diubah tertimpa saat di-embed ulang;
+    entry job yang dihapus dibuang lewat discard() (dipanggil route delete job).
+    """
+
+    def __init__(self, path=JOB_CACHE_PATH):
+        self.path = path
+        self.lock_path = os.path.splitext(path)[0] + ".lock"
+        self._lock = threading.Lock()
+        self._entries = None  # job_id -> (hash, stamp, vector)
+        self._mtime = None
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_disk(self):
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        try:
+            with np.load(self.path) as data:
+                for job_id, h, stamp, vec in zip(data["job_ids"], data["hashes"], data["stamps"], data["vectors"]):
+                    entries[str(job_id)] = (str(h), str(stamp), vec)
+        except Exception as e:
+            # File cache rusak tidak boleh menggagalkan screening, cukup mulai dari kosong
+            print(f"Job Embedding Cache Error: {e}")
+        return entries
+
+    def _load(self):
+        """Load sekali, dan reload jika process lain sudah menulis versi baru."""
+        mtime = self._disk_mtime()
+        if self._entries is not None and mtime == self._mtime:
+            return
+        self._entries = self._read_disk()
+        self._mtime = mtime
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        with open(self.lock_path, "a") as lock_fh:
+            if fcntl:
+                fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    def _save(self, updates=None, removed=()):
+        """Merge perubahan dengan isi disk terbaru (di dalam lock file), lalu tulis atomik."""
+        with self._file_lock():
+            entries = self._read_disk()
+            entries.update(updates or {})
+            for job_id in removed:
+                entries.pop(job_id, None)
+
+            job_ids = list(entries)
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as fh:
+                np.savez(
+                    fh,
+                    job_ids=np.array(job_ids, dtype=str),
+                    hashes=np.array([entries[j][0] for j in job_ids], dtype=str),
+                    stamps=np.array([entries[j][1] for j in job_ids], dtype=str),
+                    vectors=np.stack([entries[j][2] for j in job_ids]).astype("float32") if job_ids
+                    else np.zeros((0, 0), dtype="float32")
+                )
+            os.replace(tmp, self.path)
+
+            self._entries = entries
+            self._mtime = self._disk_mtime()
+
+    def discard(self, job_ids):
+        """Buang entry job yang sudah dihapus dari DB."""
+        job_ids = [str(job_id) for job_id in job_ids]
+        with self._lock:
+            self._load()
+            if not any(job_id in self._entries for job_id in job_ids):
+                return
+            self._save(removed=job_ids)
+
+    def get(self, job, job_text, embed_fn):
+        """Return embedding (1, dim) untuk job; panggil embed_fn hanya jika cache miss."""
+        h = text_hash(job_text)
+        stamp = job_stamp(job.updated_at)
+
+        with self._lock:
+            self._load()
+
+            entry = self._entries.get(job.id)
+            if entry and entry[0] == h and entry[1] == stamp:
+                self.hits += 1
+                return entry[2].reshape(1, -1)
+            self.misses += 1
+
+        vec = embed_fn(job_text)
+
+        with self._lock:
+            self._save({job.id: (h, stamp, np.asarray(vec, dtype="float32").reshape(-1))})
+        return vec
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries or {}),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+_cache = JobEmbeddingCache()
+
+
+def get_job_embedding(job, job_text):
+    """Embedding job description via cache (dipakai match_resume & rank_job)."""
+    from extractor import embed_query
+    return _cache.get(job, job_text, embed_query)
+
+
+def discard_job_embeddings(job_ids):
+    _cache.discard(job_ids)
+
+
+def job_cache_stats():
+    return _cache.stats()
@@ -0,0 +1,182 @@
+import os
+
+from sqlalchemy import func, case, cast, select, or_
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+from app import db
+from app.models import JobApplication, TestLink, TestSubmission, LeaderboardEntry
+
+# Bobot Final Score: CV + rata-rata psikotes (default 40/60).
+# Setelah bobot diubah jalankan `flask leaderboard rebuild` agar skor tersimpan ikut dihitung ulang.
+CV_WEIGHT = float(os.getenv("LEADERBOARD_CV_WEIGHT", 0.4))
+TEST_WEIGHT = float(os.getenv("LEADERBOARD_TEST_WEIGHT", 1 - CV_WEIGHT))
+
+# Mapping Nilai Kualitatif Kraepelin ke Angka (0-100)
+GRADE_MAP = {
+    "Baik Sekali": 100,
+    "Baik": 80,
+    "Sedang": 60,
+    "Kurang": 40,
+    "Kurang Sekali": 20
+}
+
+# Batas IQ -> poin leaderboard
+IQ_POINTS = ((130, 100), (120, 90), (110, 80), (100, 75), (90, 60))
+
+
+def calculate_kraepelin_score(scores):
+    """Menghitung rata-rata skor Kraepelin dari Speed, Accuracy, Stability"""
+    if not scores:
+        return 0
+
+    speed = GRADE_MAP.get(scores.get("gradeSpeed"), 0)
+    accuracy = GRADE_MAP.get(scores.get("gradeAccuracy"), 0)
+    stability = GRADE_MAP.get(scores.get("gradeStability"), 0)
+
+    return (speed + accuracy + stability) / 3
+
+
+def calculate_cfit_score(scores):
+    """Konversi IQ ke Skala 0-100 untuk Leaderboard"""
+    if not scores:
+        return 0
+
+    iq = scores.get("iq", 0)
+    for bound, points in IQ_POINTS:
+        if iq >= bound:
+            return points
+    return 40
+
+
+def empty_scores_sql(scores):
+    """`not scores` versi SQL: NULL, JSON null, atau object kosong."""
+    return or_(
+        func.coalesce(func.jsonb_typeof(scores), "null") != "object",
+        scores == cast({}, JSONB)
+    )
+
+
+def cfit_score_sql(scores):
+    """Versi SQL calculate_cfit_score (scores = kolom JSONB TestSubmission.scores)."""
+    iq = func.coalesce(scores["iq"].as_float(), 0)
+    return case(
+        (empty_scores_sql(scores), 0),
+        *[(iq >= bound, points) for bound, points in IQ_POINTS],
+        else_=40
+    )
+
+
+def kraepelin_score_sql(scores):
+    """Versi SQL calculate_kraepelin_score."""
+    def grade(key):
+        return case(
+            *[(scores[key].as_string() == label, value) for label, value in GRADE_MAP.items()],
+            else_=0
+        )
+    return case(
+        (empty_scores_sql(scores), 0),
+        else_=(grade("gradeSpeed") + grade("gradeAccuracy") + grade("gradeStability")) / 3.0
+    )
+
+
+def score_select(candidate_ids=None, cv_weight=None, test_weight=None):
+    """
+    SELECT skor leaderboard per JobApplication: skor psikotes per kandidat
+    (agregat TestLink -> TestSubmission) + Final Score berbobot, semuanya di SQL.
+    """
+    cv_weight = CV_WEIGHT if cv_weight is None else cv_weight
+    test_weight = TEST_WEIGHT if test_weight is None else test_weight
+
+    tests = select(
+        TestLink.candidate_id.label("candidate_id"),
+        func.max(case((TestSubmission.test_type == "cfit", cfit_score_sql(TestSubmission.scores)), else_=0)).label("cfit"),
+        func.max(case((TestSubmission.test_type == "kraepelin", kraepelin_score_sql(TestSubmission.scores)), else_=0)).label("kraepelin"),
+        func.bool_or(TestSubmission.test_type.in_(["cfit", "kraepelin"])).label("has_test")
+    ).join(TestSubmission, TestSubmission.link_id == TestLink.id).group_by(TestLink.candidate_id)
+    if candidate_ids is not None:
+        tests = tests.where(TestLink.candidate_id.in_(candidate_ids))
+    tests = tests.subquery()
+
+    cfit = func.coalesce(tests.c.cfit, 0)
+    kraepelin = func.coalesce(tests.c.kraepelin, 0)
+    has_test = func.coalesce(tests.c.has_test, False)
+    cv_score = func.coalesce(JobApplication.match_score, 0)
+
+    # Rata-rata psikotes dari tes yang sudah ada nilainya
+    test_score = case(
+        ((cfit > 0) & (kraepelin > 0), (cfit + kraepelin) / 2.0),
+        (cfit > 0, cfit),
+        (kraepelin > 0, kraepelin),
+        else_=0
+    )
+    # Belum tes -> ranking berdasarkan CV saja
+    final_score = case(
+        (has_test, cv_score * cv_weight + test_score * test_weight),
+        else_=cv_score
+    )
+
+    query = select(
+        JobApplication.id.label("application_id"),
+        JobApplication.candidate_id,
+        JobApplication.job_id,
+        cv_score.label("cv_score"),
+        cfit.label("cfit_score"),
+        kraepelin.label("kraepelin_score"),
+        test_score.label("test_score"),
+        has_test.label("has_test"),
+        final_score.label("final_score"),
+        func.now().label("updated_at")
+    ).outerjoin(tests, tests.c.candidate_id == JobApplication.candidate_id)
+
+    if candidate_ids is not None:
+        query = query.where(JobApplication.candidate_id.in_(candidate_ids))
+    return query
+
+
+def refresh_leaderboard(candidate_ids=None, commit=True):
+    """
+    Upsert skor leaderboard (INSERT ... SELECT ... ON CONFLICT DO UPDATE).
+    candidate_ids: hanya kandidat tersebut (refresh inkremental); None = seluruh tabel.
+    Baris milik aplikasi yang dihapus ikut terhapus lewat FK ON DELETE CASCADE.
+    """
+    if candidate_ids is not None:
+        candidate_ids = list({c for c in candidate_ids if c})
+        if not candidate_ids:
+            return 0
+
+    query = score_select(candidate_ids)
+    columns = [c.name for c in query.selected_columns]
+    stmt = insert(LeaderboardEntry).from_select(columns, query)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LeaderboardEntry.application_id],
+        set_={name: stmt.excluded[name] for name in columns if name != "application_id"}
+    )
+
+    result = db.session.execute(stmt)
+    if commit:
+        db.session.commit()
+    return result.rowcount
+
+
+def refresh_leaderboard_safe(candidate_ids):
+    """Dipanggil setelah skor tersimpan: gagal refresh tidak boleh menggagalkan request."""
+    try:
+        refresh_leaderboard(candidate_ids)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Leaderboard Refresh Error: {e}")
+
+
+def ensure_leaderboard():
+    """
+    Isi entry leaderboard yang belum ada (tabel baru setelah migration, atau
+    refresh_leaderboard_safe yang gagal): anti-join JobApplication tanpa entry,
+    lalu refresh kandidat pemiliknya saja.
+    """
+    has_entry = select(LeaderboardEntry.application_id)\
+        .where(LeaderboardEntry.application_id == JobApplication.id).exists()
+    candidate_ids = db.session.scalars(
+        select(JobApplication.candidate_id).where(~has_entry).distinct()
+    ).all()
+    if candidate_ids:
+        refresh_leaderboard(candidate_ids)
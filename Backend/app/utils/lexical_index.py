@@ -0,0 +1,281 @@
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+# Token: huruf/angka, boleh diikuti + # atau .xx (c++, c#, node.js, asp.net)
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+SHORT_TOKENS = {"c", "r"}  # bahasa pemrograman 1 huruf
+
+BM25_K1 = float(os.getenv("SEARCH_BM25_K1", 1.2))
+BM25_B = float(os.getenv("SEARCH_BM25_B", 0.75))
+SKILL_BOOST = int(os.getenv("SEARCH_SKILL_BOOST", 3))  # bobot token skills vs teks CV
+# Jeda minimum antar cek versi data ke DB (detik); edit dari worker lain terlihat paling lambat selama ini
+SYNC_INTERVAL = float(os.getenv("SEARCH_INDEX_SYNC_SECONDS", 5))
+
+INDEX_NAME = "lexical"
+
+RRF_K = 60
+
+
+def tokenize(text):
+    tokens = TOKEN_RE.findall((text or "").lower())
+    return [t for t in tokens if len(t) > 1 or t in SHORT_TOKENS]
+
+
+def skill_names(skills):
+    """Candidate.skills (JSONB) bisa berisi string atau dict {"name": ...}."""
+    names = []
+    for skill in skills or []:
+        if isinstance(skill, dict):
+            skill = skill.get("name") or skill.get("skill")
+        if skill:
+            names.append(str(skill))
+    return names
+
+
+def term_counts(text, skills=None):
+    """Frekuensi term satu dokumen: teks CV + skills (diberi bobot SKILL_BOOST)."""
+    counts = Counter(tokenize(text))
+    for token in tokenize(" ".join(skill_names(skills))):
+        counts[token] += SKILL_BOOST
+    return counts
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Gabungkan beberapa ranking (list id terurut) dengan Reciprocal Rank Fusion:
+    skor(id) = sum 1 / (k + rank). Return list (id, skor) terurut menurun.
+    """
+    fused = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class LexicalIndex:
+    """
+    Inverted index BM25 atas Resume.raw_text + Candidate.skills, di memori per process.
+
+    Postings disimpan sebagai CSR per term (indptr, doc, tf) dalam array NumPy,
+    sehingga skor satu query = beberapa slice + operasi vektor, tanpa scan tabel.
+    Term count per dokumen di-cache per (text_hash, skills); rebuild setelah data
+    berubah hanya membaca & men-tokenize dokumen yang benar-benar berubah.
+    Perubahan data dideteksi lewat satu baris SearchIndexVersion (lihat bump_version_on_commit).
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B, sync_interval=SYNC_INTERVAL):
+        self.k1 = k1
+        self.b = b
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._docs = {}       # doc_id -> (key, Counter)
+        self._version = None
+        self._checked_at = 0.0
+        self._clear_postings()
+
+    def _clear_postings(self):
+        self._doc_ids = []
+        self._vocab = {}
+        self._indptr = np.zeros(1, dtype="int64")
+        self._post_docs = np.zeros(0, dtype="int32")
+        self._post_tfs = np.zeros(0, dtype="float32")
+        self._doc_len = np.zeros(0, dtype="float32")
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+    def build(self, docs, load_texts):
+        """
+        docs = iterable (doc_id, key, skills); key berubah = dokumen berubah.
+        load_texts(doc_ids) -> {doc_id: text}, dipanggil sekali untuk dokumen yang berubah saja.
+        """
+        with self._lock:
+            docs = list(docs)
+            stale = [doc_id for doc_id, key, _ in docs
+                     if doc_id not in self._docs or self._docs[doc_id][0] != key]
+            texts = load_texts(stale) if stale else {}
+            stale = set(stale)
+
+            fresh = {}
+            for doc_id, key, skills in docs:
+                if doc_id in stale:
+                    fresh[doc_id] = (key, term_counts(texts.get(doc_id), skills))
+                else:
+                    fresh[doc_id] = self._docs[doc_id]
+            self._docs = fresh
+            self._build_postings()
+
+    def _build_postings(self):
+        self._clear_postings()
+        if not self._docs:
+            return
+
+        vocab, term_ids, tfs, owners, lengths = {}, [], [], [], []
+        for pos, (doc_id, (_, counts)) in enumerate(self._docs.items()):
+            self._doc_ids.append(doc_id)
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                tfs.append(tf)
+                owners.append(pos)
+
+        term_ids = np.asarray(term_ids, dtype="int64")
+        order = np.argsort(term_ids, kind="stable")
+        self._vocab = vocab
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(vocab)))])
+        self._post_docs = np.asarray(owners, dtype="int32")[order]
+        self._post_tfs = np.asarray(tfs, dtype="float32")[order]
+        self._doc_len = np.asarray(lengths, dtype="float32")
+
+    def sync(self):
+        """
+        Samakan index dengan DB jika ada perubahan (resume baru/dihapus, profil kandidat baru / diedit).
+        Cek perubahan = lookup satu baris versi, paling sering sekali per sync_interval detik;
+        data hanya dibaca ulang saat versi berubah.
+        """
+        from app import db
+        from app.models import Resume, Candidate, SearchIndexVersion
+
+        with self._lock:
+            now = time.monotonic()
+            if self._version is not None and now - self._checked_at < self.sync_interval:
+                return False
+            self._checked_at = now
+
+        version = db.session.query(SearchIndexVersion.version).filter_by(name=INDEX_NAME).scalar() or 0
+
+        with self._lock:
+            if version == self._version:
+                return False
+
+            rows = db.session.query(Resume.id, Resume.text_hash, Candidate.skills) \
+                .outerjoin(Candidate, Candidate.resume_id == Resume.id) \
+                .filter(Resume.status == "done").all()
+
+            def load_texts(resume_ids):
+                texts = {}
+                for i in range(0, len(resume_ids), 500):
+                    texts.update(db.session.query(Resume.id, Resume.raw_text)
+                                 .filter(Resume.id.in_(resume_ids[i:i + 500])).all())
+                return texts
+
+            self.build(
+                ((resume_id, (text_hash, repr(skills)), skills) for resume_id, text_hash, skills in rows),
+                load_texts
+            )
+            self._version = version
+            return True
+
+    def invalidate(self):
+        """
+        Paksa sync berikutnya membaca ulang DB di process ini (panggil setelah commit);
+        worker lain melihat perubahan lewat SearchIndexVersion dalam sync_interval.
+        """
+        with self._lock:
+            self._version = None
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    def search(self, query, top_k=50):
+        """Top-k dokumen BM25. Return list (doc_id, skor, matched_terms) terurut menurun."""
+        with self._lock:
+            n_docs = len(self._doc_ids)
+            terms = [t for t in dict.fromkeys(tokenize(query)) if t in self._vocab]
+            if not n_docs or not terms:
+                return []
+
+            scores = np.zeros(n_docs, dtype="float32")
+            postings = []
+            norm = self.k1 * (1 - self.b + self.b * self._doc_len / max(self._doc_len.mean(), 1.0))
+
+            for term in terms:
+                t = self._vocab[term]
+                lo, hi = self._indptr[t], self._indptr[t + 1]
+                docs, tfs = self._post_docs[lo:hi], self._post_tfs[lo:hi]
+                idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+                postings.append((term, docs))
+
+            hits = np.flatnonzero(scores)
+            top_k = min(top_k, len(hits))
+            if not top_k:
+                return []
+            top = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            # Term yang cocok hanya dicari untuk dokumen top-k (postings per term terurut by doc)
+            matched = [[] for _ in top]
+            for term, docs in postings:
+                pos = np.minimum(np.searchsorted(docs, top), len(docs) - 1)
+                for j in np.flatnonzero(docs[pos] == top):
+                    matched[j].append(term)
+
+            return [
+                (self._doc_ids[d], float(scores[d]), terms_)
+                for d, terms_ in zip(top, matched)
+            ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._doc_ids),
+                "terms": len(self._vocab),
+                "postings": int(len(self._post_docs))
+            }
+
+
+_TRACKED = "lexical_index_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _track_index_changes(session, flush_context):
+    from app.models import Resume, Candidate
+
+    if any(isinstance(obj, (Resume, Candidate))
+           for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_TRACKED] = True
+
+
+@event.listens_for(Session, "before_commit")
+def bump_version_on_commit(session):
+    """
+    Naikkan SearchIndexVersion di transaksi yang sama dengan perubahan Resume/Candidate,
+    sehingga sync() di worker mana pun cukup membandingkan satu angka.
+    """
+    from app.models import SearchIndexVersion
+
+    session.flush()
+    if not session.info.pop(_TRACKED, False):
+        return
+    stmt = insert(SearchIndexVersion).values(name=INDEX_NAME, version=1)
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=[SearchIndexVersion.name],
+        set_={"version": SearchIndexVersion.version + 1}
+    ))
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_index_changes(session):
+    session.info.pop(_TRACKED, None)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_lexical_index():
+    """Singleton process-wide."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LexicalIndex()
+        return _index
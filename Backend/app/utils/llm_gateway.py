@@ -0,0 +1,275 @@
+import os
+import time
+import random
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+from openai import OpenAI
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Error upstream yang layak dicoba ulang (429, timeout, koneksi putus, 5xx)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class TokenBucket:
+    """
+    Rate limiter token bucket (thread-safe).
+    `rate` token per detik, maksimal `capacity` token tersimpan (burst).
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Tunggu sampai 1 token tersedia. Return False jika timeout habis."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class LatencyHistogram:
+    """Histogram latency (detik) dengan bucket tetap, ala Prometheus."""
+
+    BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60)
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # bucket terakhir = +Inf
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q):
+        """Perkiraan kuantil = batas atas bucket tempat kuantil jatuh."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = q * self.count
+            seen = 0
+            for bound, n in zip(self.buckets + (float("inf"),), self._counts):
+                seen += n
+                if seen >= target:
+                    return bound
+        return None
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {str(b): n for b, n in zip(self.buckets + ("+Inf",), self._counts)}
+            count, total = self.count, self.total
+        return {
+            "count": count,
+            "avg_seconds": round(total / count, 3) if count else 0.0,
+            "p50_le": self.quantile(0.5),
+            "p95_le": self.quantile(0.95),
+            "buckets": buckets
+        }
+
+
+class LLMGateway:
+    """
+    Satu pintu untuk semua panggilan chat completion:
+
+    - koneksi HTTP di-pool (keep-alive) dan dipakai ulang oleh semua thread,
+    - jumlah request bersamaan dibatasi (semaphore + thread pool),
+    - token bucket untuk batas request/detik dari provider,
+    - retry dengan exponential backoff + jitter (menghormati Retry-After),
+    - timeout per panggilan dan histogram latency.
+
+    `base_url` bisa diarahkan ke stub server lokal untuk testing.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, max_concurrency=4,
+                 rate_per_sec=2.0, burst=4, timeout=60.0, max_retries=3,
+                 backoff_base=1.0, backoff_max=30.0):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.limiter = TokenBucket(rate_per_sec, burst)
+        self.latency = LatencyHistogram()
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._executor = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "rate_limited": 0, "timeouts": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Client & pool
+    # ------------------------------------------------------------------
+    @property
+    def client(self):
+        """OpenAI client dengan connection pool httpx, dibuat saat pertama dipakai."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+                    http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=self.max_concurrency,
+                            max_keepalive_connections=self.max_concurrency
+                        ),
+                        timeout=self.timeout
+                    )
+                    self._client = OpenAI(
+                        base_url=self.base_url,
+                        api_key=self.api_key or "missing",
+                        http_client=http_client,
+                        max_retries=0,  # retry diatur gateway
+                        timeout=self.timeout
+                    )
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._client_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency, thread_name_prefix="llm"
+                    )
+        return self._executor
+
+    # ------------------------------------------------------------------
+    # Panggilan
+    # ------------------------------------------------------------------
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _backoff(self, attempt, error):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = delay * (0.5 + random.random() / 2)
+
+        # 429 dari provider biasanya menyertakan Retry-After (detik)
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            delay = max(delay, min(self.backoff_max, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        return delay
+
+    def chat(self, messages, model, timeout=None, **params):
+        """
+        Chat completion sinkron; return isi teks jawaban.
+        Melempar exception terakhir jika semua retry gagal.
+        """
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            with self._slots:
+                self._count("requests")
+                started = time.monotonic()
+                try:
+                    res = self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        timeout=timeout or self.timeout,
+                        **params
+                    )
+                    self.latency.observe(time.monotonic() - started)
+                    return res.choices[0].message.content
+
+                except RETRYABLE_ERRORS as e:
+                    self.latency.observe(time.monotonic() - started)
+                    if isinstance(e, openai.RateLimitError):
+                        self._count("rate_limited")
+                    elif isinstance(e, openai.APITimeoutError):
+                        self._count("timeouts")
+                    error = e
+
+                except Exception:
+                    self._count("errors")
+                    raise
+
+            if attempt >= self.max_retries:
+                self._count("errors")
+                raise error
+
+            time.sleep(self._backoff(attempt, error))
+            attempt += 1
+            self._count("retries")
+
+    def submit(self, fn, *args, **kwargs):
+        """Jalankan fn di thread pool gateway (fn biasanya memanggil chat())."""
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def map(self, fn, items):
+        """Jalankan fn(item) secara paralel (dibatasi max_concurrency), urutan hasil dipertahankan."""
+        return list(self.executor.map(fn, items))
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            "base_url": self.base_url,
+            "max_concurrency": self.max_concurrency,
+            "latency": self.latency.snapshot()
+        })
+        return stats
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway():
+    """Singleton process-wide, dikonfigurasi lewat environment variable."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(
+                base_url=os.getenv("LLM_BASE_URL", DEFAULT_BASE_URL),
+                api_key=os.getenv("OPENAI_API_KEY"),
+                max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 4)),
+                rate_per_sec=float(os.getenv("LLM_RATE_PER_SEC", 2)),
+                burst=int(os.getenv("LLM_RATE_BURST", 4)),
+                timeout=float(os.getenv("LLM_TIMEOUT", 60)),
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", 3))
+            )
+        return _gateway
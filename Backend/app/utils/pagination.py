@@ -0,0 +1,124 @@
+import os
+import json
+import base64
+import binascii
+from datetime import datetime
+
+from flask import request, jsonify
+from sqlalchemy import tuple_, DateTime
+
+from app.utils.serialization import with_load_options
+
+MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 500))
+DEFAULT_LIMIT = min(int(os.getenv("PAGINATION_DEFAULT_LIMIT", 100)), MAX_LIMIT)
+
+# ?limit=all -> tanpa limit, harus diminta eksplisit (frontend lama yang mengambil semua data)
+UNBOUNDED_LIMIT = "all"
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, keys):
+    """Cursor -> nilai key (datetime dikembalikan dari ISO string sesuai tipe kolom)."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor(cursor)
+
+    try:
+        return [
+            datetime.fromisoformat(v) if isinstance(key.type, DateTime) and isinstance(v, str) else v
+            for key, v in zip(keys, values)
+        ]
+    except ValueError:
+        raise InvalidCursor(cursor)
+
+
+def parse_fields():
+    """?fields=id,name,match_score -> set nama field (None = semua field)."""
+    fields = request.args.get("fields")
+    if not fields:
+        return None
+    return {f.strip() for f in fields.split(",") if f.strip()}
+
+
+def select_fields(item, fields):
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {k: v for k, v in item.items() if k in fields}
+
+
+def parse_limit():
+    """?limit -> jumlah baris (0 = semua, hanya untuk ?limit=all); nilai tidak valid pakai default."""
+    raw = request.args.get("limit", "").strip().lower()
+    if raw == UNBOUNDED_LIMIT:
+        return 0
+    limit = int(raw) if raw.isdigit() else 0
+    return min(limit, MAX_LIMIT) if limit > 0 else DEFAULT_LIMIT
+
+
+def paginate(query, keys, serialize, desc=True):
+    """
+    Keyset pagination + count on demand + sparse fieldset untuk endpoint list.
+
+    keys      : ekspresi urutan, key terakhir harus unik (mis. [Model.created_at, Model.id]);
+                nilai key tidak boleh NULL (pakai func.coalesce jika kolomnya nullable)
+    serialize : fungsi row -> dict (row = hasil query asli, sebelum kolom key ditambahkan);
+                loader option dari @eager_load di serializer ikut dipasang ke query
+
+    Query params:
+      limit  : jumlah baris (maks MAX_LIMIT), default DEFAULT_LIMIT; "all" = semua baris
+      after  : cursor dari header X-Next-Cursor halaman sebelumnya
+      count  : true -> total baris (tanpa cursor) di header X-Total-Count
+      fields : daftar field yang dikirim, dipisah koma
+
+    Body tetap list JSON seperti sebelumnya; metadata halaman ada di header.
+    """
+    limit = parse_limit()
+    after = request.args.get("after")
+    with_count = request.args.get("count", "").lower() in TRUE_VALUES
+    fields = parse_fields()
+
+    n_entities = len(query.column_descriptions)
+    total = query.order_by(None).count() if with_count else None
+
+    if after:
+        try:
+            values = decode_cursor(after, keys)
+        except InvalidCursor:
+            return jsonify({"error": "Invalid cursor"}), 400
+        key_tuple = tuple_(*keys)
+        query = query.filter(key_tuple < tuple_(*values) if desc else key_tuple > tuple_(*values))
+
+    query = with_load_options(query, serialize)
+    query = query.add_columns(*[key.label(f"_page_key_{i}") for i, key in enumerate(keys)])
+    query = query.order_by(*[key.desc() if desc else key.asc() for key in keys])
+    if limit:
+        query = query.limit(limit + 1)  # +1 untuk tahu ada halaman berikutnya
+
+    rows = query.all()
+    has_more = bool(limit) and len(rows) > limit
+    rows = rows[:limit] if limit else rows
+
+    items = [
+        select_fields(serialize(row[0] if n_entities == 1 else row[:n_entities]), fields)
+        for row in rows
+    ]
+
+    response = jsonify(items)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(list(rows[-1][n_entities:]))
+    return response
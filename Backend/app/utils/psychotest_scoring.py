@@ -0,0 +1,293 @@
+import os
+import time
+import threading
+
+import numpy as np
+
+from app import db
+from app.models import PapiScoringMap, CfitQuestion, CfitNorma
+
+# Kunci scoring di-cache per process. Endpoint management memanggil invalidate()
+# setelah kunci diubah; TTL memastikan worker lain ikut membaca ulang.
+SCORING_KEY_TTL = float(os.getenv("SCORING_KEY_TTL", 60))
+
+PAPI_ASPECTS = ['G', 'L', 'I', 'T', 'V', 'S', 'R', 'D', 'C', 'E', 'N', 'A', 'P', 'X', 'B', 'O', 'Z', 'K', 'F', 'W']
+PAPI_CHOICES = ('A', 'B')
+
+
+class CachedKey:
+    """
+    Kunci jawaban yang di-compile sekali dari DB lalu dipakai ulang oleh semua request.
+    version bertambah setiap kali kunci dibaca ulang.
+    """
+
+    def __init__(self, loader, ttl=SCORING_KEY_TTL):
+        self._loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value = None
+        self._expires = 0.0
+        self.version = 0
+
+    def get(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._value is None or now >= self._expires:
+                self._value = self._loader()
+                self._expires = now + self.ttl
+                self.version += 1
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+
+
+# ----------------------------------------------------------------------
+# PAPI Kostick
+# ----------------------------------------------------------------------
+class PapiKey:
+    """
+    Tabel (nomor soal, pilihan) -> index aspek dalam array NumPy; -1 = tidak ada mapping.
+    Skor satu submission = lookup seluruh jawaban + bincount per aspek.
+    """
+
+    def __init__(self, rows):
+        """rows = iterable (question_id, choice, aspect), urut id (mapping pertama yang dipakai)."""
+        rows = [(q, c, a) for q, c, a in rows if q is not None and q >= 1 and c in PAPI_CHOICES and a in PAPI_ASPECTS]
+        n_questions = max((q for q, _, _ in rows), default=0)
+        self.table = np.full((n_questions + 1, len(PAPI_CHOICES)), -1, dtype="int16")
+        for question_id, choice, aspect in rows:
+            col = PAPI_CHOICES.index(choice)
+            if self.table[question_id, col] < 0:
+                self.table[question_id, col] = PAPI_ASPECTS.index(aspect)
+
+    def score(self, answers):
+        """answers[i] = index pilihan soal i + 1 (0 = A, selain itu B, None = tidak dijawab)."""
+        answers = list(answers or [])
+        question = np.arange(1, len(answers) + 1)
+        answered = np.array([a is not None for a in answers], dtype=bool)
+        choice = np.array([0 if a == 0 else 1 for a in answers], dtype="int64")
+
+        valid = answered & (question < len(self.table))
+        aspects = self.table[question[valid], choice[valid]]
+        counts = np.bincount(aspects[aspects >= 0], minlength=len(PAPI_ASPECTS))
+        return dict(zip(PAPI_ASPECTS, counts.tolist()))
+
+
+def _load_papi_key():
+    rows = db.session.query(PapiScoringMap.question_id, PapiScoringMap.choice, PapiScoringMap.aspect) \
+        .order_by(PapiScoringMap.id).all()
+    return PapiKey(rows)
+
+
+papi_key = CachedKey(_load_papi_key)
+
+
+def score_papi(answers):
+    return papi_key.get().score(answers)
+
+
+# ----------------------------------------------------------------------
+# CFIT
+# ----------------------------------------------------------------------
+NO_ANSWER = -1    # jawaban kosong / bukan angka
+NO_KEY = -2       # soal tanpa kunci jawaban (tidak pernah benar)
+
+
+def _as_choice(value, missing):
+    """Jawaban / kunci -> int untuk dibandingkan dalam array (True == 1 dan 2.0 == 2 seperti di Python)."""
+    try:
+        if isinstance(value, (int, float)) and value == int(value):
+            return int(value)
+    except (OverflowError, ValueError):  # inf / nan
+        pass
+    return missing
+
+
+class CfitKey:
+    """
+    Kunci jawaban CFIT (urut id soal) + tabel norma raw score -> IQ dalam array NumPy.
+    Skor satu submission = satu perbandingan array; skor per subtest lewat bincount.
+    """
+
+    def __init__(self, questions, norma):
+        """questions = [(id, subtest, correct_answer)] urut id; norma = [(raw_score, iq, classification)]."""
+        self.question_ids = np.array([q_id for q_id, _, _ in questions], dtype="int64")
+        self.correct = np.array([_as_choice(ans, NO_KEY) for _, _, ans in questions], dtype="int64")
+        self.subtests = sorted({subtest for _, subtest, _ in questions if subtest is not None})
+        self.subtest_idx = np.array(
+            [self.subtests.index(subtest) if subtest is not None else len(self.subtests) for _, subtest, _ in questions],
+            dtype="int64"
+        )
+
+        norma = [row for row in norma if row[0] is not None and row[0] >= 0]
+        size = max((rs for rs, _, _ in norma), default=-1) + 1
+        self.norma_iq = np.zeros(size, dtype="int64")
+        self.norma_class = ["Unclassified"] * size
+        self.has_norma = np.zeros(size, dtype=bool)
+        for raw_score, iq, classification in norma:
+            self.norma_iq[raw_score] = iq or 0
+            self.norma_class[raw_score] = classification
+            self.has_norma[raw_score] = True
+
+    def score(self, answers):
+        answers = list(answers or [])
+        n = len(self.correct)
+        user_ans = (answers + [None] * n)[:n]  # jawaban melebihi jumlah soal diabaikan
+        given = np.array([_as_choice(a, NO_ANSWER) for a in user_ans], dtype="int64")
+
+        correct = given == self.correct
+        raw_score = int(correct.sum())
+        per_subtest = np.bincount(self.subtest_idx[correct], minlength=len(self.subtests) + 1)
+
+        if raw_score < len(self.has_norma) and self.has_norma[raw_score]:
+            iq_score, classification = int(self.norma_iq[raw_score]), self.norma_class[raw_score]
+        else:
+            iq_score, classification = 0, "Unclassified"
+
+        return {
+            "raw_score": raw_score,
+            "iq": iq_score,
+            "classification": classification,
+            "subtest_scores": {str(s): int(per_subtest[i]) for i, s in enumerate(self.subtests)},
+            "detail_breakdown": [
+                {"q_id": q_id, "user_ans": ans, "correct": ok}
+                for q_id, ans, ok in zip(self.question_ids.tolist(), user_ans, correct.tolist())
+            ]
+        }
+
+
+def _load_cfit_key():
+    questions = db.session.query(CfitQuestion.id, CfitQuestion.subtest, CfitQuestion.correct_answer) \
+        .order_by(CfitQuestion.id).all()
+    norma = db.session.query(CfitNorma.raw_score, CfitNorma.iq_score, CfitNorma.classification).all()
+    return CfitKey(questions, norma)
+
+
+cfit_key = CachedKey(_load_cfit_key)
+
+
+def score_cfit(answers):
+    return cfit_key.get().score(answers)
+
+
+# ----------------------------------------------------------------------
+# KRAEPELIN
+# ----------------------------------------------------------------------
+# Norma Sarjana (sama dengan hr-next/src/utils/kraepelinScoring.ts).
+# Urutan dicek dari atas; yang tidak memenuhi satu pun -> "Kurang Sekali".
+KRAEPELIN_GRADES = ["Baik Sekali", "Baik", "Sedang", "Kurang"]
+SPEED_NORMS = (np.greater, 17.21), (np.greater_equal, 14.973), (np.greater_equal, 12.736), (np.greater_equal, 10.5)
+STABILITY_NORMS = (np.less, 0.696), (np.less_equal, 0.908), (np.less_equal, 1.056), (np.less_equal, 1.779)
+ACCURACY_NORMS = (np.equal, 0), (np.less_equal, 1), (np.less_equal, 3), (np.less_equal, 14)
+
+
+def _grade(values, norms):
+    return np.select([op(values, bound) for op, bound in norms], KRAEPELIN_GRADES, default="Kurang Sekali")
+
+
+def kraepelin_grid(seed, shape):
+    """Lembar soal Kraepelin (kolom x baris, angka 1-9) yang selalu sama untuk seed & ukuran yang sama."""
+    return np.random.default_rng(seed).integers(1, 10, size=tuple(shape), dtype="int64")
+
+
+def kraepelin_key(grids):
+    """Kunci jawaban: digit terakhir penjumlahan dua angka berurutan dalam kolom."""
+    return (grids[..., :-1] + grids[..., 1:]) % 10
+
+
+def score_kraepelin_batch(grids, answers):
+    """
+    Skor banyak lembar Kraepelin sekaligus.
+    grids   : int array (n, kolom, baris)
+    answers : int array (n, kolom, baris - 1), -1 = tidak diisi
+
+    panker = rata-rata jawaban benar per kolom (kecepatan)
+    janker = simpangan rata-rata skor kolom terhadap panker (keajegan)
+    tianker = jawaban salah + slot yang dilompati (ketelitian)
+    hanker = kemiringan garis regresi skor kolom (ketahanan; negatif = menurun)
+    """
+    answered = answers >= 0
+    correct = answered & (answers == kraepelin_key(grids))
+    col_scores = correct.sum(axis=2)
+    n_cols = col_scores.shape[1]
+
+    errors = (answered & ~correct).sum(axis=(1, 2))
+    # Jawaban diisi dari bawah ke atas: slot kosong di bawah jawaban teratas = dilompati
+    reached = np.logical_or.accumulate(answered, axis=2)
+    skipped = (reached & ~answered).sum(axis=(1, 2))
+
+    panker = col_scores.mean(axis=1) if n_cols else np.zeros(len(col_scores))
+    janker = np.abs(col_scores - panker[:, None]).mean(axis=1) if n_cols else np.zeros(len(col_scores))
+    x = np.arange(n_cols) - (n_cols - 1) / 2
+    hanker = (col_scores * x).sum(axis=1) / (x ** 2).sum() if n_cols > 1 else np.zeros(len(col_scores))
+
+    speed, stability, accuracy = _grade(panker, SPEED_NORMS), _grade(janker, STABILITY_NORMS), _grade(errors, ACCURACY_NORMS)
+    return [
+        {
+            "panker": round(float(panker[i]), 2),
+            "janker": round(float(janker[i]), 2),
+            "tianker": int(errors[i] + skipped[i]),
+            "hanker": round(float(hanker[i]), 3),
+            "totalErrors": int(errors[i]),
+            "gradeSpeed": str(speed[i]),
+            "gradeStability": str(stability[i]),
+            "gradeAccuracy": str(accuracy[i]),
+            "interpretation": f"Kecepatan: {speed[i]}, Stabilitas: {stability[i]}, Ketelitian: {accuracy[i]}"
+        }
+        for i in range(len(col_scores))
+    ]
+
+
+def parse_kraepelin_sheet(grid, answers, shape=None):
+    """
+    grid (kolom x baris, angka 1-9, lihat kraepelin_grid) + answers (kolom x baris-1, digit atau null)
+    -> array NumPy. ValueError jika bentuk / isinya tidak valid.
+    shape : (columns, rows) dari KraepelinConfig; jika diberikan, ukuran grid harus sama persis.
+    """
+    try:
+        grid = np.array(grid, dtype="int64")
+        answers = np.array([[-1 if a is None else a for a in col] for col in answers], dtype="int64")
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("grid / answers harus berupa matriks angka")
+
+    if grid.ndim != 2 or grid.shape[1] < 2:
+        raise ValueError("grid harus berupa matriks kolom x baris")
+    if shape is not None and grid.shape != tuple(shape):
+        raise ValueError(f"grid harus berukuran {shape[0]} kolom x {shape[1]} baris")
+    if answers.shape != (grid.shape[0], grid.shape[1] - 1):
+        raise ValueError(f"answers harus berukuran {grid.shape[0]} x {grid.shape[1] - 1}")
+    if grid.min() < 1 or grid.max() > 9:
+        raise ValueError("grid harus berisi angka 1-9")
+    if answers.max(initial=-1) > 9 or answers.min(initial=-1) < -1:
+        raise ValueError("answers harus berisi digit 0-9 atau null")
+    return grid, answers
+
+
+def score_kraepelin(grid, answers, shape=None):
+    return score_kraepelin_batch(*(a[None] for a in parse_kraepelin_sheet(grid, answers, shape)))[0]
+
+
+def score_kraepelin_many(raw_answers_list):
+    """
+    Rescore banyak TestSubmission.raw_answers ({"grid": ..., "answers": ...}) sekaligus.
+    Lembar dikelompokkan per ukuran grid lalu di-skor dalam satu batch per kelompok.
+    Return list hasil sejajar input; None untuk data lama tanpa grid / tidak valid.
+    """
+    results = [None] * len(raw_answers_list)
+    groups = {}
+    for pos, raw in enumerate(raw_answers_list):
+        if not isinstance(raw, dict) or raw.get("grid") is None:
+            continue
+        try:
+            grid, answers = parse_kraepelin_sheet(raw["grid"], raw.get("answers") or [])
+        except ValueError:
+            continue
+        groups.setdefault(grid.shape, []).append((pos, grid, answers))
+
+    for sheets in groups.values():
+        scores = score_kraepelin_batch(np.stack([g for _, g, _ in sheets]), np.stack([a for _, _, a in sheets]))
+        for (pos, _, _), result in zip(sheets, scores):
+            results[pos] = result
+    return results
@@ -0,0 +1,152 @@
+import os
+import time
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select, update
+
+from app import db
+from app.models import TestSubmission, TestLink
+from app.utils.leaderboard import refresh_leaderboard
+from app.utils.psychotest_scoring import papi_key, cfit_key, score_kraepelin_many
+
+RESCORE_BATCH_SIZE = int(os.getenv("RESCORE_BATCH_SIZE", 1000))
+RESCORE_WORKERS = int(os.getenv("RESCORE_WORKERS", min(4, os.cpu_count() or 1)))
+
+RESCORABLE_TYPES = ("papi", "cfit", "kraepelin")
+LEADERBOARD_TYPES = ("cfit", "kraepelin")   # tes yang ikut dihitung di leaderboard
+DIFF_IGNORED_FIELDS = ("detail_breakdown",) # terlalu besar untuk contoh diff
+
+# Kunci scoring di worker process (di-set sekali oleh initializer, bukan dikirim per batch)
+_worker_key = None
+
+
+def _init_worker(key):
+    global _worker_key
+    _worker_key = key
+
+
+def _score_batch(test_type, raw_answers_list, key=None):
+    """Skor per baris; None = tidak bisa di-skor ulang (jawaban mentah tidak tersimpan)."""
+    key = key if key is not None else _worker_key
+    if test_type == "kraepelin":
+        return score_kraepelin_many(raw_answers_list)
+    return [key.score(raw) if raw is not None else None for raw in raw_answers_list]
+
+
+def _current_key(test_type):
+    """Kunci terbaru dari DB (cache dibuang dulu, mis. tepat setelah seed ulang)."""
+    cached = {"papi": papi_key, "cfit": cfit_key}.get(test_type)
+    if cached is None:
+        return None
+    cached.invalidate()
+    return cached.get()
+
+
+def _stream_batches(test_type, batch_size):
+    """Baca submission lewat server-side cursor, per batch (koneksi terpisah dari session penulis)."""
+    stmt = select(
+        TestSubmission.id, TestLink.candidate_id, TestSubmission.raw_answers, TestSubmission.scores
+    ).join(TestLink, TestLink.id == TestSubmission.link_id) \
+     .where(TestSubmission.test_type == test_type) \
+     .order_by(TestSubmission.id)
+
+    with db.engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+        for rows in result.partitions():
+            yield rows
+
+
+def _scored_batches(test_type, key, batches, workers):
+    """(rows, hasil skor) per batch, urutan tetap; dengan workers > 1 batch di-skor paralel."""
+    if workers <= 1:
+        for rows in batches:
+            yield rows, _score_batch(test_type, [r.raw_answers for r in rows], key)
+        return
+
+    # spawn: hindari fork dari process yang sudah memegang koneksi DB
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(key,)) as pool:
+        pending = deque()
+        for rows in batches:
+            pending.append((rows, pool.submit(_score_batch, test_type, [r.raw_answers for r in rows])))
+            if len(pending) >= workers * 2:  # batasi batch yang tertahan di memori
+                rows, future = pending.popleft()
+                yield rows, future.result()
+        while pending:
+            rows, future = pending.popleft()
+            yield rows, future.result()
+
+
+def _diff(old, new):
+    """
+    Field yang nilainya berubah. Hanya field yang ada di skor lama yang dibandingkan:
+    field baru di hasil scoring (mis. subtest_scores CFIT) bukan perubahan skor.
+    """
+    if not isinstance(old, dict) or not old:
+        return {k: [None, v] for k, v in sorted(new.items())}
+    return {k: [old[k], new.get(k)] for k in sorted(old) if old[k] != new.get(k)}
+
+
+def rescore_submissions(test_type, batch_size=RESCORE_BATCH_SIZE, workers=RESCORE_WORKERS,
+                        dry_run=False, max_samples=10):
+    """
+    Hitung ulang TestSubmission.scores satu jenis tes dengan kunci / norma terbaru.
+    Hanya baris yang skornya berubah yang ditulis (bulk UPDATE per batch);
+    leaderboard kandidat yang terdampak ikut diperbarui.
+    Kraepelin yang disubmit sebelum grid disimpan (raw_answers berupa list jawaban saja)
+    tidak bisa di-skor ulang: skornya dibiarkan dan dihitung sebagai "skipped".
+    Return laporan: jumlah baris, throughput, field yang berubah & contoh diff.
+    """
+    if test_type not in RESCORABLE_TYPES:
+        raise ValueError(f"test_type harus salah satu dari {', '.join(RESCORABLE_TYPES)}")
+
+    started = time.perf_counter()
+    key = _current_key(test_type)
+    scanned = changed = skipped = 0
+    field_changes, samples, candidate_ids = Counter(), [], set()
+
+    for rows, results in _scored_batches(test_type, key, _stream_batches(test_type, batch_size), workers):
+        updates = []
+        for row, scores in zip(rows, results):
+            scanned += 1
+            if scores is None:  # tanpa raw_answers / Kraepelin lama tanpa grid
+                skipped += 1
+                continue
+            diff = _diff(row.scores, scores)
+            if not diff:
+                continue
+
+            changed += 1
+            field_changes.update(diff.keys())
+            candidate_ids.add(row.candidate_id)
+            updates.append({"id": row.id, "scores": scores})
+            if len(samples) < max_samples:
+                samples.append({
+                    "id": row.id,
+                    "candidate_id": row.candidate_id,
+                    "changes": {k: v for k, v in diff.items() if k not in DIFF_IGNORED_FIELDS}
+                })
+
+        if updates and not dry_run:
+            db.session.execute(update(TestSubmission), updates)
+            db.session.commit()
+
+    refreshed = 0
+    if candidate_ids and not dry_run and test_type in LEADERBOARD_TYPES:
+        refreshed = refresh_leaderboard(candidate_ids)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "test_type": test_type,
+        "dry_run": dry_run,
+        "scanned": scanned,
+        "changed": changed,
+        "skipped": skipped,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(scanned / elapsed, 1) if elapsed else None,
+        "field_changes": dict(field_changes.most_common()),
+        "leaderboard_refreshed": refreshed,
+        "samples": samples
+    }
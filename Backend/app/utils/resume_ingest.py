@@ -0,0 +1,474 @@
+import os
+import re
+import hashlib
+import queue
+import threading
+import multiprocessing
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from flask import current_app
+from sqlalchemy import or_
+
+from app import db
+from app.models import Resume, ResumeDuplicate, now_utc
+from app.utils.vector_store import GLOBAL_INDEX_PATH, get_vector_store
+from app.utils.chunk_store import CHUNK_STORE_PATH, get_chunk_store
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+UPLOAD_FOLDER = os.path.join(BASE, "uploads")
+INDEX_FOLDER = os.path.join(BASE, "indexes")
+CHUNKS_FOLDER = os.path.join(BASE, "chunks")
+
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+os.makedirs(INDEX_FOLDER, exist_ok=True)
+os.makedirs(CHUNKS_FOLDER, exist_ok=True)
+
+# Status pemrosesan CV (kolom Resume.status)
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Resume 'pending' lebih lama dari ini dianggap yatim (worker / process web sudah mati)
+PENDING_TIMEOUT_MINUTES = int(os.getenv("RESUME_PENDING_TIMEOUT_MINUTES", 30))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Hasil worker (future selesai) diantrikan ke satu thread consumer per process web;
+# callback executor hanya memasukkan ke antrian, semua kerja DB / index ada di consumer
+_results = queue.Queue()
+_consumer = None
+
+# Tahap pipeline job-queue yang dijalankan consumer setelah worker selesai
+STAGE_TEXT = "text"     # teks diekstrak -> cek duplikat teks, lalu kirim ke embedding
+STAGE_EMBED = "embed"   # chunk + embedding siap -> simpan ke index & DB
+
+
+# Penanda halaman yang disisipkan extract_text_from_pdf (diabaikan saat hashing)
+PAGE_MARKER_RE = re.compile(r"^--- Halaman \d+(?: \(OCR\))? ---$", re.MULTILINE)
+
+
+def upload_path(resume_id, filename):
+    return os.path.join(UPLOAD_FOLDER, f"{resume_id}_{filename}")
+
+
+def save_upload(stream, pdf_path):
+    """Simpan file upload sambil menghitung SHA-256 isinya (sekali baca). Return hex digest."""
+    h = hashlib.sha256()
+    with open(pdf_path, "wb") as out:
+        for block in iter(lambda: stream.read(1024 * 1024), b""):
+            h.update(block)
+            out.write(block)
+    return h.hexdigest()
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def normalized_text_hash(text):
+    """
+    Hash teks CV ternormalisasi (tanpa penanda halaman, huruf kecil, spasi dirapikan),
+    sehingga PDF yang sama tapi di-export ulang tetap terdeteksi. Teks kosong -> None.
+    """
+    norm = " ".join(PAGE_MARKER_RE.sub(" ", text or "").lower().split())
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest() if norm else None
+
+
+def find_duplicate_resume(file_hash=None, text_hash=None):
+    """
+    Cari Resume yang sudah ada (bukan failed) dengan fingerprint sama.
+    file_hash juga dicocokkan ke upload duplikat sebelumnya (alias byte lain dari CV yang sama).
+    """
+    conds = []
+    if file_hash:
+        conds.append(Resume.file_hash == file_hash)
+        conds.append(Resume.id.in_(
+            db.session.query(ResumeDuplicate.resume_id).filter(ResumeDuplicate.file_hash == file_hash)
+        ))
+    if text_hash:
+        conds.append(Resume.text_hash == text_hash)
+    if not conds:
+        return None
+
+    return Resume.query.filter(or_(*conds), Resume.status != STATUS_FAILED)\
+        .order_by(Resume.uploaded_at).first()
+
+
+def record_duplicate(resume, filename, file_hash, match, pdf_path=None):
+    """Catat upload duplikat (tanpa commit) & hapus file upload yang tidak dipakai."""
+    db.session.add(ResumeDuplicate(
+        resume_id=resume.id,
+        filename=filename,
+        file_hash=file_hash,
+        match=match
+    ))
+    if pdf_path and os.path.exists(pdf_path):
+        os.remove(pdf_path)
+
+
+def chunk_and_embed(text):
+    """Chunk per section/kalimat (dict berisi teks + metadata halaman), lalu embed teksnya."""
+    from extractor import chunk_document, embed_chunks
+
+    chunks = chunk_document(text)
+    embeddings = embed_chunks([c["text"] for c in chunks])
+    return chunks, embeddings
+
+
+def extract_text_safe(pdf_path):
+    """
+    Ekstraksi teks / OCR (CPU-heavy, tanpa DB -> aman di worker process).
+    Return (text, error) agar satu file rusak tidak menggagalkan batch / antrian.
+    """
+    from extractor import extract_text_from_pdf
+
+    try:
+        return extract_text_from_pdf(pdf_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def store_resume_index(resume_id, chunks, embeddings):
+    """
+    Simpan embedding ke index global & chunk ke chunk store untuk satu resume.
+    Return (index_path, chunks_path).
+    """
+    get_chunk_store().add(resume_id, chunks)
+    get_vector_store().add(resume_id, embeddings)
+    return GLOBAL_INDEX_PATH, CHUNK_STORE_PATH
+
+
+def ingest_resume_sync(resume_id, filename, pdf_path, file_hash=None):
+    """
+    Mode lama: proses CV langsung di dalam request HTTP.
+    Jika teks CV sama dengan Resume yang sudah ada, chunking/embedding dilewati
+    dan Resume lama yang dikembalikan (cek r.id != resume_id).
+    """
+    from extractor import extract_text_from_pdf
+
+    text = extract_text_from_pdf(pdf_path)
+    text_hash = normalized_text_hash(text)
+
+    existing = find_duplicate_resume(text_hash=text_hash)
+    if existing:
+        record_duplicate(existing, filename, file_hash, "text", pdf_path)
+        db.session.commit()
+        return existing
+
+    chunks, embeddings = chunk_and_embed(text)
+    index_path, chunks_path = store_resume_index(resume_id, chunks, embeddings)
+
+    r = Resume(
+        id=resume_id,
+        filename=filename,
+        index_path=index_path,
+        chunks_path=chunks_path,
+        raw_text=text,
+        status=STATUS_DONE,
+        file_hash=file_hash,
+        text_hash=text_hash
+    )
+    db.session.add(r)
+    db.session.commit()
+    return r
+
+
+def ingest_resume_batch(items):
+    """
+    Bulk ingest: items = list of (resume_id, filename, pdf_path, file_hash).
+    Ekstraksi teks paralel di worker process, lalu SEMUA chunk dari semua CV
+    di-embed dalam satu panggilan batch, dan seluruh Resume disimpan dalam satu transaksi.
+    Duplikat (byte atau teks, terhadap DB maupun sesama isi batch) tidak di-embed ulang.
+    Return (resumes, failed, duplicates).
+    """
+    from extractor import chunk_document, embed_chunks
+
+    duplicates = []  # (filename, file_hash, match, pdf_path, resume_id tujuan)
+
+    # 1. Duplikat byte: dicek sebelum OCR
+    pending, seen_files = [], {}
+    for resume_id, filename, pdf_path, file_hash in items:
+        existing = find_duplicate_resume(file_hash=file_hash)
+        target = existing.id if existing else seen_files.get(file_hash)
+        if target:
+            duplicates.append((filename, file_hash, "file", pdf_path, target))
+            continue
+        seen_files[file_hash] = resume_id
+        pending.append((resume_id, filename, pdf_path, file_hash))
+
+    results = list(get_executor().map(extract_text_safe, [path for _, _, path, _ in pending]))
+
+    # 2. Duplikat teks: dicek sebelum chunking / embedding
+    ok, failed = [], []
+    all_chunks, offsets = [], []
+    seen_texts = {}
+    alias = {}  # resume_id batch yang ternyata duplikat teks -> resume_id tujuan
+    for (resume_id, filename, pdf_path, file_hash), (text, error) in zip(pending, results):
+        if error is not None:
+            failed.append({"filename": filename, "error": error})
+            alias[resume_id] = None
+            continue
+
+        text_hash = normalized_text_hash(text)
+        existing = find_duplicate_resume(text_hash=text_hash)
+        target = existing.id if existing else seen_texts.get(text_hash)
+        if target:
+            duplicates.append((filename, file_hash, "text", pdf_path, target))
+            alias[resume_id] = target
+            continue
+        if text_hash:
+            seen_texts[text_hash] = resume_id
+
+        chunks = chunk_document(text)
+        offsets.append((len(all_chunks), len(all_chunks) + len(chunks)))
+        all_chunks.extend(chunks)
+        ok.append((resume_id, filename, text, chunks, file_hash, text_hash))
+
+    # Duplikat byte sesama isi batch mengikuti nasib file pertamanya
+    resolved = []
+    for filename, file_hash, match, pdf_path, target in duplicates:
+        target = alias.get(target, target)
+        if target is None:
+            failed.append({"filename": filename, "error": "gagal diproses (duplikat dari file yang gagal)"})
+        else:
+            resolved.append((filename, file_hash, match, pdf_path, target))
+    duplicates = resolved
+
+    embeddings = embed_chunks([c["text"] for c in all_chunks])
+
+    resumes = []
+    try:
+        get_chunk_store().add_many([(item[0], item[3]) for item in ok])
+        get_vector_store().add_many([
+            (item[0], embeddings[start:end])
+            for item, (start, end) in zip(ok, offsets)
+        ])
+
+        for resume_id, filename, text, chunks, file_hash, text_hash in ok:
+            r = Resume(
+                id=resume_id,
+                filename=filename,
+                index_path=GLOBAL_INDEX_PATH,
+                chunks_path=CHUNK_STORE_PATH,
+                raw_text=text,
+                status=STATUS_DONE,
+                file_hash=file_hash,
+                text_hash=text_hash
+            )
+            db.session.add(r)
+            resumes.append(r)
+        db.session.flush()
+
+        # Dicatat setelah flush karena bisa menunjuk Resume baru dari batch ini
+        for filename, file_hash, match, _, target in duplicates:
+            db.session.add(ResumeDuplicate(
+                resume_id=target,
+                filename=filename,
+                file_hash=file_hash,
+                match=match
+            ))
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for _, _, _, pdf_path, _ in duplicates:
+        if os.path.exists(pdf_path):
+            os.remove(pdf_path)
+
+    return resumes, failed, [
+        {"filename": filename, "resume_id": target, "match": match}
+        for filename, _, match, _, target in duplicates
+    ]
+
+
+def get_executor():
+    """Pool worker process lokal (dibuat sekali per process web)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            warm = current_app.config["WARM_UP_MODELS"]
+
+            # spawn: hindari fork dari process yang sudah memuat torch / koneksi DB
+            _executor = ProcessPoolExecutor(
+                max_workers=current_app.config["RESUME_INGEST_WORKERS"],
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up_worker if warm else None,
+                initargs=(warm == "all",) if warm else ()
+            )
+        return _executor
+
+
+def _warm_up_worker(ocr):
+    from extractor import warm_up
+    warm_up(ocr=ocr)
+
+
+def enqueue_resume(resume_id, filename, pdf_path, file_hash=None):
+    """
+    Mode job-queue: simpan Resume dengan status 'pending', lalu serahkan
+    ekstraksi/OCR ke worker process. Cek duplikat teks, embedding dan penyimpanan
+    dilanjutkan oleh thread consumer (lihat _consume_results).
+    """
+    r = Resume(id=resume_id, filename=filename, status=STATUS_PENDING, file_hash=file_hash)
+    db.session.add(r)
+    db.session.commit()
+
+    _ensure_consumer(current_app._get_current_object())
+    _submit(STAGE_TEXT, resume_id, pdf_path, extract_text_safe, pdf_path)
+    return r
+
+
+def _submit(stage, resume_id, pdf_path, fn, arg, *extra):
+    """Jalankan fn(arg) di worker; future yang selesai diantrikan ke consumer sebagai tahap `stage`."""
+    future = get_executor().submit(fn, arg)
+    future.add_done_callback(lambda fut: _results.put((stage, resume_id, pdf_path, fut, *extra)))
+
+
+def _ensure_consumer(app):
+    global _consumer
+    with _executor_lock:
+        if _consumer is None or not _consumer.is_alive():
+            _consumer = threading.Thread(target=_consume_results, args=(app,),
+                                         name="resume-ingest-consumer", daemon=True)
+            _consumer.start()
+
+
+def _consume_results(app):
+    """Loop thread consumer: lanjutkan pipeline untuk setiap hasil worker (di dalam app context)."""
+    while True:
+        stage, resume_id, pdf_path, future, *extra = _results.get()
+        with app.app_context():
+            try:
+                if stage == STAGE_TEXT:
+                    checked = _text_ready(resume_id, pdf_path, future)
+                    if checked is not None:
+                        _submit(STAGE_EMBED, resume_id, pdf_path, chunk_and_embed, checked[0], *checked)
+                else:
+                    _embeddings_ready(resume_id, future, *extra)
+            except Exception as e:
+                _mark_failed(resume_id, e)
+            finally:
+                db.session.remove()
+
+
+def _mark_failed(resume_id, error):
+    """Exception di tahap mana pun -> Resume failed + pesan error (tidak tertahan di pending)."""
+    print(f"Resume Ingest Error ({resume_id}): {error}")
+    try:
+        db.session.rollback()
+        r = db.session.get(Resume, resume_id)
+        if r is not None and r.status == STATUS_PENDING:
+            r.status = STATUS_FAILED
+            r.error = str(error)
+            db.session.commit()
+    except Exception as e:
+        # DB tidak bisa diakses: biarkan pending, nanti diambil `flask resume-index requeue-pending`
+        db.session.rollback()
+        print(f"Resume Ingest Error ({resume_id}): gagal menandai failed: {e}")
+
+
+def _text_ready(resume_id, pdf_path, future):
+    """
+    Teks sudah diekstrak worker; duplikat teks dicek SEBELUM embedding.
+    Jika sama dengan Resume lain, upload ini dicatat sebagai duplikat (ResumeDuplicate dengan
+    id = resume_id upload, agar status_url tetap bisa diikuti) dan Resume pending-nya dihapus.
+    Return (text, text_hash) jika masih perlu di-embed, selain itu None.
+    """
+    text, error = future.result()
+    if error is not None:
+        raise RuntimeError(error)
+
+    r = db.session.get(Resume, resume_id)
+    if r is None or r.status != STATUS_PENDING:
+        return None
+
+    text_hash = normalized_text_hash(text)
+    existing = find_duplicate_resume(text_hash=text_hash)
+    if existing and existing.id != resume_id:
+        db.session.add(ResumeDuplicate(
+            id=resume_id,
+            resume_id=existing.id,
+            filename=r.filename,
+            file_hash=r.file_hash or "",
+            match="text"
+        ))
+        db.session.delete(r)
+        db.session.commit()
+        if pdf_path and os.path.exists(pdf_path):
+            os.remove(pdf_path)
+        return None
+
+    # Disimpan sekarang agar upload dengan teks sama selama embedding berjalan ikut terdeteksi
+    r.text_hash = text_hash
+    db.session.commit()
+    return text, text_hash
+
+
+def _embeddings_ready(resume_id, future, text, text_hash):
+    """Simpan embedding & chunk ke index global, lalu tandai Resume selesai."""
+    chunks, embeddings = future.result()
+
+    r = db.session.get(Resume, resume_id)
+    if r is None or r.status != STATUS_PENDING:
+        return
+
+    r.index_path, r.chunks_path = store_resume_index(resume_id, chunks, embeddings)
+    r.raw_text = text
+    r.text_hash = text_hash
+    r.status = STATUS_DONE
+    r.error = None
+    db.session.commit()
+
+
+def requeue_stale_resumes(older_than_minutes=PENDING_TIMEOUT_MINUTES):
+    """
+    Proses ulang Resume yang tertahan di status 'pending' (mis. process web restart
+    sebelum consumer menyimpan hasil worker). File upload yang sudah hilang -> status failed.
+    Dijalankan sinkron (menunggu semua worker selesai). Return (requeued, expired).
+    """
+    cutoff = now_utc() - timedelta(minutes=older_than_minutes)
+    stale = Resume.query.filter(Resume.status == STATUS_PENDING, Resume.uploaded_at < cutoff)\
+        .order_by(Resume.uploaded_at).all()
+
+    jobs, expired = {}, []
+    for r in stale:
+        pdf_path = upload_path(r.id, r.filename)
+        if os.path.exists(pdf_path):
+            jobs[r.id] = pdf_path
+        else:
+            r.status = STATUS_FAILED
+            r.error = "file upload tidak ditemukan saat requeue"
+            expired.append(r.id)
+    db.session.commit()
+
+    if not jobs:
+        return [], expired
+
+    executor = get_executor()
+    extracting = {executor.submit(extract_text_safe, path): resume_id for resume_id, path in jobs.items()}
+    embedding = {}
+    for future in as_completed(extracting):
+        resume_id = extracting[future]
+        try:
+            checked = _text_ready(resume_id, jobs[resume_id], future)
+            if checked is not None:
+                embedding[executor.submit(chunk_and_embed, checked[0])] = (resume_id, checked)
+        except Exception as e:
+            _mark_failed(resume_id, e)
+
+    for future in as_completed(embedding):
+        resume_id, (text, text_hash) = embedding[future]
+        try:
+            _embeddings_ready(resume_id, future, text, text_hash)
+        except Exception as e:
+            _mark_failed(resume_id, e)
+    return list(jobs), expired
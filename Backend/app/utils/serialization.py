@@ -0,0 +1,16 @@
+def eager_load(*options):
+    """
+    Decorator untuk fungsi serializer: deklarasikan relasi yang dibaca serializer
+    (selectinload / joinedload), supaya query yang hasilnya di-serialize memuat
+    semuanya sekaligus, bukan satu lazy load per baris (N+1).
+    """
+    def decorator(serialize):
+        serialize.load_options = options
+        return serialize
+    return decorator
+
+
+def with_load_options(query, serialize):
+    """Pasang loader option milik serializer (jika ada) ke query."""
+    options = getattr(serialize, "load_options", ())
+    return query.options(*options) if options else query
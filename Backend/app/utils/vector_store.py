@@ -0,0 +1,551 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import faiss
+
+try:
+    import fcntl  # lock antar process (Linux / server)
+except ImportError:  # Windows (dev lokal): cukup lock antar thread
+    fcntl = None
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+INDEX_FOLDER = os.path.join(BASE, "indexes")
+
+GLOBAL_INDEX_PATH = os.path.join(INDEX_FOLDER, "resumes.faiss")
+GLOBAL_MAP_PATH = os.path.join(INDEX_FOLDER, "resumes_map.json")
+
+# Jenis index: "flat" (float32, exact), "sq8" (int8 per dimensi, ~4x lebih kecil),
+# "ivfpq" (product quantization + inverted list, paling kecil & cepat, approximate)
+INDEX_TYPES = ("flat", "sq8", "ivfpq")
+RESUME_INDEX_TYPE = os.getenv("RESUME_INDEX_TYPE", "flat")
+RESUME_INDEX_NLIST = int(os.getenv("RESUME_INDEX_NLIST", 256))    # jumlah cluster IVF
+RESUME_INDEX_PQ_M = int(os.getenv("RESUME_INDEX_PQ_M", 96))       # sub-vektor PQ (byte per vektor)
+RESUME_INDEX_NPROBE = int(os.getenv("RESUME_INDEX_NPROBE", 32))   # cluster yang discan: recall vs latency
+# Kandidat rank(): chunk yang diambil dari index = top_k * per_resume * faktor ini
+RESUME_RANK_OVERSAMPLE = int(os.getenv("RESUME_RANK_OVERSAMPLE", 4))
+# Vektor di log (di luar snapshot) sebelum snapshot ditulis ulang; minimal 1/4 isi index
+RESUME_INDEX_CHECKPOINT_ROWS = int(os.getenv("RESUME_INDEX_CHECKPOINT_ROWS", 20000))
+
+# IVFPQ butuh data latih yang cukup (codebook PQ 256 centroid, ~39 titik per cluster IVF)
+IVFPQ_MIN_TRAIN = 1000
+
+
+def _sq_training_set(train, dim):
+    """
+    Range SQ8 dilatih dari data; jika data masih sedikit, pakai batas [-1, 1]
+    (embedding ternormalisasi) agar vektor berikutnya tidak terpotong.
+    """
+    if train is not None and len(train) >= IVFPQ_MIN_TRAIN:
+        return np.ascontiguousarray(train, dtype="float32")
+    return np.vstack([-np.ones(dim), np.ones(dim)]).astype("float32")
+
+
+def build_index(dim, index_type="flat", train=None, nlist=RESUME_INDEX_NLIST,
+                pq_m=RESUME_INDEX_PQ_M, nprobe=RESUME_INDEX_NPROBE):
+    """
+    Buat index kosong (sudah dilatih) yang mendukung add_with_ids / remove_ids / reconstruct.
+    IVFPQ dengan data latih terlalu sedikit jatuh ke SQ8; jalankan rebuild setelah data cukup.
+    """
+    if index_type == "ivfpq":
+        n = 0 if train is None else len(train)
+        if n < IVFPQ_MIN_TRAIN or dim % pq_m:
+            print(f"Vector Store: IVFPQ butuh >= {IVFPQ_MIN_TRAIN} vektor (ada {n}) "
+                  f"& dim {dim} habis dibagi pq_m {pq_m}, pakai sq8")
+            index_type = "sq8"
+        else:
+            nlist = max(1, min(nlist, n // 39))
+            ivf = faiss.IndexIVFPQ(faiss.IndexFlatIP(dim), dim, nlist, pq_m, 8, faiss.METRIC_INNER_PRODUCT)
+            # Sudah dijaga IVFPQ_MIN_TRAIN; hindari warning FAISS untuk korpus < 10rb chunk
+            ivf.pq.cp.min_points_per_centroid = 1
+            ivf.train(np.ascontiguousarray(train, dtype="float32"))
+            ivf.nprobe = min(nprobe, nlist)
+            # IVF menyimpan ID sendiri; hashtable agar reconstruct & remove per ID tetap bisa
+            ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+            return ivf
+
+    if index_type == "sq8":
+        sq = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        sq.train(_sq_training_set(train, dim))
+        return faiss.IndexIDMap2(sq)
+
+    return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+
+def index_type_of(index):
+    """Nama jenis index dari objek FAISS (flat / sq8 / ivfpq)."""
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    if isinstance(inner, faiss.IndexIVFPQ):
+        return "ivfpq"
+    if isinstance(inner, faiss.IndexScalarQuantizer):
+        return "sq8"
+    return "flat"
+
+
+class ResumeVectorStore:
+    """
+    Satu index FAISS (IndexIDMap2) untuk seluruh chunk resume.
+
+    Setiap resume mendapat rentang ID chunk yang berurutan [start, start + count),
+    sehingga chunk ke-i milik resume r selalu ber-ID start + i.
+    Index disimpan di memori (per process), di disk sebagai:
+
+    - snapshot FAISS (resumes.<generation>.faiss; generation 0 = resumes.faiss format lama)
+    - resumes.log : vektor float32 yang ditambahkan setelah snapshot, di-append berurutan
+      (baris ke-j = ID base + j)
+    - map JSON    : resume_id -> [start, count], generation, base, rentang ID yang dihapus;
+      ditulis atomik dan menjadi titik commit (sama seperti ChunkStore)
+
+    Upload baru hanya meng-append vektornya ke log; snapshot ditulis ulang (checkpoint)
+    setelah log cukup besar. Semua tulisan memakai lock file (fcntl) antar process
+    dan membaca ulang state disk di dalam lock, sehingga tidak ada resume yang hilang
+    saat beberapa worker menulis bersamaan.
+    """
+
+    def __init__(self, index_path=GLOBAL_INDEX_PATH, map_path=GLOBAL_MAP_PATH, index_type=RESUME_INDEX_TYPE,
+                 checkpoint_rows=RESUME_INDEX_CHECKPOINT_ROWS):
+        root, _ = os.path.splitext(index_path)
+        self.index_path = index_path
+        self.map_path = map_path
+        self.log_path = root + ".log"
+        self.lock_path = root + ".lock"
+        self.index_type = index_type  # dipakai saat index dibuat / di-rebuild
+        self.checkpoint_rows = checkpoint_rows
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        """Kosongkan state memori; akses berikutnya load ulang penuh dari disk."""
+        self._index = None
+        self._ranges = {}   # resume_id -> [start_id, count]
+        self._next_id = 0
+        self._generation = 0  # snapshot yang sedang dipakai
+        self._base = 0        # next_id saat snapshot ditulis (ID baris pertama log)
+        self._removed = []    # [start, count] yang dihapus setelah snapshot
+        self._version = 0     # naik setiap commit
+        self._stamp = None
+        self._loaded = False
+        self._owners = None  # cache (starts, counts, resume_ids) untuk mapping chunk id -> resume
+
+    # ------------------------------------------------------------------
+    # Load / persist
+    # ------------------------------------------------------------------
+    def _snapshot_path(self, generation):
+        if not generation:
+            return self.index_path
+        root, ext = os.path.splitext(self.index_path)
+        return f"{root}.{generation}{ext}"
+
+    def _disk_stamp(self):
+        # os.replace selalu membuat inode baru; mtime saja bisa sama untuk dua commit berdekatan
+        try:
+            st = os.stat(self.map_path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _read_map(self):
+        try:
+            with open(self.map_path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _file_lock(self, exclusive):
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        with open(self.lock_path, "a") as lock_fh:
+            if fcntl:
+                fcntl.flock(lock_fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock, self._file_lock(exclusive=True):
+            # Selalu cek map di dalam lock: tulisan process lain tidak boleh tertimpa
+            self._sync(self._read_map())
+            try:
+                yield
+            except Exception:
+                self._reset()  # state memori bisa sudah mendahului disk
+                raise
+
+    def _ensure_loaded(self):
+        """Load dari disk sekali, dan sinkron ulang jika process lain sudah commit versi baru."""
+        if self._loaded and self._disk_stamp() == self._stamp:
+            return
+        with self._file_lock(exclusive=False):
+            self._sync(self._read_map())
+
+    def _sync(self, meta):
+        """
+        Samakan state memori dengan map di disk (dipanggil dengan file lock).
+        Snapshot yang sama -> cukup replay baris log & penghapusan yang belum diterapkan.
+        """
+        if meta is None:
+            self._reset()
+            self._loaded = True
+            return
+        if self._loaded and meta.get("version", 0) == self._version:
+            self._stamp = self._disk_stamp()
+            return
+
+        generation = meta.get("generation", 0)
+        base = meta.get("base", meta["next_id"])  # format lama: tanpa log
+        removed = meta.get("removed", [])
+
+        if (self._loaded and self._index is not None and generation == self._generation
+                and base == self._base and meta["next_id"] >= self._next_id
+                and len(removed) >= len(self._removed)):
+            rows_from, removed_from = self._next_id - self._base, len(self._removed)
+        else:
+            path = self._snapshot_path(generation)
+            if not os.path.exists(path):
+                self._reset()
+                self._loaded = True
+                return
+            self._index = faiss.read_index(path)
+            if isinstance(self._index, faiss.IndexIVF):
+                self._index.nprobe = min(RESUME_INDEX_NPROBE, self._index.nlist)
+            self._generation, self._base = generation, base
+            rows_from, removed_from = 0, 0
+
+        self._replay(rows_from, meta["next_id"] - base, removed[removed_from:])
+        self._ranges = meta["resumes"]
+        self._next_id = meta["next_id"]
+        self._removed = removed
+        self._version = meta.get("version", 0)
+        self._stamp = self._disk_stamp()
+        self._loaded = True
+        self._owners = None
+
+    def _replay(self, rows_from, rows_to, removed):
+        """Tambahkan baris log [rows_from, rows_to) ke index, lalu terapkan penghapusan."""
+        if rows_to > rows_from:
+            dim = self._index.d
+            with open(self.log_path, "rb") as fh:
+                fh.seek(rows_from * dim * 4)
+                data = np.frombuffer(fh.read((rows_to - rows_from) * dim * 4), dtype="<f4")
+            ids = np.arange(self._base + rows_from, self._base + rows_to, dtype="int64")
+            self._index.add_with_ids(np.ascontiguousarray(data.reshape(-1, dim), dtype="float32"), ids)
+        for start, count in removed:
+            self._remove_ids(start, count)
+
+    def _save_map(self):
+        """Commit: tulis map atomik (tmp + fsync + os.replace)."""
+        os.makedirs(os.path.dirname(self.map_path), exist_ok=True)
+        self._version += 1
+        tmp_map = self.map_path + ".tmp"
+        with open(tmp_map, "w", encoding="utf-8") as fh:
+            json.dump({
+                "dim": self._index.d,
+                "index_type": index_type_of(self._index),
+                "version": self._version,
+                "generation": self._generation,
+                "base": self._base,
+                "next_id": self._next_id,
+                "removed": self._removed,
+                "resumes": self._ranges
+            }, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_map, self.map_path)
+        self._stamp = self._disk_stamp()
+
+    def _append_log(self, rows_from, vectors):
+        """Append vektor baru ke log (sebelum commit map)."""
+        with open(self.log_path, "ab") as fh:
+            # Potong sisa tulisan yang tidak ter-commit (mis. process mati di tengah append)
+            fh.truncate(rows_from * self._index.d * 4)
+            for v in vectors:
+                fh.write(v.astype("<f4").tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _checkpoint(self):
+        """Tulis snapshot penuh generation baru, commit, lalu buang log & snapshot lama."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        old_path = self._snapshot_path(self._generation)
+        generation = self._generation + 1
+        path = self._snapshot_path(generation)
+
+        tmp_index = path + ".tmp"
+        faiss.write_index(self._index, tmp_index)
+        with open(tmp_index, "rb") as fh:
+            os.fsync(fh.fileno())
+        os.replace(tmp_index, path)
+
+        self._generation, self._base, self._removed = generation, self._next_id, []
+        self._save_map()
+
+        # Tidak lagi direferensikan map (pembaca lain tertahan oleh file lock)
+        with open(self.log_path, "wb"):
+            pass
+        if old_path != path and os.path.exists(old_path):
+            os.remove(old_path)
+
+    def _commit(self, rows_from, vectors, snapshot=False):
+        """Persist perubahan: append log + map, atau checkpoint jika log / daftar hapus sudah besar."""
+        if self._index is None:
+            return
+        pending = (self._next_id - self._base) + sum(count for _, count in self._removed)
+        if snapshot or pending >= max(self.checkpoint_rows, self._index.ntotal // 4):
+            self._checkpoint()
+        else:
+            self._append_log(rows_from, vectors)
+            self._save_map()
+
+    def _new_index(self, dim, train=None):
+        return build_index(dim, self.index_type, train=train)
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+    def _add(self, resume_id, embeddings):
+        """Tambah ke index memori; return vektor yang perlu di-append ke log."""
+        if resume_id in self._ranges:
+            self._remove(resume_id)
+
+        embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+        if self._index is None:
+            self._index = self._new_index(embeddings.shape[1], train=embeddings)
+
+        start, count = self._next_id, len(embeddings)
+        if count:
+            ids = np.arange(start, start + count, dtype="int64")
+            self._index.add_with_ids(embeddings, ids)
+
+        self._ranges[resume_id] = [start, count]
+        self._next_id += count
+        self._owners = None
+        return embeddings
+
+    def _remove_ids(self, start, count):
+        if isinstance(self._index, faiss.IndexIVF):
+            # Direct map hashtable IVF hanya menerima selector berupa daftar ID
+            ids = np.arange(start, start + count, dtype="int64")
+            self._index.remove_ids(faiss.IDSelectorArray(count, faiss.swig_ptr(ids)))
+        else:
+            self._index.remove_ids(faiss.IDSelectorRange(start, start + count))
+
+    def _remove(self, resume_id):
+        start, count = self._ranges.pop(resume_id)
+        self._owners = None
+        if not count:
+            return
+        self._remove_ids(start, count)
+        self._removed.append([start, count])
+
+    def add(self, resume_id, embeddings):
+        """Tambah / ganti embedding chunk satu resume."""
+        self.add_many([(resume_id, embeddings)])
+
+    def add_many(self, items):
+        """Tambah banyak resume sekaligus, commit sekali di akhir. items = [(resume_id, embeddings)]."""
+        with self._write_lock():
+            rows_from = self._next_id - self._base
+            fresh = self._index is None  # index baru dilatih -> wajib snapshot
+            vectors = [self._add(resume_id, embeddings) for resume_id, embeddings in items]
+            self._commit(rows_from, vectors, snapshot=fresh)
+
+    def rebuild(self, index_type=None, vectors=None):
+        """
+        Bangun ulang index (mis. ganti ke sq8 / ivfpq, atau latih ulang setelah data bertambah).
+        vectors: dict resume_id -> embeddings; default direkonstruksi dari index sekarang
+        (lossless dari flat, approximate dari index terkuantisasi -> pakai re-embed untuk hasil terbaik).
+        """
+        with self._write_lock():
+            if vectors is None:
+                vectors = {rid: self.get_vectors(rid) for rid in self._ranges}
+
+            if index_type:
+                self.index_type = index_type
+            self._index, self._ranges, self._next_id, self._owners = None, {}, 0, None
+
+            non_empty = [np.asarray(v, dtype="float32") for v in vectors.values() if len(v)]
+            if non_empty:
+                train = np.vstack(non_empty)
+                self._index = self._new_index(train.shape[1], train=train)
+            for resume_id, embeddings in vectors.items():
+                if self._index is None:
+                    self._ranges[resume_id] = [self._next_id, 0]
+                    continue
+                self._add(resume_id, embeddings)
+
+            self._commit(0, [], snapshot=True)
+            return index_type_of(self._index) if self._index is not None else None
+
+    def remove(self, resume_id):
+        with self._write_lock():
+            if resume_id in self._ranges:
+                self._remove(resume_id)
+                self._commit(self._next_id - self._base, [])
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+    def has(self, resume_id):
+        with self._lock:
+            self._ensure_loaded()
+            return resume_id in self._ranges
+
+    def stats(self):
+        with self._lock:
+            self._ensure_loaded()
+            if self._index is None:
+                return {"index_type": None, "vectors": 0, "resumes": 0}
+            return {
+                "index_type": index_type_of(self._index),
+                "vectors": self._index.ntotal,
+                "resumes": len(self._ranges),
+                "nprobe": self._index.nprobe if isinstance(self._index, faiss.IndexIVF) else None,
+                "generation": self._generation,
+                "log_vectors": self._next_id - self._base
+            }
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return self._index.ntotal if self._index is not None else 0
+
+    def get_vectors(self, resume_id):
+        """Semua vektor chunk milik satu resume (urut sesuai posisi chunk)."""
+        with self._lock:
+            self._ensure_loaded()
+            start, count = self._ranges[resume_id]
+            if not count:
+                return np.zeros((0, self._index.d), dtype="float32")
+            ids = np.arange(start, start + count, dtype="int64")
+            return self._index.reconstruct_batch(ids)
+
+    def all_vectors(self):
+        """Seluruh vektor di index (urut per resume), untuk benchmark / rebuild."""
+        with self._lock:
+            self._ensure_loaded()
+            parts = [self.get_vectors(rid) for rid, (_, count) in self._ranges.items() if count]
+            return np.vstack(parts) if parts else np.zeros((0, self._index.d if self._index else 0), dtype="float32")
+
+    def search_resume(self, resume_id, q_emb, k=5):
+        """
+        Top-k chunk satu resume terhadap query. Hanya merekonstruksi vektor milik
+        resume tersebut (tanpa baca file). Return (scores, chunk_positions).
+        """
+        vectors = self.get_vectors(resume_id)
+        if not len(vectors):
+            return np.zeros(0, dtype="float32"), np.zeros(0, dtype="int64")
+
+        scores = vectors @ np.asarray(q_emb, dtype="float32").reshape(-1)
+        k = min(k, len(scores))
+        top = np.argsort(-scores)[:k]
+        return scores[top], top
+
+    def _owner_lookup(self):
+        """Array starts (urut) + counts + resume_ids paralel, untuk np.searchsorted."""
+        if self._owners is None:
+            items = sorted((start, count, rid) for rid, (start, count) in self._ranges.items() if count)
+            starts = np.array([start for start, _, _ in items], dtype="int64")
+            counts = np.array([count for _, count, _ in items], dtype="int64")
+            self._owners = (starts, counts, [rid for _, _, rid in items])
+        return self._owners
+
+    def _score_resumes(self, candidates, q, per_resume):
+        """Rata-rata `per_resume` chunk teratas tiap resume kandidat (indeks ke _owner_lookup)."""
+        starts, counts, _ = self._owner_lookup()
+
+        # Seluruh chunk milik kandidat, direkonstruksi dalam satu batch
+        sizes = counts[candidates]
+        owner = np.repeat(np.arange(len(candidates)), sizes)
+        offsets = np.arange(len(owner)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        scores = self._index.reconstruct_batch(np.repeat(starts[candidates], sizes) + offsets) @ q
+
+        # Urutkan skor menurun; stable sort per owner menjaga urutan itu,
+        # sehingga posisi dalam grup = peringkat chunk di resume tersebut.
+        order = np.argsort(-scores, kind="stable")
+        order = order[np.argsort(owner[order], kind="stable")]
+        owner_sorted = owner[order]
+        group_start = np.searchsorted(owner_sorted, owner_sorted, side="left")
+        keep = (np.arange(len(order)) - group_start) < per_resume
+
+        sums = np.bincount(owner_sorted, weights=scores[order] * keep, minlength=len(candidates))
+        return sums / np.minimum(sizes, per_resume)
+
+    def rank(self, q_emb, top_k=50, per_resume=5):
+        """
+        Ranking resume terhadap satu query tanpa scan seluruh index:
+        1. search top_k * per_resume * RESUME_RANK_OVERSAMPLE chunk teratas -> kandidat resume,
+        2. skor kandidat = rata-rata `per_resume` chunk teratas (sama seperti match_resume),
+           dihitung dari seluruh chunk resume tersebut.
+        Return list of (resume_id, score) terurut menurun.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._index is None or self._index.ntotal == 0 or top_k <= 0:
+                return []
+
+            q = np.asarray(q_emb, dtype="float32").reshape(1, -1)
+            k = min(self._index.ntotal, top_k * per_resume * RESUME_RANK_OVERSAMPLE)
+            _, I = self._index.search(q, k)
+            found = I[0][I[0] >= 0]
+
+            starts, _, resume_ids = self._owner_lookup()
+            candidates = np.unique(np.searchsorted(starts, found, side="right") - 1)
+            means = self._score_resumes(candidates, q[0], per_resume)
+
+        top_k = min(top_k, len(candidates))
+        top = np.argpartition(-means, top_k - 1)[:top_k] if top_k else np.array([], dtype="int64")
+        top = top[np.argsort(-means[top], kind="stable")]
+        return [(resume_ids[candidates[i]], float(means[i])) for i in top]
+
+
+def benchmark_index_types(vectors, queries, k=10, index_types=INDEX_TYPES, **params):
+    """
+    Bandingkan recall@k & latency tiap jenis index terhadap ground truth flat (exact).
+    Return list of dict per jenis index.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    queries = np.ascontiguousarray(queries, dtype="float32")
+    ids = np.arange(len(vectors), dtype="int64")
+    k = min(k, len(vectors))
+
+    truth_index = build_index(vectors.shape[1], "flat")
+    truth_index.add_with_ids(vectors, ids)
+    _, truth = truth_index.search(queries, k)
+
+    results = []
+    for index_type in index_types:
+        index = build_index(vectors.shape[1], index_type, train=vectors, **params)
+        index.add_with_ids(vectors, ids)
+
+        started = time.perf_counter()
+        _, found = index.search(queries, k)
+        elapsed = time.perf_counter() - started
+
+        hits = [len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth)]
+        results.append({
+            "requested": index_type,
+            "index_type": index_type_of(index),
+            "recall_at_k": round(float(np.mean(hits)) / k, 4) if k else 0.0,
+            "ms_per_query": round(elapsed * 1000 / max(1, len(queries)), 4),
+            "index_bytes": int(len(faiss.serialize_index(index)))
+        })
+    return results
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store():
+    """Singleton process-wide."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResumeVectorStore()
+        return _store
@@ -1,81 +1,341 @@
 # extractor.py
-import io
 import os
+import re
+import time
+import threading
 import numpy as np
-from PIL import Image
 import fitz  # pymupdf
-import easyocr
-from sentence_transformers import SentenceTransformer
 
-reader = easyocr.Reader(['id', 'en'], gpu=False)
-embed_model = SentenceTransformer("all-MiniLM-L6-v2")
+# Model berat (EasyOCR & SentenceTransformer) dimuat lazy, sekali per process.
+# OCR reader hanya dibuat jika benar-benar ada halaman tanpa teks.
+_reader = None
+_embed_model = None
+_reader_lock = threading.Lock()
+_embed_lock = threading.Lock()
 
+# Metric: lama waktu load tiap model (detik)
+MODEL_LOAD_SECONDS = {}
 
-def extract_text_from_pdf(pdf_path):
+
+def get_ocr_reader():
+    """Singleton thread-safe untuk easyocr.Reader."""
+    global _reader
+    if _reader is None:
+        with _reader_lock:
+            if _reader is None:
+                start = time.perf_counter()
+                import easyocr
+                _reader = easyocr.Reader(['id', 'en'], gpu=False)
+                MODEL_LOAD_SECONDS["ocr_reader"] = round(time.perf_counter() - start, 3)
+    return _reader
+
+
+def get_embed_model():
+    """Singleton thread-safe untuk SentenceTransformer."""
+    global _embed_model
+    if _embed_model is None:
+        with _embed_lock:
+            if _embed_model is None:
+                start = time.perf_counter()
+                from sentence_transformers import SentenceTransformer
+                _embed_model = SentenceTransformer("all-MiniLM-L6-v2")
+                MODEL_LOAD_SECONDS["embed_model"] = round(time.perf_counter() - start, 3)
+    return _embed_model
+
+
+def warm_up(ocr=False):
+    """
+    Hook warm-up (dipanggil dari create_app / initializer worker).
+    Default hanya model embedding; OCR ikut dimuat jika ocr=True.
+    """
+    get_embed_model()
+    if ocr:
+        get_ocr_reader()
+
+
+def model_stats():
+    """Status load model untuk endpoint metrics."""
+    return {
+        "embed_model": {
+            "loaded": _embed_model is not None,
+            "load_seconds": MODEL_LOAD_SECONDS.get("embed_model")
+        },
+        "ocr_reader": {
+            "loaded": _reader is not None,
+            "load_seconds": MODEL_LOAD_SECONDS.get("ocr_reader")
+        }
+    }
+
+
+# Konfigurasi ekstraksi PDF
+PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", 1))  # >1 = OCR halaman paralel (process pool)
+PDF_OCR_DPI = int(os.getenv("PDF_OCR_DPI", 72))           # resolusi raster untuk OCR
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 0))        # 0 = semua halaman
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def get_page_pool(workers):
+    """Process pool untuk OCR per halaman (spawn: aman dari thread & state torch)."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing
+            _page_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pool
+
+
+def ocr_page(pdf_path, page_index, dpi=PDF_OCR_DPI):
+    """
+    Raster + OCR satu halaman. Dokumen dibuka di process pemanggil (worker),
+    karena handle PyMuPDF tidak bisa dikirim antar process.
+    """
+    try:
+        with fitz.open(pdf_path) as doc:
+            pix = doc[page_index].get_pixmap(dpi=dpi, alpha=False)  # hindari RGBA error
+
+        img_np = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+        ocr_result = get_ocr_reader().readtext(img_np, detail=0)
+        return "\n".join(ocr_result)
+
+    except Exception as e:
+        return f"[Gagal OCR halaman {page_index + 1}: {e}]"
+
+
+def extract_text_from_pdf(pdf_path, workers=None, ocr_dpi=None, max_pages=None):
     """
     Ekstrak teks dari PDF.
     Jika halaman tidak memiliki teks, lakukan OCR.
+
+    Hanya halaman tanpa teks yang di-raster; jika workers > 1 dan ada lebih dari
+    satu halaman OCR, halaman-halaman itu diproses paralel di process pool.
     """
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"File tidak ditemukan: {pdf_path}")
 
-    text = ""
+    workers = PDF_PAGE_WORKERS if workers is None else workers
+    ocr_dpi = ocr_dpi or PDF_OCR_DPI
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
 
+    # Ekstraksi teks langsung (cepat), catat halaman yang perlu OCR
+    pages = []
+    ocr_pages = []
     with fitz.open(pdf_path) as doc:
-        for page_num, page in enumerate(doc, start=1):
+        n_pages = min(len(doc), max_pages) if max_pages else len(doc)
+        for i in range(n_pages):
+            page_text = doc[i].get_text("text").strip()
+            pages.append(page_text)
+            if not page_text:
+                ocr_pages.append(i)
 
-            # Ekstraksi teks langsung
-            page_text = page.get_text("text").strip()
+    # OCR fallback
+    if ocr_pages:
+        if workers > 1 and len(ocr_pages) > 1:
+            n = len(ocr_pages)
+            ocr_texts = get_page_pool(workers).map(ocr_page, [pdf_path] * n, ocr_pages, [ocr_dpi] * n)
+        else:
+            ocr_texts = (ocr_page(pdf_path, i, ocr_dpi) for i in ocr_pages)
+
+        for i, ocr_text in zip(ocr_pages, ocr_texts):
+            pages[i] = ocr_text
+
+    ocr_set = set(ocr_pages)
+    parts = [
+        f"--- Halaman {i + 1}{' (OCR)' if i in ocr_set else ''} ---\n{page_text}"
+        for i, page_text in enumerate(pages)
+    ]
+    return "\n".join(parts).strip()
 
-            if page_text:
-                text += f"\n--- Halaman {page_num} ---\n{page_text}"
-            else:
-                # OCR fallback
-                try:
-                    pix = page.get_pixmap(alpha=False)  # hindari RGBA error
-                    img_bytes = pix.tobytes("png")
-                    img = Image.open(io.BytesIO(img_bytes))
 
-                    img_np = np.array(img)
-                    ocr_result = reader.readtext(img_np, detail=0)
+# ======================================================
+# CHUNKING BERBASIS STRUKTUR CV
+# ======================================================
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", 200))  # MiniLM memotong input > 256 token
+CHUNK_MIN_TOKENS = 40        # section baru memulai chunk baru jika chunk berjalan sudah >= ini
+CHUNK_DEDUP_JACCARD = 0.9    # ambang kemiripan chunk yang dianggap duplikat
 
-                    ocr_text = "\n".join(ocr_result)
+PAGE_RE = re.compile(r"^--- Halaman (\d+)(?: \(OCR\))? ---$", re.MULTILINE)
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|\n(?=\s*[•●▪\-\*–]\s)|\n{2,}")
 
-                except Exception as e:
-                    ocr_text = f"[Gagal OCR halaman {page_num}: {e}]"
+# Kata kunci judul section CV (ID/EN); judul boleh berupa frasa pendek yang
+# diawali / diakhiri kata ini, mis. "Ringkasan Profesional", "Riwayat Pendidikan"
+SECTION_KEYWORDS = {
+    "pendidikan", "education", "pengalaman", "experience", "keahlian", "skills", "skill",
+    "kemampuan", "ringkasan", "summary", "profil", "profile", "sertifikasi", "sertifikat",
+    "certifications", "certificates", "bahasa", "languages", "organisasi", "organization",
+    "organizations", "proyek", "projects", "portofolio", "portfolio", "prestasi",
+    "achievements", "awards", "pelatihan", "training", "courses", "kontak", "contact",
+    "referensi", "references", "publikasi", "publications", "hobi", "interests", "volunteer"
+}
+SECTION_PHRASES = {"about me", "tentang saya", "data pribadi", "personal information", "work history"}
 
-                text += f"\n--- Halaman {page_num} (OCR) ---\n{ocr_text}"
 
-    return text.strip()
+def count_tokens(text):
+    """Perkiraan jumlah token (kata + tanda baca), cukup untuk budget chunk."""
+    return len(TOKEN_RE.findall(text))
 
 
-def chunk_text(text, chunk_size=500, overlap=50):
+def is_section_heading(line):
+    heading = line.strip().rstrip(":").strip()
+    if not heading or len(heading) > 40 or any(c.isdigit() for c in heading):
+        return False
+
+    words = heading.lower().split()
+    if len(words) <= 4 and (words[0] in SECTION_KEYWORDS or words[-1] in SECTION_KEYWORDS
+                            or " ".join(words) in SECTION_PHRASES):
+        return True
+
+    # Judul huruf kapital semua, pendek (mis. "PENGALAMAN ORGANISASI")
+    return heading.isupper() and len(words) <= 4 and sum(c.isalpha() for c in heading) >= 3
+
+
+def split_pages(text):
+    """Return list (page_num, page_text) berdasarkan penanda '--- Halaman N ---'."""
+    markers = list(PAGE_RE.finditer(text or ""))
+    if not markers:
+        return [(1, text or "")]
+
+    pages = []
+    for i, m in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        pages.append((int(m.group(1)), text[m.end():end]))
+    return pages
+
+
+def _split_long(unit, max_tokens):
+    """Unit yang melebihi budget dipotong per kata."""
+    words = unit.split()
+    step = max(1, max_tokens // 2)
+    pieces, current = [], []
+    for w in words:
+        current.append(w)
+        if count_tokens(" ".join(current)) >= max_tokens - step // 4:
+            pieces.append(" ".join(current))
+            current = []
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def iter_units(text):
     """
-    Membagi teks menjadi potongan kecil untuk RAG.
+    Pecah teks CV menjadi unit (page, section, kalimat/bullet).
+    Judul section menjadi penanda section, bukan unit.
+    """
+    section = None  # section bisa berlanjut ke halaman berikutnya
+    for page_num, page_text in split_pages(text):
+        block = []
+
+        def flush():
+            joined = "\n".join(block).strip()
+            block.clear()
+            for unit in SENTENCE_SPLIT_RE.split(joined):
+                unit = " ".join(unit.split())
+                if unit:
+                    yield page_num, section, unit
+
+        for line in page_text.splitlines():
+            if is_section_heading(line):
+                yield from flush()
+                section = line.strip().rstrip(":").strip()
+            else:
+                block.append(line)
+        yield from flush()
+
+
+def _shingles(text, n=3):
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < n:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+
+def dedup_chunks(chunks, threshold=CHUNK_DEDUP_JACCARD):
+    """Buang chunk yang (hampir) identik dengan chunk sebelumnya (Jaccard shingle kata)."""
+    kept, kept_shingles = [], []
+    for chunk in chunks:
+        sh = _shingles(chunk["text"])
+        duplicate = any(
+            len(sh & other) / len(sh | other) >= threshold
+            for other in kept_shingles if sh and other
+        )
+        if not duplicate:
+            kept.append(chunk)
+            kept_shingles.append(sh)
+    return kept
+
+
+def chunk_document(text, max_tokens=CHUNK_MAX_TOKENS, min_tokens=CHUNK_MIN_TOKENS):
+    """
+    Chunking sadar struktur untuk RAG:
+    halaman -> section CV -> kalimat/bullet, digabung sampai budget token.
+    Return list of dict {"text", "page", "page_end", "section"} (sudah dideduplikasi).
     """
     if not text or len(text.strip()) == 0:
         return []
 
     chunks = []
-    L = len(text)
-    start = 0
+    current, current_tokens = [], 0
+    meta = {}
+
+    def emit():
+        if current:
+            body = " ".join(current)
+            # Section dicantumkan agar chunk lanjutan tetap punya konteks
+            chunk_text = f"{meta['section']}: {body}" if meta["section"] else body
+            chunks.append({
+                "text": chunk_text,
+                "page": meta["page"],
+                "page_end": meta["page_end"],
+                "section": meta["section"]
+            })
+
+    seen_units = set()
+    for page_num, section, unit in iter_units(text):
+        # Kalimat panjang yang berulang (header/footer, halaman ganda hasil OCR) cukup sekali
+        key = " ".join(re.findall(r"\w+", unit.lower()))
+        if len(key.split()) >= 4:
+            if key in seen_units:
+                continue
+            seen_units.add(key)
 
-    while start < L:
-        end = start + chunk_size
-        chunk = text[start:end].strip()
+        pieces = [unit] if count_tokens(unit) <= max_tokens else _split_long(unit, max_tokens)
 
-        if chunk:
-            chunks.append(chunk)
+        for piece in pieces:
+            n = count_tokens(piece)
+            new_section = current and section != meta["section"] and current_tokens >= min_tokens
+            if current and (current_tokens + n > max_tokens or new_section):
+                emit()
+                current, current_tokens = [], 0
 
-        start += chunk_size - overlap
+            if not current:
+                meta = {"page": page_num, "page_end": page_num, "section": section, "last": section}
+            elif section != meta["last"]:
+                # Section pendek digabung: tandai awal section di dalam teks
+                piece = f"{section}: {piece}" if section else piece
+                meta["last"] = section
+
+            current.append(piece)
+            current_tokens += n
+            meta["page_end"] = page_num
+
+    emit()
+    return dedup_chunks(chunks)
 
-    return chunks
 
 def embed_chunks(chunks):
     """
     Embedding untuk list of chunks.
     Mengembalikan numpy array shape (n_chunks, dim).
     """
+    embed_model = get_embed_model()
+
     if not chunks:
         return np.zeros((0, embed_model.get_sentence_embedding_dimension()), dtype="float32")
 
@@ -92,7 +352,7 @@ def embed_query(text):
     """
     Embedding untuk query pencarian FAISS.
     """
-    emb = embed_model.encode(
+    emb = get_embed_model().encode(
         [text],
         convert_to_numpy=True,
         normalize_embeddings=True  # normalisasi otomatis
@@ -45,6 +45,15 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Index trigram (GIN gin_trgm_ops) untuk ILIKE '%x%' -> nama index: (tabel, kolom).
+# Tidak dideklarasikan di model (butuh extension pg_trgm); dibuat di migration 7aecc0e3a397.
+TRGM_INDEXES = {
+    "ix_candidates_name_trgm": ("candidates", "name"),
+    "ix_candidates_email_trgm": ("candidates", "email"),
+    "ix_candidates_city_trgm": ("candidates", "city"),
+}
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -90,9 +99,15 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # index trigram dibuat manual di migration (butuh pg_trgm), jangan di-drop autogenerate
+    def include_object(object, name, type_, reflected, compare_to):
+        return not (type_ == "index" and name in TRGM_INDEXES)
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
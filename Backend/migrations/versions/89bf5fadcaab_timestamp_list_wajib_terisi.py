@@ -0,0 +1,47 @@
+"""timestamp list wajib terisi
+
+Revision ID: 89bf5fadcaab
+Revises: 9f100a7b4044
+Create Date: 2026-10-18 03:26:31.344675
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '89bf5fadcaab'
+down_revision = '9f100a7b4044'
+branch_labels = None
+depends_on = None
+
+
+# Kolom yang dipakai sebagai key keyset pagination (lihat app/utils/pagination.py):
+# NULL membuat cursor tidak pernah cocok lagi sehingga halaman berikutnya hilang.
+TIMESTAMP_COLUMNS = (
+    ('ata_requests', 'created_at'),
+    ('candidates', 'created_at'),
+    ('job_positions', 'created_at'),
+    ('test_links', 'created_at'),
+    ('test_submissions', 'submitted_at'),
+)
+
+
+def upgrade():
+    for table, column in TIMESTAMP_COLUMNS:
+        # Waktu tidak diketahui -> dianggap paling lama (urutan terakhir di list terbaru-dulu)
+        op.execute(f"UPDATE {table} SET {column} = TIMESTAMP '1970-01-01' WHERE {column} IS NULL")
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column,
+                   existing_type=postgresql.TIMESTAMP(),
+                   nullable=False,
+                   server_default=sa.text('now()'))
+
+
+def downgrade():
+    for table, column in reversed(TIMESTAMP_COLUMNS):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column,
+                   existing_type=postgresql.TIMESTAMP(),
+                   nullable=True,
+                   server_default=None)
@@ -0,0 +1,64 @@
+import pytest
+from app import db
+from app.models import PapiQuestion
+from app.utils.bulk_seed import (
+    SeedValidationError, collect_columns, int_column, str_column, unique_column, raise_if_invalid, bulk_insert
+)
+
+# =========================
+# TEST VALIDASI SEED (PER KOLOM)
+# =========================
+
+def test_columns_are_validated_and_converted():
+    rows = [{"rs": 0, "class": "Rendah"}, {"rs": "12", "class": "Sedang"}, {"rs": " -3 "}, {"rs": "1.5", "class": "x"}]
+    columns = collect_columns(iter(rows), ["rs", "class"])
+    errors = []
+
+    values, missing = int_column(columns["rs"], "rs", errors, min_value=0)
+    _, class_missing = str_column(columns["class"], "class", errors)
+
+    assert values[:3].tolist() == [0, 12, -3]
+    assert not missing.any() and class_missing.tolist() == [False, False, True, False]
+    assert errors == [
+        "baris 4: 'rs' harus bilangan bulat",
+        "baris 3: 'rs' minimal 0",
+        "baris 3: 'class' wajib diisi",
+    ]
+
+
+def test_duplicates_and_non_object_rows_are_rejected():
+    errors = []
+    unique_column(int_column([1, 2, 1], "q", errors)[0], "q", errors)
+    with pytest.raises(SeedValidationError) as exc:
+        raise_if_invalid(errors)
+    assert exc.value.errors == ["baris 1: 'q' duplikat", "baris 3: 'q' duplikat"]
+
+    with pytest.raises(SeedValidationError):
+        collect_columns(iter([{"q": 1}, ["bukan", "object"]]), ["q"])
+
+
+def test_non_ascii_digits_are_validation_errors():
+    errors = []
+    values, _ = int_column(["²", "٣", "-", "7", "--1"], "q", errors)
+
+    assert values[3] == 7
+    assert errors == [f"baris {i}: 'q' harus bilangan bulat" for i in (1, 2, 3, 5)]
+
+# =========================
+# TEST BULK INSERT
+# =========================
+
+def test_bulk_insert_skips_existing_rows(app):
+    ids = [990001, 990002, 990003]
+    try:
+        bulk_insert(PapiQuestion, [{"id": ids[0], "statement_a": "lama", "statement_b": "lama"}])
+        bulk_insert(PapiQuestion, [{"id": i, "statement_a": "baru", "statement_b": "baru"} for i in ids],
+                    conflict_columns=["id"], batch_size=2)
+        db.session.commit()
+
+        rows = dict(db.session.query(PapiQuestion.id, PapiQuestion.statement_a).filter(PapiQuestion.id.in_(ids)))
+        assert rows == {ids[0]: "lama", ids[1]: "baru", ids[2]: "baru"}
+    finally:
+        db.session.rollback()
+        PapiQuestion.query.filter(PapiQuestion.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Candidate, JobApplication, JobPosition, Resume, TestLink
+from app.routes.candidates import candidate_to_dict
+from app.utils.serialization import with_load_options
+
+N_CANDIDATES = 6
+
+
+@pytest.fixture
+def candidates(app):
+    jobs = [
+        JobPosition(id=f"SER-JOB-{j}", title=f"Posisi {j}", department="IT", level="Mid", location="Jakarta",
+                    employment_type="Fulltime", job_description="desc")
+        for j in range(3)
+    ]
+    db.session.add_all(jobs)
+    for i in range(N_CANDIDATES):
+        db.session.add(Resume(id=f"SER-RES-{i}", filename=f"cv{i}.pdf", status="done"))
+        db.session.add(Candidate(id=f"SER-CAND-{i}", resume_id=f"SER-RES-{i}", name=f"Kandidat {i}"))
+        # kandidat 0 belum melamar; sisanya melamar i % 3 + 1 job dengan skor berbeda
+        for j in range(i % 3 + 1 if i else 0):
+            db.session.add(JobApplication(id=f"SER-APP-{i}-{j}", candidate_id=f"SER-CAND-{i}",
+                                          job_id=f"SER-JOB-{j}", match_score=(i * 37 + j * 53) % 100))
+        if i % 2:
+            db.session.add(TestLink(candidate_id=f"SER-CAND-{i}", token=f"SER-TOKEN-{i}", status="active"))
+    db.session.commit()
+    db.session.expunge_all()
+
+    yield
+
+    TestLink.query.filter(TestLink.token.like("SER-TOKEN-%")).delete(synchronize_session=False)
+    JobApplication.query.filter(JobApplication.id.like("SER-APP-%")).delete(synchronize_session=False)
+    Candidate.query.filter(Candidate.id.like("SER-CAND-%")).delete(synchronize_session=False)
+    Resume.query.filter(Resume.id.like("SER-RES-%")).delete(synchronize_session=False)
+    JobPosition.query.filter(JobPosition.id.like("SER-JOB-%")).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def count_queries(fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+# =========================
+# TEST SERIALIZER KANDIDAT (EAGER LOAD)
+# =========================
+
+def test_best_application_matches_python(candidates):
+    query = with_load_options(Candidate.query, candidate_to_dict).filter(Candidate.id.like("SER-CAND-%"))
+    for data in map(candidate_to_dict, query.all()):
+        apps = data["applications"]
+        if not apps:
+            assert (data["match_score"], data["top_position"], data["status"]) == (0, "-", "New Candidate")
+            continue
+        best = max(apps, key=lambda a: a["match_score"] or 0)
+        assert data["match_score"] == best["match_score"]
+        assert data["top_position"] == best["job_title"]
+
+
+def test_query_count_does_not_grow_with_rows(candidates):
+    def serialize_all():
+        db.session.expunge_all()
+        query = with_load_options(Candidate.query, candidate_to_dict).filter(Candidate.id.like("SER-CAND-%"))
+        return [candidate_to_dict(c) for c in query.all()]
+
+    data, n_queries = count_queries(serialize_all)
+
+    assert len(data) == N_CANDIDATES
+    assert n_queries <= 3  # kandidat + test_link, applications + job, best_application + job
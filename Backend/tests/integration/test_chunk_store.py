@@ -0,0 +1,69 @@
+import os
+import json
+from app.utils.chunk_store import ChunkStore
+
+CHUNKS_A = [{"text": "Pengalaman: Backend Developer", "page": 1}, {"text": "Skills: Python, Flask ✓", "page": 2}]
+CHUNKS_B = [{"text": "Pendidikan: S1 Informatika", "page": 1}]
+
+# =========================
+# TEST TULIS & BACA
+# =========================
+
+def test_random_access_and_reload(tmp_path):
+    store = ChunkStore(str(tmp_path / "chunks.bin"))
+    store.add_many([("a", CHUNKS_A), ("b", CHUNKS_B)])
+
+    assert store.get("a", 1) == CHUNKS_A[1]
+    assert store.get_chunks("b") == CHUNKS_B
+
+    # Instance lain (mis. worker lain) membaca dari disk
+    other = ChunkStore(str(tmp_path / "chunks.bin"))
+    assert other.get("a", 0) == CHUNKS_A[0]
+    assert other.count("a") == 2
+
+
+def test_reload_when_commit_keeps_mtime(tmp_path):
+    path = str(tmp_path / "chunks.bin")
+    reader, writer = ChunkStore(path), ChunkStore(path)
+    writer.add("a", CHUNKS_A)
+    assert reader.count("a") == 2
+    stat = os.stat(reader.map_path)
+
+    # Commit process lain dalam tick mtime yang sama
+    writer.add("b", CHUNKS_B)
+    os.utime(reader.map_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert reader.get_chunks("b") == CHUNKS_B
+
+
+def test_replace_resume_then_compact(tmp_path):
+    store = ChunkStore(str(tmp_path / "chunks.bin"))
+    store.add("a", CHUNKS_A)
+    store.add("b", CHUNKS_B)
+    store.add("a", ["chunk lama (string)"])
+
+    assert store.get_chunks("a") == ["chunk lama (string)"]
+    assert store.stats()["garbage_chunks"] == 2
+
+    store.compact()
+    assert store.stats()["garbage_chunks"] == 0
+    assert store.get_chunks("a") == ["chunk lama (string)"]
+    assert store.get_chunks("b") == CHUNKS_B
+
+
+def test_uncommitted_append_is_discarded(tmp_path):
+    path = str(tmp_path / "chunks.bin")
+    store = ChunkStore(path)
+    store.add("a", CHUNKS_A)
+
+    # Simulasi process mati setelah menulis blob tapi sebelum commit map
+    with open(path, "ab") as fh:
+        fh.write(b'{"text": "setengah')
+
+    store = ChunkStore(path)
+    store.add("b", CHUNKS_B)
+
+    assert store.get_chunks("a") == CHUNKS_A
+    assert store.get_chunks("b") == CHUNKS_B
+    expected = sum(len(json.dumps(c, ensure_ascii=False).encode("utf-8")) for c in CHUNKS_A + CHUNKS_B)
+    assert os.path.getsize(path) == expected
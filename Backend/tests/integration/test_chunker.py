@@ -0,0 +1,71 @@
+from extractor import chunk_document, count_tokens, dedup_chunks
+
+CV_TEXT = """--- Halaman 1 ---
+Budi Santoso
+RINGKASAN
+Backend engineer dengan 5 tahun pengalaman membangun API. Suka Python dan Flask.
+Pengalaman Kerja
+PT Maju Jaya - Backend Developer (2019-2023)
+• Membangun layanan REST dengan Flask dan PostgreSQL.
+• Mengoptimalkan query hingga 3x lebih cepat.
+--- Halaman 2 (OCR) ---
+• Membangun layanan REST dengan Flask dan PostgreSQL.
+Skills
+Python, Flask, Docker, PostgreSQL, Redis
+"""
+
+# =========================
+# TEST CHUNK STRUKTUR CV
+# =========================
+
+def test_chunks_respect_token_budget_and_sentences():
+    chunks = chunk_document(CV_TEXT, max_tokens=30, min_tokens=5)
+
+    assert all(count_tokens(c["text"]) <= 30 + 5 for c in chunks)  # + label section
+    # Kalimat tidak terpotong di tengah
+    assert any(c["text"].endswith("membangun API.") for c in chunks)
+
+
+def test_chunks_keep_page_and_section_metadata():
+    chunks = chunk_document(CV_TEXT, max_tokens=30, min_tokens=5)
+
+    skills = [c for c in chunks if c["section"] == "Skills"]
+    assert skills and skills[0]["page"] == 2
+    assert skills[0]["text"].startswith("Skills: Python")
+    assert chunks[0]["page"] == 1
+
+
+def test_repeated_sentences_are_embedded_once():
+    chunks = chunk_document(CV_TEXT)
+    joined = " ".join(c["text"] for c in chunks)
+
+    assert joined.count("Membangun layanan REST") == 1
+
+
+def test_near_duplicate_chunks_are_dropped():
+    chunks = [
+        {"text": "Python Flask Docker PostgreSQL Redis Kafka Celery Nginx Linux Git"},
+        {"text": "Python Flask Docker PostgreSQL Redis Kafka Celery Nginx Linux Git."},
+        {"text": "S1 Teknik Informatika Universitas Indonesia 2018"},
+    ]
+
+    assert [c["text"] for c in dedup_chunks(chunks)] == [chunks[0]["text"], chunks[2]["text"]]
+
+
+def test_empty_text_returns_no_chunks():
+    assert chunk_document("") == []
+    assert chunk_document("--- Halaman 1 ---\n   ") == []
+
+
+def test_profile_context_keeps_every_section_of_long_cv():
+    from app.routes.screening import resume_profile_context
+
+    projects = "\n".join(f"• Proyek {i}: membangun modul laporan keuangan nomor {i} untuk klien korporat."
+                         for i in range(200))
+    long_cv = CV_TEXT.replace("Skills\n", f"Proyek\n{projects}\nSkills\n")
+
+    context = resume_profile_context({"id": "belum-di-chunk-store", "raw_text": long_cv}, max_chars=1500)
+
+    assert len(context) <= 1500
+    assert "Skills: Python" in context and "PT Maju Jaya" in context
+    assert context.index("PT Maju Jaya") < context.index("Skills: Python")  # urutan dokumen
@@ -0,0 +1,44 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+from app.utils.embedding_cache import JobEmbeddingCache, job_stamp
+
+
+def job(job_id, updated_at=datetime(2024, 1, 1)):
+    return SimpleNamespace(id=job_id, updated_at=updated_at)
+
+
+def embed(text):
+    return np.full((1, 4), len(text), dtype="float32")
+
+# =========================
+# TEST CACHE EMBEDDING JOB
+# =========================
+
+def test_workers_merge_entries_instead_of_overwriting(tmp_path):
+    path = str(tmp_path / "jobs.npz")
+    worker_a, worker_b = JobEmbeddingCache(path), JobEmbeddingCache(path)
+
+    worker_a.get(job("j1"), "python", embed)
+    worker_b.get(job("j2"), "golang dev", embed)
+
+    fresh = JobEmbeddingCache(path)
+    calls = []
+    fresh.get(job("j1"), "python", lambda t: calls.append(t) or embed(t))
+    fresh.get(job("j2"), "golang dev", lambda t: calls.append(t) or embed(t))
+    assert calls == [] and fresh.stats()["entries"] == 2
+
+
+def test_changed_jobs_are_replaced_and_deleted_jobs_discarded(tmp_path):
+    path = str(tmp_path / "jobs.npz")
+    cache, other_worker = JobEmbeddingCache(path), JobEmbeddingCache(path)
+    cache.get(job("j1"), "python", embed)
+    cache.get(job("j2"), "golang", embed)
+
+    cache.get(job("j2", datetime(2024, 2, 1)), "golang senior", embed)  # job diubah -> entry ditimpa
+    other_worker.discard(["j1"])                                         # job dihapus
+
+    entries = JobEmbeddingCache(path)._read_disk()
+    assert set(entries) == {"j2"}
+    assert entries["j2"][1] == job_stamp(datetime(2024, 2, 1))
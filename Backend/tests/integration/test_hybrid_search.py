@@ -0,0 +1,78 @@
+from app import db
+from app.models import Candidate, Resume
+from app.utils.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+DOCS = {
+    "r1": ("Backend developer. Python, Flask, PostgreSQL. Membangun REST API.", ["Python", "Flask"]),
+    "r2": ("Frontend engineer React dan Node.js, sedikit Python untuk scripting.", ["React", "Node.js"]),
+    "r3": ("Akuntan dengan pengalaman audit dan pajak.", []),
+}
+
+
+def make_index(docs=DOCS):
+    index = LexicalIndex()
+    index.build(
+        ((rid, (text, tuple(skills)), skills) for rid, (text, skills) in docs.items()),
+        lambda ids: {rid: docs[rid][0] for rid in ids}
+    )
+    return index
+
+# =========================
+# TEST BM25 & FUSION
+# =========================
+
+def test_tokenizer_keeps_tech_terms():
+    assert tokenize("C++, C#, Node.js & R; ASP.NET.") == ["c++", "c#", "node.js", "r", "asp.net"]
+
+
+def test_bm25_ranks_skill_matches_first():
+    results = make_index().search("python flask", top_k=10)
+
+    assert [rid for rid, _, _ in results] == ["r1", "r2"]
+    assert results[0][2] == ["python", "flask"]
+    assert make_index().search("golang") == []
+
+
+def test_build_only_reloads_changed_documents():
+    index = make_index()
+    loaded = []
+    docs = dict(DOCS, r3=("Akuntan yang belajar Python.", []))
+
+    index.build(
+        ((rid, (text, tuple(skills)), skills) for rid, (text, skills) in docs.items()),
+        lambda ids: loaded.extend(ids) or {rid: docs[rid][0] for rid in ids}
+    )
+
+    assert loaded == ["r3"]
+    assert "r3" in [rid for rid, _, _ in index.search("python")]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "d"]], k=60)
+
+    assert [doc for doc, _ in fused][:2] == ["b", "c"]
+    assert fused[0][1] == 1 / 62 + 1 / 61
+
+
+def test_skill_edit_is_seen_by_other_workers(app):
+    db.session.add(Resume(id="LEX-RES", filename="cv.pdf", status="done", raw_text="Akuntan senior."))
+    candidate = Candidate(resume_id="LEX-RES", name="Kandidat Lexical", skills=["Excel"])
+    db.session.add(candidate)
+    db.session.commit()
+    try:
+        other_worker = LexicalIndex(sync_interval=0)
+        throttled = LexicalIndex(sync_interval=3600)
+        other_worker.sync()
+        throttled.sync()
+        assert "LEX-RES" not in [rid for rid, _, _ in other_worker.search("golang")]
+
+        candidate.skills = ["Excel", "Golang"]
+        db.session.commit()
+
+        assert other_worker.sync() is True
+        assert throttled.sync() is False  # versi baru dicek lagi setelah sync_interval
+        assert "LEX-RES" in [rid for rid, _, _ in other_worker.search("golang")]
+    finally:
+        db.session.delete(candidate)
+        Resume.query.filter_by(id="LEX-RES").delete()
+        db.session.commit()
@@ -0,0 +1,98 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import select, literal
+from sqlalchemy.dialects.postgresql import JSONB
+from app import db
+from app.models import Candidate, JobApplication, JobPosition, LeaderboardEntry, Resume, TestLink, TestSubmission
+from app.utils.leaderboard import (
+    calculate_cfit_score, calculate_kraepelin_score, cfit_score_sql, kraepelin_score_sql,
+    ensure_leaderboard, refresh_leaderboard
+)
+
+CFIT_SCORES = [None, {}, {"iq": 145}, {"iq": 130}, {"iq": 119}, {"iq": 100}, {"iq": 95}, {"iq": 70}, {"raw_score": 3}]
+KRAEPELIN_SCORES = [
+    None, {},
+    {"gradeSpeed": "Baik Sekali", "gradeAccuracy": "Baik", "gradeStability": "Sedang"},
+    {"gradeSpeed": "Kurang", "gradeAccuracy": "Kurang Sekali"},
+    {"panker": 12.5},
+]
+
+
+@pytest.fixture
+def pg(app):
+    if db.engine.dialect.name != "postgresql":
+        pytest.skip("ekspresi skor leaderboard butuh PostgreSQL")
+
+
+@pytest.fixture
+def tested_application(pg):
+    db.session.add(Resume(id="LB-RES", filename="cv.pdf", status="done"))
+    db.session.add(Candidate(id="LB-CAND", resume_id="LB-RES", name="Kandidat Leaderboard"))
+    db.session.add(JobPosition(id="LB-JOB", title="Analyst", department="IT", level="Staff",
+                               location="Jakarta", employment_type="Fulltime", job_description="Analisis data"))
+    db.session.add(JobApplication(id="LB-APP", candidate_id="LB-CAND", job_id="LB-JOB", match_score=50))
+    link = TestLink(candidate_id="LB-CAND", token="LB-TOKEN")
+    db.session.add(link)
+    db.session.flush()
+    submission = TestSubmission(link_id=link.id, test_type="cfit", scores={"iq": 130})
+    db.session.add(submission)
+    db.session.commit()
+    refresh_leaderboard(["LB-CAND"])
+
+    yield "LB-APP"
+
+    db.session.rollback()
+    TestSubmission.query.filter_by(id=submission.id).delete()
+    TestLink.query.filter_by(candidate_id="LB-CAND").delete()
+    JobApplication.query.filter_by(id="LB-APP").delete()
+    JobPosition.query.filter_by(id="LB-JOB").delete()
+    Candidate.query.filter_by(id="LB-CAND").delete()
+    Resume.query.filter_by(id="LB-RES").delete()
+    db.session.commit()
+
+
+def leaderboard_entry(application_id):
+    db.session.expire_all()
+    return db.session.get(LeaderboardEntry, application_id)
+
+
+def evaluate(expr_fn, scores):
+    value = literal(scores, JSONB) if scores is not None else literal(None, JSONB)
+    return float(db.session.execute(select(expr_fn(value))).scalar())
+
+# =========================
+# TEST SKOR LEADERBOARD SQL = PYTHON
+# =========================
+
+@pytest.mark.parametrize("scores", CFIT_SCORES)
+def test_cfit_sql_matches_python(pg, scores):
+    assert evaluate(cfit_score_sql, scores) == calculate_cfit_score(scores)
+
+
+@pytest.mark.parametrize("scores", KRAEPELIN_SCORES)
+def test_kraepelin_sql_matches_python(pg, scores):
+    assert evaluate(kraepelin_score_sql, scores) == pytest.approx(calculate_kraepelin_score(scores))
+
+# =========================
+# TEST SINKRON TABEL LEADERBOARD
+# =========================
+
+def test_missing_entries_are_backfilled(tested_application):
+    LeaderboardEntry.query.filter_by(application_id=tested_application).delete()
+    db.session.commit()
+
+    ensure_leaderboard()  # tabel tidak kosong, tapi entry aplikasi ini hilang
+
+    assert leaderboard_entry(tested_application).cfit_score == 100
+
+
+def test_regenerated_link_drops_old_test_scores(client, tested_application):
+    assert leaderboard_entry(tested_application).has_test
+
+    token = create_access_token(identity="1", additional_claims={"role": "SUPER_USER"})
+    res = client.post("/management/generate-link", json={"candidate_id": "LB-CAND"},
+                      headers={"Authorization": f"Bearer {token}"})
+
+    assert res.status_code == 200
+    entry = leaderboard_entry(tested_application)
+    assert not entry.has_test and entry.final_score == 50
@@ -0,0 +1,96 @@
+import time
+import threading
+import pytest
+from app.utils.llm_cache import LLMResponseCache
+
+# =========================
+# TEST CACHE HIT & EVICTION
+# =========================
+
+def test_same_prompt_hits_cache():
+    cache = LLMResponseCache(maxsize=10, ttl=60)
+    calls = []
+
+    key = cache.make_key("model-x", [{"role": "user", "content": "CV A"}], temperature=0.1)
+    for _ in range(3):
+        result = cache.get_or_call(key, lambda: calls.append(1) or {"verdict": "ok"})
+
+    assert result == {"verdict": "ok"}
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_key_depends_on_model_and_params():
+    messages = [{"role": "user", "content": "CV A"}]
+    base = LLMResponseCache.make_key("model-x", messages, temperature=0.1)
+
+    assert base != LLMResponseCache.make_key("model-y", messages, temperature=0.1)
+    assert base != LLMResponseCache.make_key("model-x", messages, temperature=0.5)
+
+
+def test_expired_entry_is_refetched():
+    cache = LLMResponseCache(maxsize=10, ttl=0.01)
+    calls = []
+
+    cache.get_or_call("k", lambda: calls.append(1) or "v1")
+    time.sleep(0.02)
+    cache.get_or_call("k", lambda: calls.append(1) or "v2")
+
+    assert len(calls) == 2
+
+
+def test_lru_eviction_respects_maxsize():
+    cache = LLMResponseCache(maxsize=2, ttl=60)
+
+    cache.get_or_call("a", lambda: 1)
+    cache.get_or_call("b", lambda: 2)
+    cache.get_or_call("a", lambda: 1)   # "a" jadi paling baru dipakai
+    cache.get_or_call("c", lambda: 3)   # "b" yang dibuang
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get_or_call("a", lambda: "miss") == 1
+    assert cache.get_or_call("b", lambda: "miss") == "miss"
+
+
+# =========================
+# TEST COALESCING & ERROR
+# =========================
+
+def test_concurrent_identical_calls_share_one_upstream_request():
+    cache = LLMResponseCache(maxsize=10, ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_llm():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"verdict": "shared"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_call("k", slow_llm))) for _ in range(5)]
+    threads[0].start()
+    started.wait(2)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(2)
+
+    assert len(calls) == 1
+    assert results == [{"verdict": "shared"}] * 5
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_errors_are_not_cached():
+    cache = LLMResponseCache(maxsize=10, ttl=60)
+
+    def failing():
+        raise RuntimeError("429 rate limited")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_call("k", failing)
+
+    assert cache.get_or_call("k", lambda: "ok") == "ok"
@@ -0,0 +1,164 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from app.utils.llm_gateway import LLMGateway, TokenBucket, LatencyHistogram
+
+# =========================
+# STUB SERVER (OpenAI-compatible)
+# =========================
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # client yang timeout memutus koneksi -> abaikan BrokenPipe
+
+
+class StubLLM:
+    """Server lokal: n request pertama dibalas 429, lalu jawaban normal setelah `delay` detik."""
+
+    def __init__(self, fail_first=0, delay=0.0):
+        self.fail_first = fail_first
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub.lock:
+                    stub.calls += 1
+                    n = stub.calls
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    if n <= stub.fail_first:
+                        self._reply(429, {"error": {"message": "rate limited"}}, {"Retry-After": "0"})
+                        return
+                    time.sleep(stub.delay)
+                    self._reply(200, {
+                        "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": f"answer {n}"}}]
+                    })
+                finally:
+                    with stub.lock:
+                        stub.active -= 1
+
+            def _reply(self, status, body, headers=None):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = QuietServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_factory():
+    pytest.importorskip("httpx")
+    stubs = []
+
+    def make(**kwargs):
+        stub = StubLLM(**kwargs)
+        stubs.append(stub)
+        return stub
+
+    yield make
+    for stub in stubs:
+        stub.close()
+
+
+def make_gateway(stub, **kwargs):
+    params = dict(base_url=stub.base_url, api_key="test", rate_per_sec=1000, burst=1000,
+                  timeout=5, max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    params.update(kwargs)
+    return LLMGateway(**params)
+
+
+MESSAGES = [{"role": "user", "content": "halo"}]
+
+# =========================
+# TEST RETRY, TIMEOUT, POOL
+# =========================
+
+def test_rate_limited_calls_are_retried_with_backoff(stub_factory):
+    stub = stub_factory(fail_first=2)
+    gateway = make_gateway(stub)
+
+    assert gateway.chat(MESSAGES, model="stub") == "answer 3"
+
+    stats = gateway.stats()
+    assert stats["rate_limited"] == 2
+    assert stats["retries"] == 2
+    assert stats["latency"]["count"] == 3
+
+
+def test_timeout_raises_after_retries(stub_factory):
+    import openai
+    stub = stub_factory(delay=0.5)
+    gateway = make_gateway(stub, timeout=0.1, max_retries=1)
+
+    with pytest.raises(openai.APITimeoutError):
+        gateway.chat(MESSAGES, model="stub")
+
+    assert gateway.stats()["timeouts"] == 2
+
+
+def test_map_runs_concurrently_within_limit(stub_factory):
+    stub = stub_factory(delay=0.2)
+    gateway = make_gateway(stub, max_concurrency=4)
+
+    started = time.monotonic()
+    answers = gateway.map(lambda i: gateway.chat(MESSAGES, model="stub"), range(8))
+    elapsed = time.monotonic() - started
+
+    assert len(answers) == 8
+    assert stub.max_active <= 4
+    assert elapsed < 8 * 0.2
+
+
+# =========================
+# TEST LIMITER & HISTOGRAM
+# =========================
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    assert elapsed >= 4 / 20 * 0.9
+    assert bucket.acquire(timeout=0) is False
+
+
+def test_latency_histogram_quantiles():
+    hist = LatencyHistogram(buckets=(0.1, 1, 10))
+    for seconds in (0.05, 0.05, 0.5, 5):
+        hist.observe(seconds)
+
+    snap = hist.snapshot()
+    assert snap["count"] == 4
+    assert snap["buckets"] == {"0.1": 2, "1": 1, "10": 1, "+Inf": 0}
+    assert snap["p50_le"] == 0.1
+    assert snap["p95_le"] == 10
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+from app import db
+from app.models import ATARequest
+from app.utils import pagination
+
+
+@pytest.fixture
+def ata_requests(app):
+    base = datetime(2026, 1, 1)
+    rows = [
+        ATARequest(id=f"ATA-PAGE-{i}", requester_name="Tester", title=f"Posisi {i}", department="IT",
+                   level="Staff", location="Jakarta", employment_type="Fulltime",
+                   created_at=base + timedelta(days=i % 3))  # created_at kembar -> tie-break id
+        for i in range(5)
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    yield [r.id for r in rows]
+    ATARequest.query.filter(ATARequest.id.like("ATA-PAGE-%")).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def walk(client, limit):
+    items, cursor = [], None
+    while True:
+        url = f"/ata?limit={limit}" + (f"&after={cursor}" if cursor else "")
+        res = client.get(url)
+        assert res.status_code == 200
+        items += res.get_json()
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+
+# =========================
+# TEST KEYSET PAGINATION
+# =========================
+
+def test_pages_match_full_list(client, ata_requests):
+    full = [r["id"] for r in client.get("/ata?limit=all").get_json() if r["id"] in ata_requests]
+    paged = [r["id"] for r in walk(client, 2) if r["id"] in ata_requests]
+
+    assert paged == full
+    assert len(paged) == len(ata_requests)
+
+
+def test_count_and_sparse_fields(client, ata_requests):
+    res = client.get("/ata?limit=1&count=true&fields=id,title")
+
+    assert int(res.headers["X-Total-Count"]) >= len(ata_requests)
+    assert set(res.get_json()[0]) == {"id", "title"}
+    assert "X-Next-Cursor" in res.headers
+
+
+def test_invalid_cursor_is_rejected(client, ata_requests):
+    assert client.get("/ata?after=bukan-cursor").status_code == 400
+
+
+def test_default_limit_is_bounded(client, ata_requests, monkeypatch):
+    monkeypatch.setattr(pagination, "DEFAULT_LIMIT", 2)
+
+    for url in ("/ata", "/ata?limit=0", "/ata?limit=abc"):
+        res = client.get(url)
+        assert len(res.get_json()) == 2
+        assert "X-Next-Cursor" in res.headers
+    assert len(client.get("/ata?limit=all").get_json()) >= len(ata_requests)
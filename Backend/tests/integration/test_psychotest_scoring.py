@@ -0,0 +1,213 @@
+import random
+
+import pytest
+
+from app.utils.psychotest_scoring import (
+    PAPI_ASPECTS, CachedKey, PapiKey, CfitKey, score_kraepelin, score_kraepelin_many
+)
+
+
+def papi_reference(rows, answers):
+    """Algoritma lama submit_papi (scan seluruh mapping per jawaban)."""
+    scores = {key: 0 for key in PAPI_ASPECTS}
+    for idx, ans_index in enumerate(answers):
+        if ans_index is not None:
+            choice_char = 'A' if ans_index == 0 else 'B'
+            mapping = next(((q, c, a) for q, c, a in rows if q == idx + 1 and c == choice_char), None)
+            if mapping:
+                scores[mapping[2]] += 1
+    return scores
+
+
+def cfit_reference(questions, norma, answers):
+    """Algoritma lama submit_cfit (loop per soal + query norma)."""
+    raw_score, details = 0, []
+    for idx, (q_id, _, correct_answer) in enumerate(questions):
+        is_correct = idx < len(answers) and answers[idx] is not None and answers[idx] == correct_answer
+        raw_score += is_correct
+        details.append({"q_id": q_id, "user_ans": answers[idx], "correct": is_correct})
+    match = next((row for row in norma if row[0] == raw_score), None)
+    return {
+        "raw_score": raw_score,
+        "iq": match[1] if match else 0,
+        "classification": match[2] if match else "Unclassified",
+        "detail_breakdown": details
+    }
+
+def kraepelin_reference(answers, grid):
+    """Port calculateKraepelinScore (hr-next/src/utils/kraepelinScoring.ts)."""
+    key = [[(num + col[idx + 1]) % 10 for idx, num in enumerate(col[:-1])] for col in grid]
+    total_correct, total_errors, column_scores = 0, 0, []
+    for c, col in enumerate(answers):
+        col_correct = 0
+        for r, ans in enumerate(col):
+            if ans is not None:
+                if ans == key[c][r]:
+                    col_correct += 1
+                else:
+                    total_errors += 1
+        total_correct += col_correct
+        column_scores.append(col_correct)
+    panker = total_correct / len(column_scores)
+    janker = sum(abs(s - panker) for s in column_scores) / len(column_scores)
+
+    speed = "Kurang Sekali"
+    if panker > 17.21: speed = "Baik Sekali"
+    elif panker >= 14.973: speed = "Baik"
+    elif panker >= 12.736: speed = "Sedang"
+    elif panker >= 10.5: speed = "Kurang"
+    stability = "Kurang Sekali"
+    if janker < 0.696: stability = "Baik Sekali"
+    elif janker <= 0.908: stability = "Baik"
+    elif janker <= 1.056: stability = "Sedang"
+    elif janker <= 1.779: stability = "Kurang"
+    accuracy = "Kurang Sekali"
+    if total_errors == 0: accuracy = "Baik Sekali"
+    elif total_errors <= 1: accuracy = "Baik"
+    elif total_errors <= 3: accuracy = "Sedang"
+    elif total_errors <= 14: accuracy = "Kurang"
+    return {"panker": round(panker, 2), "janker": round(janker, 2), "totalErrors": total_errors,
+            "gradeSpeed": speed, "gradeStability": stability, "gradeAccuracy": accuracy}
+
+
+def kraepelin_sheet(rng, columns=50, rows=27, answered_rows=20, error_rate=0.02):
+    grid = [[rng.randint(1, 9) for _ in range(rows)] for _ in range(columns)]
+    answers = []
+    for col in grid:
+        # Diisi dari bawah ke atas sampai waktu kolom habis
+        filled = max(0, min(rows - 1, answered_rows + rng.randint(-3, 3)))
+        key = [(col[r] + col[r + 1]) % 10 for r in range(rows - 1)]
+        answers.append([
+            None if r < rows - 1 - filled else (key[r] if rng.random() > error_rate else (key[r] + 1) % 10)
+            for r in range(rows - 1)
+        ])
+    return grid, answers
+
+# =========================
+# TEST SCORING PAPI
+# =========================
+
+def test_papi_key_matches_reference():
+    rng = random.Random(7)
+    rows = []
+    for q in range(1, 91):
+        rows.append((q, 'A', rng.choice(PAPI_ASPECTS)))
+        rows.append((q, 'B', rng.choice(PAPI_ASPECTS)))
+    key = PapiKey(rows)
+
+    for n_answers in (0, 45, 90, 95):  # 95: jawaban melebihi jumlah soal ber-mapping
+        answers = [rng.choice([0, 1, None]) for _ in range(n_answers)]
+        assert key.score(answers) == papi_reference(rows, answers)
+
+
+def test_cached_key_reloads_after_invalidate():
+    loads = []
+    cached = CachedKey(lambda: loads.append(1) or len(loads), ttl=3600)
+
+    assert cached.get() == 1 and cached.get() == 1
+    cached.invalidate()
+    assert cached.get() == 2
+    assert cached.version == 2
+
+# =========================
+# TEST SCORING CFIT
+# =========================
+
+def test_cfit_key_matches_reference():
+    rng = random.Random(11)
+    questions = [(q_id, 1 + (q_id - 1) // 13, rng.randrange(6)) for q_id in range(1, 51)]
+    questions[5] = (6, 1, None)  # soal tanpa kunci
+    norma = [(rs, 60 + rs * 2, f"Kelas {rs // 10}") for rs in range(0, 45)]
+    key = CfitKey(questions, norma)
+
+    for _ in range(20):
+        answers = [rng.choice([0, 1, 2, 3, 4, 5, None]) for _ in questions]
+        answers[0] = questions[0][2]  # minimal satu benar
+        result = key.score(answers)
+        subtest_scores = result.pop("subtest_scores")
+
+        assert result == cfit_reference(questions, norma, answers)
+        assert sum(subtest_scores.values()) == result["raw_score"]
+        assert set(subtest_scores) == {"1", "2", "3", "4"}
+
+
+def test_cfit_short_answers_and_missing_norma():
+    key = CfitKey([(1, 1, 2), (2, 1, 3), (3, 2, 1)], norma=[(0, 70, "Rendah")])
+
+    result = key.score([2])  # jawaban lebih sedikit dari soal
+
+    assert (result["raw_score"], result["iq"], result["classification"]) == (1, 0, "Unclassified")
+    assert result["subtest_scores"] == {"1": 1, "2": 0}
+    assert [d["user_ans"] for d in result["detail_breakdown"]] == [2, None, None]
+
+# =========================
+# TEST SCORING KRAEPELIN
+# =========================
+
+@pytest.mark.parametrize("answered_rows, error_rate", [(26, 0.0), (20, 0.01), (14, 0.05), (8, 0.3)])
+def test_kraepelin_matches_frontend_scoring(answered_rows, error_rate):
+    rng = random.Random(answered_rows)
+    grid, answers = kraepelin_sheet(rng, answered_rows=answered_rows, error_rate=error_rate)
+
+    result = score_kraepelin(grid, answers)
+
+    assert {k: result[k] for k in kraepelin_reference(answers, grid)} == kraepelin_reference(answers, grid)
+    assert result["tianker"] == result["totalErrors"]  # tidak ada slot yang dilompati
+
+
+def test_kraepelin_bulk_matches_single():
+    rng = random.Random(3)
+    sheets = [kraepelin_sheet(rng, columns=c, rows=r) for c, r in [(50, 27), (10, 8), (50, 27)]]
+    raw = [{"grid": g, "answers": a} for g, a in sheets] + [[[1, 2]], {"grid": [[1, 2]], "answers": [[1, 2]]}]
+
+    results = score_kraepelin_many(raw)
+
+    assert results[:3] == [score_kraepelin(g, a) for g, a in sheets]
+    assert results[3:] == [None, None]  # data lama tanpa grid / ukuran tidak cocok
+
+
+def test_kraepelin_rejects_invalid_sheet():
+    with pytest.raises(ValueError):
+        score_kraepelin([[1, 2, 3]], [[3]])
+    with pytest.raises(ValueError):
+        score_kraepelin([[1, 2], [3, 4]], [[3], [17]])
+    with pytest.raises(ValueError):
+        score_kraepelin([[0, 0], [0, 0]], [[0], [0]])  # angka soal harus 1-9
+
+    grid, answers = kraepelin_sheet(random.Random(3), columns=10, rows=8)
+    assert score_kraepelin(grid, answers, shape=(10, 8))
+    with pytest.raises(ValueError):
+        score_kraepelin(grid, answers, shape=(50, 27))
+
+
+def test_kraepelin_is_scored_against_the_server_grid(app, client):
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.models import Candidate, Resume, TestLink, TestSubmission
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1', additional_claims={'role': 'SUPER_USER'})}"}
+    db.session.add(Resume(id="KR-RES", filename="cv.pdf", status="done"))
+    db.session.add(Candidate(id="KR-CAND", resume_id="KR-RES", name="Kandidat Kraepelin"))
+    db.session.add(TestLink(candidate_id="KR-CAND", token="KR-TOKEN"))
+    db.session.commit()
+    try:
+        sheet = client.get("/submission/kraepelin/KR-TOKEN", headers=headers).get_json()
+        assert len(sheet["grid"]) == sheet["columns"] and len(sheet["grid"][0]) == sheet["rows"]
+        assert client.get("/submission/kraepelin/KR-TOKEN", headers=headers).get_json()["grid"] == sheet["grid"]
+
+        # Grid palsu + jawaban yang cocok dengannya tidak menghasilkan skor sempurna
+        forged = [[1] * sheet["rows"] for _ in range(sheet["columns"])]
+        resp = client.post("/submission/kraepelin", headers=headers, json={
+            "token": "KR-TOKEN", "grid": forged, "answers": [[2] * (sheet["rows"] - 1) for _ in forged]
+        })
+        real_key = [[(a + b) % 10 for a, b in zip(col, col[1:])] for col in sheet["grid"]]
+
+        assert resp.status_code == 200
+        assert resp.get_json()["data"] == score_kraepelin(sheet["grid"], [[2] * (sheet["rows"] - 1) for _ in forged])
+        assert resp.get_json()["data"] != score_kraepelin(sheet["grid"], real_key)
+    finally:
+        link = TestLink.query.filter_by(token="KR-TOKEN").first()
+        TestSubmission.query.filter_by(link_id=link.id).delete()
+        db.session.delete(link)
+        Resume.query.filter_by(id="KR-RES").delete()
+        db.session.commit()
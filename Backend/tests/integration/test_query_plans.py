@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from sqlalchemy import text
+from app import db
+
+# Dataset sintetis via generate_series, di dalam transaksi yang di-rollback di akhir test
+SEED_SQL = [
+    """INSERT INTO job_positions (id, title, department, level, location, employment_type,
+                                  priority, status, job_description, created_at)
+       SELECT 'PLAN-JOB-' || g, 'Job ' || g, 'IT', 'Mid', 'Jakarta', 'Fulltime', 'medium',
+              (ARRAY['draft', 'active', 'paused', 'closed'])[1 + g % 4]::job_status_types,
+              'desc', now() - g * interval '1 hour'
+       FROM generate_series(1, 400) g""",
+    """INSERT INTO resumes (id, filename, status)
+       SELECT 'PLAN-RES-' || g, 'cv' || g || '.pdf', 'done' FROM generate_series(1, 20000) g""",
+    """INSERT INTO candidates (id, resume_id, name, email, city, skills, created_at)
+       SELECT 'PLAN-CAND-' || g, 'PLAN-RES-' || g, 'Kandidat ' || md5(g::text), g || '@mail.test',
+              'Kota ' || g % 50,
+              jsonb_build_array((ARRAY['Python', 'Java', 'Go', 'SQL', 'Excel'])[1 + g % 5], 'Skill ' || g % 300),
+              now() - g * interval '1 minute'
+       FROM generate_series(1, 20000) g""",
+    """INSERT INTO job_applications (id, candidate_id, job_id, match_score, status)
+       SELECT 'PLAN-APP-' || g, 'PLAN-CAND-' || (1 + g % 20000), 'PLAN-JOB-' || (1 + (g + g / 20000) % 400),
+              (g * 7919) % 100, 'Applied'
+       FROM generate_series(1, 40000) g""",
+    """INSERT INTO test_links (candidate_id, token, status)
+       SELECT 'PLAN-CAND-' || g, 'PLAN-TOKEN-' || g, 'completed' FROM generate_series(1, 20000) g""",
+    """INSERT INTO test_submissions (link_id, test_type, scores)
+       SELECT l.id, t, '{}'::jsonb
+       FROM test_links l CROSS JOIN unnest(ARRAY['papi', 'cfit', 'kraepelin']) t
+       WHERE l.token LIKE 'PLAN-TOKEN-%'""",
+    """INSERT INTO recruitment_journeys (id, application_id, current_stage)
+       SELECT 'PLAN-JRN-' || g, 'PLAN-APP-' || g, 'CV_SCREENING' FROM generate_series(1, 10000) g""",
+    """INSERT INTO journey_logs (journey_id, new_stage, action, created_at)
+       SELECT 'PLAN-JRN-' || (1 + g % 10000), 'CV Screening', 'seed', now() - g * interval '1 second'
+       FROM generate_series(1, 40000) g""",
+]
+
+# Query panas (bentuknya mengikuti route) -> index yang wajib dipakai
+HOT_QUERIES = [
+    ("SELECT * FROM job_applications WHERE job_id = 'PLAN-JOB-7' ORDER BY match_score DESC LIMIT 20",
+     "ix_job_applications_job_id_match_score"),
+    ("SELECT * FROM job_applications ORDER BY match_score DESC LIMIT 20",
+     "ix_job_applications_match_score"),
+    ("SELECT * FROM test_links WHERE candidate_id = 'PLAN-CAND-42'",
+     "test_links_candidate_id_key"),
+    ("SELECT s.* FROM test_submissions s JOIN test_links l ON l.id = s.link_id "
+     "WHERE l.candidate_id = 'PLAN-CAND-42' AND s.test_type = 'papi'",
+     "ix_test_submissions_link_id_test_type"),
+    ("SELECT * FROM journey_logs WHERE journey_id = 'PLAN-JRN-9' ORDER BY created_at DESC",
+     "ix_journey_logs_journey_id_created_at"),
+    ("SELECT * FROM job_positions WHERE status = 'active' ORDER BY created_at DESC LIMIT 20",
+     "ix_job_positions_status_created_at"),
+    ("SELECT * FROM candidates ORDER BY created_at DESC LIMIT 20",
+     "ix_candidates_created_at"),
+    ("SELECT id FROM candidates WHERE skills @> '[\"Skill 7\"]'::jsonb",
+     "ix_candidates_skills"),
+]
+
+
+def plan_indexes(conn, sql):
+    """Semua nama index yang muncul di rencana eksekusi query."""
+    plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+
+    found, stack = set(), [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            found.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+@pytest.fixture(scope="module")
+def seeded(app):
+    if db.engine.dialect.name != "postgresql":
+        pytest.skip("query plan test butuh PostgreSQL")
+
+    conn = db.engine.connect()
+    trans = conn.begin()
+    for sql in SEED_SQL:
+        conn.execute(text(sql))
+    # Insert ke GIN masuk pending list dulu (dibersihkan autovacuum di produksi)
+    conn.execute(text("SELECT gin_clean_pending_list('ix_candidates_skills')"))
+    for table in ("job_positions", "candidates", "job_applications", "test_links",
+                  "test_submissions", "journey_logs"):
+        conn.execute(text(f"ANALYZE {table}"))
+    yield conn
+    trans.rollback()
+    conn.close()
+
+# =========================
+# TEST QUERY PLAN (REGRESI INDEX)
+# =========================
+
+@pytest.mark.parametrize("sql, index_name", HOT_QUERIES, ids=[name for _, name in HOT_QUERIES])
+def test_hot_queries_use_index(seeded, sql, index_name):
+    assert index_name in plan_indexes(seeded, sql)
+
+
+def test_ilike_search_uses_trigram_index(seeded):
+    exists = seeded.execute(text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = 'ix_candidates_name_trgm'"
+    )).scalar()
+    if not exists:
+        pytest.skip("index trigram tidak ada (pg_trgm tidak tersedia)")
+
+    assert "ix_candidates_name_trgm" in plan_indexes(
+        seeded, "SELECT id FROM candidates WHERE name ILIKE '%a1b2%'"
+    )
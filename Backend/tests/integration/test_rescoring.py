@@ -0,0 +1,73 @@
+import pytest
+from app import db
+from app.models import Candidate, PapiScoringMap, Resume, TestLink, TestSubmission
+from app.utils.psychotest_scoring import PAPI_ASPECTS, papi_key
+from app.utils.rescoring import _diff, rescore_submissions
+
+
+@pytest.fixture
+def papi_submissions(app):
+    if PapiScoringMap.query.count():
+        pytest.skip("papi_scoring_map sudah berisi data")
+
+    db.session.add(Resume(id="RESCORE-RES", filename="cv.pdf", status="done"))
+    db.session.add(Candidate(id="RESCORE-CAND", resume_id="RESCORE-RES", name="Kandidat Rescore"))
+    link = TestLink(candidate_id="RESCORE-CAND", token="RESCORE-TOKEN")
+    db.session.add(link)
+    db.session.flush()
+    db.session.add_all([PapiScoringMap(question_id=q, choice=c, aspect=a)
+                        for q in (1, 2, 3) for c, a in (("A", "G"), ("B", "N"))])
+    stale = dict.fromkeys(PAPI_ASPECTS, 0)  # skor dari kunci lama
+    db.session.add_all([
+        TestSubmission(link_id=link.id, test_type="papi", raw_answers=[0, 0, 1], scores=stale),
+        TestSubmission(link_id=link.id, test_type="papi", raw_answers=[1, None, 1], scores=stale),
+        TestSubmission(link_id=link.id, test_type="papi", raw_answers=None, scores={"G": 9}),  # tidak bisa di-rescore
+    ])
+    db.session.commit()
+    papi_key.invalidate()
+
+    yield link
+
+    TestSubmission.query.filter_by(link_id=link.id).delete()
+    PapiScoringMap.query.delete()
+    TestLink.query.filter_by(id=link.id).delete()
+    Candidate.query.filter_by(id="RESCORE-CAND").delete()
+    Resume.query.filter_by(id="RESCORE-RES").delete()
+    db.session.commit()
+    papi_key.invalidate()
+
+
+def papi_scores(link):
+    db.session.expire_all()
+    return [s.scores for s in TestSubmission.query.filter_by(link_id=link.id).order_by(TestSubmission.id)]
+
+# =========================
+# TEST BULK RESCORING
+# =========================
+
+def test_rescore_writes_only_changed_rows(papi_submissions):
+    dry = rescore_submissions("papi", batch_size=2, workers=1, dry_run=True)
+    assert (dry["scanned"], dry["changed"], dry["skipped"]) == (3, 2, 1)
+    assert papi_scores(papi_submissions)[0] == dict.fromkeys(PAPI_ASPECTS, 0)
+
+    report = rescore_submissions("papi", batch_size=2, workers=1)
+    scores = papi_scores(papi_submissions)
+
+    assert report["changed"] == 2 and report["field_changes"] == {"N": 2, "G": 1}
+    assert (scores[0]["G"], scores[0]["N"]) == (2, 1)
+    assert (scores[1]["G"], scores[1]["N"]) == (0, 2)
+    assert scores[2] == {"G": 9}
+    assert rescore_submissions("papi", workers=1)["changed"] == 0
+
+
+def test_rescore_rejects_unknown_test_type(app):
+    with pytest.raises(ValueError):
+        rescore_submissions("disc")
+
+
+def test_new_result_fields_are_not_counted_as_changes():
+    old = {"iq": 110, "raw_score": 30, "classification": "Rata-rata"}
+
+    assert _diff(old, dict(old, subtest_scores={"1": 8})) == {}
+    assert _diff(old, dict(old, iq=115, subtest_scores={"1": 8})) == {"iq": [110, 115]}
+    assert _diff(None, {"iq": 100}) == {"iq": [None, 100]}
@@ -0,0 +1,41 @@
+import io
+import os
+import zipfile
+
+from flask_jwt_extended import create_access_token
+from app.routes import screening
+from app.utils.resume_ingest import UPLOAD_FOLDER
+
+
+def zip_bytes(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    buf.seek(0)
+    return buf
+
+# =========================
+# TEST BATAS UPLOAD ZIP
+# =========================
+
+def test_zip_over_limits_is_rejected_before_extraction(app, client, monkeypatch):
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1', additional_claims={'role': 'SUPER_USER'})}"}
+    before = set(os.listdir(UPLOAD_FOLDER)) if os.path.isdir(UPLOAD_FOLDER) else set()
+
+    cases = [
+        ("ZIP_MAX_FILES", 2, {f"cv{i}.pdf": b"%PDF" for i in range(3)}),
+        ("ZIP_MAX_FILE_BYTES", 1024, {"bomb.pdf": b"0" * 4096}),           # terkompresi jauh < 1 KB
+        ("ZIP_MAX_TOTAL_BYTES", 4096, {f"cv{i}.pdf": b"0" * 3000 for i in range(2)}),
+    ]
+    for attr, limit, members in cases:
+        monkeypatch.setattr(screening, attr, limit)
+        resp = client.post("/screening/upload_resumes", headers=headers, content_type="multipart/form-data",
+                           data={"file": (zip_bytes(members), "cv.zip")})
+        monkeypatch.undo()
+
+        assert resp.status_code == 400, attr
+        assert "zip" in resp.get_json()["error"]
+
+    after = set(os.listdir(UPLOAD_FOLDER)) if os.path.isdir(UPLOAD_FOLDER) else set()
+    assert after == before
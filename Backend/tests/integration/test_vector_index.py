@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from app.utils.vector_store import ResumeVectorStore, benchmark_index_types
+
+DIM = 96
+
+
+def normalized(x):
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype("float32")
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(0)
+    basis = rng.normal(size=(16, DIM))
+    vectors = normalized(rng.normal(size=(1500, 16)) @ basis + 0.3 * rng.normal(size=(1500, DIM)))
+    queries = normalized(rng.normal(size=(20, 16)) @ basis)
+    return vectors, queries
+
+
+def make_store(tmp_path, index_type):
+    return ResumeVectorStore(str(tmp_path / "r.faiss"), str(tmp_path / "m.json"), index_type=index_type)
+
+# =========================
+# TEST INDEX TERKUANTISASI
+# =========================
+
+def test_benchmark_reports_recall_against_flat(corpus):
+    vectors, queries = corpus
+    rows = {r["requested"]: r for r in benchmark_index_types(vectors, queries, k=10, pq_m=12, nprobe=8)}
+
+    assert rows["flat"]["recall_at_k"] == 1.0
+    assert rows["sq8"]["recall_at_k"] >= 0.9
+    assert rows["sq8"]["index_bytes"] < rows["flat"]["index_bytes"] / 3
+    assert rows["ivfpq"]["index_type"] == "ivfpq"
+    assert rows["ivfpq"]["recall_at_k"] >= 0.5
+
+
+def test_ivfpq_falls_back_to_sq8_on_small_corpus(tmp_path, corpus):
+    vectors, _ = corpus
+    store = make_store(tmp_path, "ivfpq")
+    store.add("r1", vectors[:20])
+
+    assert store.stats()["index_type"] == "sq8"
+
+
+def test_rebuild_keeps_resumes_and_supports_remove(tmp_path, corpus):
+    vectors, queries = corpus
+    store = make_store(tmp_path, "flat")
+    store.add_many([(f"r{i}", vectors[i * 30:(i + 1) * 30]) for i in range(50)])
+    expected = [rid for rid, _ in store.rank(queries[:1], top_k=5)]
+
+    assert store.rebuild("sq8") == "sq8"
+    assert store.stats()["resumes"] == 50
+    assert [rid for rid, _ in store.rank(queries[:1], top_k=5)][:3] == expected[:3]
+
+    store.rebuild("ivfpq")
+    store.remove("r0")
+    store.add("r1", vectors[:5])
+    assert store.get_vectors("r1").shape == (5, DIM)
+    assert store.stats()["vectors"] == 48 * 30 + 5
+
+
+def test_two_processes_appending_do_not_lose_resumes(tmp_path, corpus):
+    vectors, _ = corpus
+    # Dua instance = dua worker gunicorn yang berbagi file index
+    worker_a, worker_b = make_store(tmp_path, "flat"), make_store(tmp_path, "flat")
+    worker_a.add("a1", vectors[:10])
+    worker_b.add("b1", vectors[10:20])
+    worker_a.add("a2", vectors[20:30])
+    worker_b.remove("a1")
+
+    fresh = make_store(tmp_path, "flat")
+    for store in (worker_a, worker_b, fresh):
+        assert store.stats()["resumes"] == 2 and store.stats()["vectors"] == 20
+        assert np.allclose(store.get_vectors("a2"), vectors[20:30])
+
+    # Upload berikutnya hanya di-append ke log, snapshot tidak ditulis ulang
+    stats = fresh.stats()
+    assert stats["generation"] == 1 and stats["log_vectors"] == 20
+
+
+def test_log_is_folded_into_snapshot_at_checkpoint(tmp_path, corpus):
+    vectors, _ = corpus
+    store = ResumeVectorStore(str(tmp_path / "r.faiss"), str(tmp_path / "m.json"), checkpoint_rows=25)
+    for i in range(6):
+        store.add(f"r{i}", vectors[i * 10:(i + 1) * 10])
+
+    stats = store.stats()
+    assert stats["generation"] == 2 and stats["log_vectors"] == 20
+    assert not (tmp_path / "r.1.faiss").exists()
+    reloaded = ResumeVectorStore(str(tmp_path / "r.faiss"), str(tmp_path / "m.json"))
+    assert np.allclose(reloaded.get_vectors("r5"), vectors[50:60])
@@ -5,6 +5,8 @@ import { useRouter } from "next/navigation";
 import Sidebar from "@/components/layout/Sidebar";
 import Header from "@/components/layout/Header";
 import Footer from "@/components/layout/Footer";
+import LoadMore from "@/components/layout/LoadMore";
+import { fetchPage } from "@/lib/api/pagination";
 import {
   BarChart3,
   Users,
@@ -24,6 +26,7 @@ interface Stats {
   active_jobs: number;
   test_taken: number;
   completion_rate: string;
+  score_distribution: { label: string; count: number }[];
 }
 
 interface LeaderboardEntry {
@@ -42,6 +45,8 @@ export default function AnalyticsPage() {
   const [user, setUser] = useState<{ name: string } | null>(null);
   const [stats, setStats] = useState<Stats | null>(null);
   const [leaderboard, setLeaderboard] = useState<LeaderboardEntry[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -65,17 +70,16 @@ export default function AnalyticsPage() {
   const fetchData = async () => {
     setLoading(true);
     try {
-      const [statsRes, leaderboardRes] = await Promise.all([
+      const [statsRes, page] = await Promise.all([
         fetch(`${API_BASE_URL}/dashboard/stats`, { headers: getAuthHeaders() }),
-        fetch(`${API_BASE_URL}/dashboard/leaderboard`, { headers: getAuthHeaders() }),
+        fetchPage<LeaderboardEntry>(`${API_BASE_URL}/dashboard/leaderboard`, { headers: getAuthHeaders() }),
       ]);
 
       if (statsRes.ok) {
         setStats(await statsRes.json());
       }
-      if (leaderboardRes.ok) {
-        setLeaderboard(await leaderboardRes.json());
-      }
+      setLeaderboard(page.items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error("Error fetching analytics:", error);
     } finally {
@@ -83,7 +87,20 @@ export default function AnalyticsPage() {
     }
   };
 
-  // Calculate score distribution for visualization
+  const loadMoreLeaderboard = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<LeaderboardEntry>(`${API_BASE_URL}/dashboard/leaderboard`, { headers: getAuthHeaders() }, nextCursor);
+      setLeaderboard((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Error fetching leaderboard:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Distribusi skor dihitung backend (/dashboard/stats) atas seluruh leaderboard
   const getScoreDistribution = () => {
     const ranges = [
       { label: "0-40", count: 0, color: "bg-red-500", text: "text-red-600" },
@@ -92,11 +109,9 @@ export default function AnalyticsPage() {
       { label: "81-100", count: 0, color: "bg-green-500", text: "text-green-600" },
     ];
 
-    leaderboard.forEach((entry) => {
-      if (entry.finalScore <= 40) ranges[0].count++;
-      else if (entry.finalScore <= 60) ranges[1].count++;
-      else if (entry.finalScore <= 80) ranges[2].count++;
-      else ranges[3].count++;
+    stats?.score_distribution?.forEach((bucket) => {
+      const range = ranges.find((r) => r.label === bucket.label);
+      if (range) range.count = bucket.count;
     });
 
     return ranges;
@@ -375,6 +390,8 @@ export default function AnalyticsPage() {
                     </div>
                 )}
             </div>
+
+            <LoadMore hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreLeaderboard} />
           </div>
         </main>
         <Footer />
@@ -2,6 +2,8 @@
 
 import { useState, useEffect } from 'react'
 import Link from 'next/link'
+import LoadMore from '@/components/layout/LoadMore'
+import { fetchPage } from '@/lib/api/pagination'
 
 interface ATARequest {
   id: string
@@ -20,6 +22,8 @@ interface ATARequest {
 export default function ATARequestsPage() {
   const [requests, setRequests] = useState<ATARequest[]>([])
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [filter, setFilter] = useState('all')
 
   useEffect(() => {
@@ -32,11 +36,12 @@ export default function ATARequestsPage() {
     ...(token ? { Authorization: `Bearer ${token}` } : {}),
   };
 };
-  const fetchRequests = async () => {
+  // after = cursor halaman berikutnya (null = halaman pertama)
+  const fetchRequests = async (after: string | null = null) => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/ata`, { headers: getAuthHeaders() })
-      const data = await response.json()
-      setRequests(data)
+      const page = await fetchPage<ATARequest>(`${process.env.NEXT_PUBLIC_API_URL}/ata`, { headers: getAuthHeaders() }, after)
+      setRequests(prev => after ? [...prev, ...page.items] : page.items)
+      setNextCursor(page.nextCursor)
     } catch (error) {
       console.error('Error fetching ATA requests:', error)
     } finally {
@@ -44,6 +49,12 @@ export default function ATARequestsPage() {
     }
   }
 
+  const loadMoreRequests = async () => {
+    setLoadingMore(true)
+    await fetchRequests(nextCursor)
+    setLoadingMore(false)
+  }
+
   const getStatusBadge = (status: string) => {
     const badges: { [key: string]: string } = {
       'Pending': 'badge badge-warning',
@@ -203,6 +214,7 @@ export default function ATARequestsPage() {
                 </div>
               </div>
             ))}
+            <LoadMore hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreRequests} />
           </div>
         )}
       </div>
@@ -5,6 +5,8 @@ import { useRouter } from 'next/navigation'
 import Sidebar from "@/components/layout/Sidebar"
 import Header from "@/components/layout/Header"
 import Footer from "@/components/layout/Footer"
+import LoadMore from "@/components/layout/LoadMore"
+import { fetchPage } from "@/lib/api/pagination"
 import { Loader2, Search, CheckCircle, XCircle, Clock, FileText, User, Plus, AlertCircle } from 'lucide-react'
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || "http://localhost:5001"
@@ -27,6 +29,8 @@ export default function ATATrackingPage() {
   const router = useRouter()
   const [requests, setRequests] = useState<ATARequest[]>([])
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [filter, setFilter] = useState('all')
   const [searchQuery, setSearchQuery] = useState('')
   const [userRole, setUserRole] = useState<string | null>(null)
@@ -65,11 +69,12 @@ export default function ATATrackingPage() {
   };
 };
 
-  const fetchRequests = async () => {
+  // after = cursor halaman berikutnya (null = muat ulang dari halaman pertama)
+  const fetchRequests = async (after: string | null = null) => {
     try {
-      const response = await fetch(`${API_BASE_URL}/ata`, { headers: getAuthHeaders() })
-      const data = await response.json()
-      setRequests(data)
+      const page = await fetchPage<ATARequest>(`${API_BASE_URL}/ata`, { headers: getAuthHeaders() }, after)
+      setRequests(prev => after ? [...prev, ...page.items] : page.items)
+      setNextCursor(page.nextCursor)
     } catch (error) {
       console.error('Error fetching ATA requests:', error)
     } finally {
@@ -77,6 +82,12 @@ export default function ATATrackingPage() {
     }
   }
 
+  const loadMoreRequests = async () => {
+    setLoadingMore(true)
+    await fetchRequests(nextCursor)
+    setLoadingMore(false)
+  }
+
   const handleSubmitATA = async () => {
     if (!formData.title || !formData.department) {
       alert('⚠️ Title dan Department wajib diisi')
@@ -302,6 +313,7 @@ export default function ATATrackingPage() {
                 </div>
               )
             })}
+            {!loading && <LoadMore hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreRequests} />}
           </div>
         </main>
         <Footer />
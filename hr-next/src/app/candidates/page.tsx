@@ -5,6 +5,8 @@ import { useRouter } from "next/navigation";
 import Sidebar from "@/components/layout/Sidebar";
 import Header from "@/components/layout/Header";
 import Footer from "@/components/layout/Footer";
+import LoadMore from "@/components/layout/LoadMore";
+import { fetchPage, OPTIONS_PAGE_SIZE } from "@/lib/api/pagination";
 import { 
   Plus, 
   Search, 
@@ -364,6 +366,9 @@ export default function CandidatesPage() {
   
   // State Data
   const [candidates, setCandidates] = useState<Candidate[]>([]);
+  const [totalCandidates, setTotalCandidates] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [jobs, setJobs] = useState<JobPosition[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -400,9 +405,10 @@ export default function CandidatesPage() {
   const fetchCandidates = async () => {
     try {
       setLoading(true);
-      const res = await fetch(`${API_BASE_URL}/candidates`, { headers: getAuthHeaders() });
-      if (!res.ok) throw new Error("Gagal mengambil data kandidat");
-      setCandidates(await res.json());
+      const page = await fetchPage<Candidate>(`${API_BASE_URL}/candidates?count=true`, { headers: getAuthHeaders() });
+      setCandidates(page.items);
+      setTotalCandidates(page.total ?? page.items.length);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError("Gagal menghubungkan ke server.");
     } finally {
@@ -410,10 +416,23 @@ export default function CandidatesPage() {
     }
   };
 
+  const loadMoreCandidates = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<Candidate>(`${API_BASE_URL}/candidates`, { headers: getAuthHeaders() }, nextCursor);
+      setCandidates(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError("Gagal menghubungkan ke server.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchJobs = async () => {
     try {
-      const res = await fetch(`${API_BASE_URL}/job-positions?status=active`, { headers: getAuthHeaders() });
-      if (res.ok) setJobs(await res.json());
+      const page = await fetchPage(`${API_BASE_URL}/job-positions?status=active`, { headers: getAuthHeaders() }, null, OPTIONS_PAGE_SIZE);
+      setJobs(page.items);
     } catch (err) {
       console.error("Gagal mengambil data pekerjaan:", err);
     }
@@ -475,6 +494,7 @@ export default function CandidatesPage() {
       const res = await fetch(`${API_BASE_URL}/candidates/${id}`, { method: "DELETE", headers: getAuthHeaders() });
       if (res.ok) {
         setCandidates(prev => prev.filter(c => c.id !== id));
+        setTotalCandidates(total => Math.max(total - 1, 0));
       } else {
         alert("Gagal menghapus data.");
       }
@@ -526,7 +546,7 @@ export default function CandidatesPage() {
           <div className="flex flex-col md:flex-row justify-between items-start md:items-center mb-6 gap-4">
             <div className="w-full md:w-auto">
               <h2 className="text-xl md:text-2xl font-bold text-[var(--primary-900)]">Database Kandidat</h2>
-              <p className="text-xs md:text-sm text-[var(--secondary)] mt-1">Total {candidates.length} kandidat terdaftar</p>
+              <p className="text-xs md:text-sm text-[var(--secondary)] mt-1">Total {totalCandidates} kandidat terdaftar</p>
             </div>
             <button 
               onClick={() => router.push('/cv-scanner')} 
@@ -788,6 +808,8 @@ export default function CandidatesPage() {
                     <p className="text-sm">Coba ubah filter pencarian Anda atau tambahkan kandidat baru.</p>
                   </div>
                 )}
+
+                <LoadMore hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreCandidates} />
               </>
             )}
           </div>
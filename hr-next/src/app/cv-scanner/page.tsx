@@ -5,6 +5,8 @@ import { useRouter } from "next/navigation";
 import Sidebar from "@/components/layout/Sidebar";
 import Header from "@/components/layout/Header";
 import Footer from "@/components/layout/Footer";
+import LoadMore from "@/components/layout/LoadMore";
+import { fetchPage, OPTIONS_PAGE_SIZE } from "@/lib/api/pagination";
 import {
   CloudUpload,
   FileText,
@@ -78,6 +80,8 @@ export default function CVScannerPage() {
   // State Data
   const [availablePositions, setAvailablePositions] = useState<JobPosition[]>([]);
   const [candidates, setCandidates] = useState<CVCandidate[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   // UI State
   const [currentStep, setCurrentStep] = useState<Step>("select-job");
@@ -100,7 +104,7 @@ export default function CVScannerPage() {
 };
   const checkBackendStatus = useCallback(async () => {
     try {
-      const res = await fetch(`${API_BASE_URL}/screening/candidates`, { headers: getAuthHeaders() });
+      const res = await fetch(`${API_BASE_URL}/screening/candidates?limit=1&fields=id`, { headers: getAuthHeaders() });
       if (res.ok) {
         setBackendStatus("online");
         return true;
@@ -115,11 +119,10 @@ export default function CVScannerPage() {
   const loadJobPositions = useCallback(async () => {
     setLoadingJobs(true);
     try {
-      const res = await fetch(`${API_BASE_URL}/job-positions?status=active&available=true`, { headers: getAuthHeaders() });
-      if (!res.ok) throw new Error("Gagal mengambil data posisi pekerjaan");
-      
-      const data = await res.json();
-      const formattedData = data.map((job: JobPosition) => ({
+      const { items } = await fetchPage<JobPosition>(
+        `${API_BASE_URL}/job-positions?status=active&available=true`, { headers: getAuthHeaders() }, null, OPTIONS_PAGE_SIZE
+      );
+      const formattedData = items.map((job: JobPosition) => ({
         ...job,
         formattedSalary: job.salary.min && job.salary.max 
           ? `${(job.salary.min / 1000000).toFixed(0)}-${(job.salary.max / 1000000).toFixed(0)}M`
@@ -148,12 +151,12 @@ export default function CVScannerPage() {
   }, [router, checkBackendStatus, loadJobPositions]);
 
   // Load candidates
-  const loadCandidatesFromDB = async () => {
+  // after = cursor halaman berikutnya (null = muat ulang dari halaman pertama)
+  const loadCandidatesFromDB = async (after: string | null = null) => {
     try {
-      const res = await fetch(`${API_BASE_URL}/screening/candidates`, { headers: getAuthHeaders() });
-      if (!res.ok) throw new Error("Failed to fetch candidates");
-      const data = await res.json();
-      setCandidates(data);
+      const page = await fetchPage<CVCandidate>(`${API_BASE_URL}/screening/candidates`, { headers: getAuthHeaders() }, after);
+      setCandidates((prev) => after ? [...prev, ...page.items] : page.items);
+      setNextCursor(page.nextCursor);
       setBackendStatus("online");
     } catch (err) {
       console.error("Backend tidak tersedia:", err);
@@ -162,6 +165,12 @@ export default function CVScannerPage() {
     }
   };
 
+  const loadMoreCandidates = async () => {
+    setLoadingMore(true);
+    await loadCandidatesFromDB(nextCursor);
+    setLoadingMore(false);
+  };
+
   // --- LOGIKA UTAMA: PROSES PARALEL UNTUK 5 FILE ---
   const processSingleFile = async (file: File, index: number, total: number) => {
     try {
@@ -654,6 +663,8 @@ export default function CVScannerPage() {
                 {filteredCandidates.length === 0 && (
                    <div className="p-8 text-center text-[var(--secondary)]">Tidak ada kandidat ditemukan dengan filter ini.</div>
                 )}
+
+                <LoadMore hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreCandidates} />
               </div>
             </>
           )}
@@ -5,6 +5,8 @@ import { useRouter } from "next/navigation";
 import Sidebar from "@/components/layout/Sidebar";
 import Header from "@/components/layout/Header";
 import Footer from "@/components/layout/Footer";
+import LoadMore from "@/components/layout/LoadMore";
+import { fetchPage, OPTIONS_PAGE_SIZE } from "@/lib/api/pagination";
 import {
   Users,
   Briefcase,
@@ -37,6 +39,8 @@ export default function DashboardPage() {
     completion_rate: "0%"
   });
   const [leaderboard, setLeaderboard] = useState<any[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [jobs, setJobs] = useState<any[]>([]);
   const [selectedJob, setSelectedJob] = useState("all");
 
@@ -61,11 +65,8 @@ export default function DashboardPage() {
       if (statsRes.ok) setStats(await statsRes.json());
 
       // 2. Fetch Jobs (Untuk Filter)
-      const jobsRes = await fetch(`${API_BASE_URL}/job-positions?status=active`);
-      if (jobsRes.ok) {
-         const jobsData = await jobsRes.json();
-         setJobs([{ id: "all", title: "Semua Posisi" }, ...jobsData]);
-      }
+      const jobsPage = await fetchPage(`${API_BASE_URL}/job-positions?status=active`, undefined, null, OPTIONS_PAGE_SIZE);
+      setJobs([{ id: "all", title: "Semua Posisi" }, ...jobsPage.items]);
 
       // 3. Fetch Leaderboard Awal
       await fetchLeaderboard("all");
@@ -77,18 +78,23 @@ export default function DashboardPage() {
     }
   }, []);
 
-  // Fetch Leaderboard saat filter berubah
-  const fetchLeaderboard = async (jobId: string) => {
+  // Fetch Leaderboard saat filter berubah (after = cursor halaman berikutnya)
+  const fetchLeaderboard = async (jobId: string, after: string | null = null) => {
     try {
-      const res = await fetch(`${API_BASE_URL}/dashboard/leaderboard?job_id=${jobId}`);
-      if (res.ok) {
-        setLeaderboard(await res.json());
-      }
+      const page = await fetchPage(`${API_BASE_URL}/dashboard/leaderboard?job_id=${jobId}`, undefined, after);
+      setLeaderboard((prev) => after ? [...prev, ...page.items] : page.items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error("Error fetching leaderboard", error);
     }
   };
 
+  const loadMoreLeaderboard = async () => {
+    setLoadingMore(true);
+    await fetchLeaderboard(selectedJob, nextCursor);
+    setLoadingMore(false);
+  };
+
   const handleFilterChange = (e: React.ChangeEvent<HTMLSelectElement>) => {
     const newJobId = e.target.value;
     setSelectedJob(newJobId);
@@ -339,6 +345,8 @@ export default function DashboardPage() {
                       </div>
                     )}
                   </div>
+
+                  <LoadMore hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreLeaderboard} />
                 </>
               )}
             </div>
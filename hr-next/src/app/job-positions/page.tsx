@@ -5,6 +5,8 @@ import { useRouter } from "next/navigation";
 import Sidebar from "@/components/layout/Sidebar";
 import Header from "@/components/layout/Header";
 import Footer from "@/components/layout/Footer";
+import LoadMore from "@/components/layout/LoadMore";
+import { fetchPage } from "@/lib/api/pagination";
 import {
   Plus, Search, Edit2, Trash2, X, Briefcase, MapPin, Building,
   DollarSign, Loader2, CheckCircle, AlertTriangle, Save
@@ -202,6 +204,8 @@ export default function JobPositionsPage() {
   const router = useRouter();
   const [user, setUser] = useState<{name: string} | null>(null);
   const [jobs, setJobs] = useState<JobPosition[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [isLoading, setIsLoading] = useState(true);
   const [searchQuery, setSearchQuery] = useState("");
   
@@ -229,13 +233,12 @@ export default function JobPositionsPage() {
   const fetchJobs = useCallback(async (signal?: AbortSignal) => {
     try {
       setIsLoading(true);
-      const res = await fetch(`${API_BASE_URL}/job-positions`, { 
+      const page = await fetchPage<JobPosition>(`${API_BASE_URL}/job-positions`, { 
         headers: getAuthHeaders(),
         signal: signal 
       });
-      if (res.ok) {
-        setJobs(await res.json());
-      }
+      setJobs(page.items);
+      setNextCursor(page.nextCursor);
     } catch (error: any) {
       if (error.name !== 'AbortError') console.error("Fetch error:", error);
     } finally {
@@ -243,6 +246,19 @@ export default function JobPositionsPage() {
     }
   }, [getAuthHeaders]);
 
+  const loadMoreJobs = useCallback(async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<JobPosition>(`${API_BASE_URL}/job-positions`, { headers: getAuthHeaders() }, nextCursor);
+      setJobs(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Fetch error:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [getAuthHeaders, nextCursor]);
+
   // USE EFFECT - FIX: Controller created inside effect
   useEffect(() => {
     const userData = localStorage.getItem("hr_user");
@@ -415,6 +431,7 @@ export default function JobPositionsPage() {
                ))}
             </div>
           )}
+          {!isLoading && <LoadMore hasMore={!!nextCursor} loading={loadingMore} onClick={loadMoreJobs} />}
         </main>
         <Footer />
       </div>
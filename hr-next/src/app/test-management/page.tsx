@@ -5,6 +5,8 @@ import { useRouter } from "next/navigation";
 import Sidebar from "@/components/layout/Sidebar";
 import Header from "@/components/layout/Header";
 import Footer from "@/components/layout/Footer";
+import LoadMore from "@/components/layout/LoadMore";
+import { fetchPage, OPTIONS_PAGE_SIZE } from "@/lib/api/pagination";
 import {
   CheckCircle,
   Plus,
@@ -124,6 +126,9 @@ export default function TestManagementPage() {
   const [localQuestions, setLocalQuestions] = useState<Record<number, Question[]>>({});
   const [localTestLinks, setLocalTestLinks] = useState<TestLink[]>([]);
   const [submissions, setSubmissions] = useState<Submission[]>([]); 
+  const [linksCursor, setLinksCursor] = useState<string | null>(null);
+  const [submissionsCursor, setSubmissionsCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   // Candidates & Jobs List for Dropdown
   const [candidatesList, setCandidatesList] = useState<Candidate[]>([]);
@@ -181,19 +186,48 @@ export default function TestManagementPage() {
 
   // --- API FETCH FUNCTIONS ---
 
+  const loadMoreLinks = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<TestLink>(`${API_BASE_URL}/management/links`, { headers: getAuthHeaders() }, linksCursor);
+      setLocalTestLinks((prev) => [...prev, ...page.items]);
+      setLinksCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Gagal memuat link:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const loadMoreSubmissions = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<Submission>(`${API_BASE_URL}/management/submissions`, { headers: getAuthHeaders() }, submissionsCursor);
+      setSubmissions((prev) => [...prev, ...page.items]);
+      setSubmissionsCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Gagal memuat submission:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchData = async () => {
     try {
-      const resLinks = await fetch(`${API_BASE_URL}/management/links`, { headers: getAuthHeaders() });
-      if (resLinks.ok) setLocalTestLinks(await resLinks.json());
+      const links = await fetchPage<TestLink>(`${API_BASE_URL}/management/links`, { headers: getAuthHeaders() });
+      setLocalTestLinks(links.items);
+      setLinksCursor(links.nextCursor);
 
-      const resSubs = await fetch(`${API_BASE_URL}/management/submissions`, { headers: getAuthHeaders() }); 
-      if (resSubs.ok) setSubmissions(await resSubs.json());
+      const subs = await fetchPage<Submission>(`${API_BASE_URL}/management/submissions`, { headers: getAuthHeaders() });
+      setSubmissions(subs.items);
+      setSubmissionsCursor(subs.nextCursor);
 
-      const resCandidates = await fetch(`${API_BASE_URL}/candidates`, { headers: getAuthHeaders() });
-      if (resCandidates.ok) setCandidatesList(await resCandidates.json());
+      // Pilihan dropdown: satu halaman terbaru (dibatasi backend)
+      const candidates = await fetchPage<Candidate>(`${API_BASE_URL}/candidates?fields=id,name`, { headers: getAuthHeaders() }, null, OPTIONS_PAGE_SIZE);
+      setCandidatesList(candidates.items);
 
-      const resJobs = await fetch(`${API_BASE_URL}/job-positions?status=active`, { headers: getAuthHeaders() });
-      if (resJobs.ok) setJobsList(await resJobs.json());
+      const jobs = await fetchPage<JobPosition>(`${API_BASE_URL}/job-positions?status=active`, { headers: getAuthHeaders() }, null, OPTIONS_PAGE_SIZE);
+      setJobsList(jobs.items);
 
       const resKraepelin = await fetch(`${API_BASE_URL}/management/config/kraepelin`, { headers: getAuthHeaders() });
       if (resKraepelin.ok) {
@@ -845,6 +879,7 @@ export default function TestManagementPage() {
                     <div className="p-8 text-center text-[var(--secondary)] italic">Belum ada link aktif.</div>
                   )}
               </div>
+              <LoadMore hasMore={!!linksCursor} loading={loadingMore} onClick={loadMoreLinks} />
             </div>
           )}
           
@@ -937,6 +972,8 @@ export default function TestManagementPage() {
                      <div className="p-8 text-center text-[var(--secondary)] bg-[var(--secondary-50)] rounded-xl border border-dashed border-[var(--secondary-200)]">Belum ada data submission.</div>
                  )}
               </div>
+
+              <LoadMore hasMore={!!submissionsCursor} loading={loadingMore} onClick={loadMoreSubmissions} />
             </div>
           )}
 
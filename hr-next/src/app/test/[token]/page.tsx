@@ -112,8 +112,8 @@ export default function TestExamPage() {
           return;
         }
 
-        // 2. Ambil Config Kraepelin
-        const resKrae = await fetch(`${API_BASE_URL}/management/config/kraepelin`, { headers: getAuthHeaders() });
+        // 2. Ambil Config + lembar soal Kraepelin (grid dibuat di server per link)
+        const resKrae = await fetch(`${API_BASE_URL}/submission/kraepelin/${token}`, { headers: getAuthHeaders() });
         if (resKrae.ok) {
            const dataKrae = await resKrae.json();
            setKraepelinConfig(dataKrae);
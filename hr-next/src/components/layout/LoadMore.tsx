@@ -0,0 +1,24 @@
+"use client";
+
+interface LoadMoreProps {
+  hasMore: boolean;
+  loading: boolean;
+  onClick: () => void;
+}
+
+// Tombol halaman berikutnya untuk list yang memakai fetchPage (lib/api/pagination.ts)
+export default function LoadMore({ hasMore, loading, onClick }: LoadMoreProps) {
+  if (!hasMore) return null;
+
+  return (
+    <div className="flex justify-center py-4">
+      <button
+        onClick={onClick}
+        disabled={loading}
+        className="px-4 py-2 text-sm font-semibold rounded-xl border border-[var(--secondary-200)] text-[var(--primary)] bg-white hover:bg-[var(--primary-50)] transition-colors disabled:opacity-50"
+      >
+        {loading ? "Memuat..." : "Muat lebih banyak"}
+      </button>
+    </div>
+  );
+}
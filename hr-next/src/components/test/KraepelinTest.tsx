@@ -1,6 +1,5 @@
 "use client";
 import { useState, useEffect, useRef } from "react";
-import { generateKraepelinGrid } from "@/lib/test-data"; 
 import { calculateKraepelinScore } from "@/utils/kraepelinScoring"; 
 import { Play, SkipForward, Clock } from "lucide-react"; 
 
@@ -11,6 +10,7 @@ interface KraepelinTestProps {
     columns: number;
     rows: number;
     durationPerColumn: number;
+    grid: number[][]; // lembar soal dari server (GET /submission/kraepelin/<token>)
   };
   forceSubmit: boolean; // <--- 1. TAMBAHKAN INI
   manualSubmit: boolean;
@@ -37,8 +37,7 @@ export default function KraepelinTest({
 
 
   useEffect(() => {
-    const newGrid = generateKraepelinGrid(dbConfig.columns, dbConfig.rows);
-    setGrid(newGrid);
+    setGrid(dbConfig.grid);
     const numberOfInputs = dbConfig.rows - 1;
     const initialAnswers = Array.from({ length: dbConfig.columns }, () =>
       Array(numberOfInputs).fill(null)
@@ -103,7 +102,7 @@ export default function KraepelinTest({
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({
             token: token,
-            answers: finalAnswers, 
+            answers: finalAnswers, // Backend menghitung ulang skor terhadap grid milik link
             results: analysisResults 
           })
         });
@@ -141,7 +140,7 @@ export default function KraepelinTest({
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({
             token: token,
-            answers: finalAnswers, 
+            answers: finalAnswers, // Backend menghitung ulang skor terhadap grid milik link
             results: analysisResults 
           })
         });
@@ -0,0 +1,31 @@
+// Helper pagination keyset dari backend (?limit=&after=, cursor halaman berikutnya di header X-Next-Cursor)
+
+export const PAGE_SIZE = 100;
+// Batas atas backend (PAGINATION_MAX_LIMIT), untuk daftar pilihan di dropdown
+export const OPTIONS_PAGE_SIZE = 500;
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+  total: number | null; // hanya jika url memakai ?count=true
+}
+
+export async function fetchPage<T = any>(
+  url: string,
+  init?: RequestInit,
+  after?: string | null,
+  limit: number = PAGE_SIZE
+): Promise<Page<T>> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (after) params.set("after", after);
+
+  const res = await fetch(`${url}${url.includes("?") ? "&" : "?"}${params}`, init);
+  if (!res.ok) throw new Error(`Request gagal (${res.status})`);
+
+  const total = res.headers.get("X-Total-Count");
+  return {
+    items: await res.json(),
+    nextCursor: res.headers.get("X-Next-Cursor"),
+    total: total === null ? null : Number(total),
+  };
+}
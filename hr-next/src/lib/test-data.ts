@@ -68,15 +68,3 @@ export const kraepelinConfig = {
   timePerColumn: 15, // seconds
   totalDuration: TEST_DURATION, // 3 minutes
 };
-
-// Generate random kraepelin grid
-export function generateKraepelinGrid(cols: number = 50, rows: number = 27): number[][] {
-  const grid: number[][] = [];
-  for (let col = 0; col < cols; col++) {
-    grid[col] = [];
-    for (let row = 0; row < rows; row++) {
-      grid[col][row] = Math.floor(Math.random() * 9) + 1;
-    }
-  }
-  return grid;
-}